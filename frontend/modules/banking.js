@@ -8,6 +8,7 @@
 const BANKING_API_URL = 'http://localhost:8000/api/banking/transaction/';
 const BALANCE_API_URL = 'http://localhost:8000/api/banking/balance/';
 const HISTORY_API_URL = 'http://localhost:8000/api/banking/history/';
+const EVENTS_API_URL = 'http://localhost:8000/api/banking/events/';
 
 // ===== BANKING STATE =====
 let accountBalance = 5240.50;
@@ -657,6 +658,34 @@ function updateAccountBalance() {
     document.getElementById('balanceAmount').textContent = `$${accountBalance.toFixed(2)}`;
 }
 
+// ===== LIVE UPDATES =====
+
+/**
+ * Subscribe to server-sent balance and transaction events for an account,
+ * so incoming transfers show up without re-fetching balance and history.
+ * @param {string} bankId - The account to follow
+ * @returns {EventSource} The open stream (the browser reconnects on its own)
+ */
+function subscribeToBankingEvents(bankId) {
+    const source = new EventSource(`${EVENTS_API_URL}?bank_id=${encodeURIComponent(bankId)}`);
+
+    source.addEventListener('balance', event => {
+        accountBalance = JSON.parse(event.data).balance;
+        updateAccountBalance();
+    });
+
+    source.addEventListener('transaction', event => {
+        const data = JSON.parse(event.data);
+        accountBalance = data.balance;
+        updateAccountBalance();
+        if (!transactions.some(transaction => transaction.id === data.transaction.id)) {
+            transactions.unshift(data.transaction);
+        }
+    });
+
+    return source;
+}
+
 // ===== BANKING VOICE CONTROL =====
 
 const bankingVoiceOptions = [
@@ -765,3 +794,5 @@ function listenForBankingCommand() {
         }, 3000);
     };
 }
+
+subscribeToBankingEvents('****5678');  // Current user's bank ID
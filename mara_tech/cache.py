@@ -0,0 +1,84 @@
+"""Read-through caching on top of Django's cache framework, with hit-ratio counters."""
+
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_STATS_LOG_EVERY = 1000
+
+_lock = threading.Lock()
+_hits: dict[str, int] = {}
+_misses: dict[str, int] = {}
+
+
+def _cache():
+    return caches[getattr(settings, "MARA_CACHE_ALIAS", "default")]
+
+
+def _key(namespace: str, ident: Any) -> str:
+    return f"mara:{namespace}:{ident}"
+
+
+def record_lookup(namespace: str, hit: bool) -> None:
+    """Count a hit or miss for ``namespace`` (also used by caches outside Django's, e.g. the geo store)."""
+    with _lock:
+        counter = _hits if hit else _misses
+        counter[namespace] = counter.get(namespace, 0) + 1
+        lookups = _hits.get(namespace, 0) + _misses.get(namespace, 0)
+    if lookups % _STATS_LOG_EVERY == 0:
+        logger.info("Cache '%s': %d lookups, hit ratio %.1f%%", namespace, lookups, 100.0 * _hits.get(namespace, 0) / lookups)
+
+
+def read_through(namespace: str, ident: Any, loader: Callable[[], T], *, ttl: int | None = None) -> T:
+    """Return the cached value for ``(namespace, ident)``, loading and storing it on a miss.
+
+    ``ttl`` (default ``MARA_CACHE_TTL``) bounds staleness for writes that
+    bypass :func:`invalidate_on_commit`, e.g. raw SQL or another service.
+    """
+    key = _key(namespace, ident)
+    value = _cache().get(key)
+    if value is not None:
+        record_lookup(namespace, True)
+        return value
+
+    record_lookup(namespace, False)
+    value = loader()
+    store(namespace, ident, value, ttl=ttl)
+    return value
+
+
+def store(namespace: str, ident: Any, value: Any, *, ttl: int | None = None) -> None:
+    """Put a value just read from the database, e.g. while checking its freshness."""
+    _cache().set(_key(namespace, ident), value, ttl if ttl is not None else settings.MARA_CACHE_TTL)
+
+
+def invalidate(namespace: str, *idents: Any) -> None:
+    _cache().delete_many([_key(namespace, ident) for ident in idents])
+
+
+def invalidate_on_commit(namespace: str, *idents: Any) -> None:
+    """Drop the entries once the surrounding transaction commits (immediately outside one)."""
+    transaction.on_commit(lambda: invalidate(namespace, *idents))
+
+
+def stats() -> dict[str, dict[str, float]]:
+    """Per-namespace hit/miss counters for this process."""
+    with _lock:
+        namespaces = set(_hits) | set(_misses)
+        return {
+            ns: {
+                "hits": _hits.get(ns, 0),
+                "misses": _misses.get(ns, 0),
+                "hit_ratio": round(_hits.get(ns, 0) / ((_hits.get(ns, 0) + _misses.get(ns, 0)) or 1), 4),
+            }
+            for ns in sorted(namespaces)
+        }
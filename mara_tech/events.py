@@ -0,0 +1,153 @@
+"""Per-account banking events: in-process pub/sub fed by Postgres LISTEN/NOTIFY across workers."""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "mara_banking"
+
+_RECONNECT_DELAY = 2.0
+_POLL_TIMEOUT = 5.0
+
+# (bank_id, event)
+Event = tuple[str, dict[str, Any]]
+
+_lock = threading.Lock()
+_subscribers: dict[str, set["Subscription"]] = {}
+_listener: threading.Thread | None = None
+
+
+class Subscription:
+    """One event-stream client: a bounded asyncio queue fed from any thread.
+
+    If the client falls ``BANKING_EVENTS_QUEUE_SIZE`` events behind, the
+    subscription is closed rather than silently dropping events; the client
+    reconnects and gets a fresh balance.
+    """
+
+    def __init__(self, bank_id: str, loop: asyncio.AbstractEventLoop) -> None:
+        self.bank_id = bank_id
+        self.closed = False
+        self._loop = loop
+        self._queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=settings.BANKING_EVENTS_QUEUE_SIZE)
+
+    def _put(self, event: dict[str, Any] | None) -> None:
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Event stream for bank_id=%s fell behind; closing it", self.bank_id)
+            self.closed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)
+
+    def deliver(self, event: dict[str, Any]) -> None:
+        """Thread-safe: queue ``event`` on the subscriber's event loop."""
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:  # loop already closed
+            self.close()
+
+    async def get(self, timeout: float) -> dict[str, Any] | None:
+        """Next event, ``{}`` if ``timeout`` elapsed, ``None`` once the subscription is closed."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None if self.closed else {}
+
+    def close(self) -> None:
+        self.closed = True
+        with _lock:
+            subscribers = _subscribers.get(self.bank_id)
+            if subscribers is not None:
+                subscribers.discard(self)
+                if not subscribers:
+                    del _subscribers[self.bank_id]
+
+
+def _notify_enabled() -> bool:
+    return settings.BANKING_EVENTS_BACKEND == "postgres" and connection.vendor == "postgresql"
+
+
+def subscribe(bank_id: str) -> Subscription:
+    """Register the running event loop's client for ``bank_id`` events (call from async code)."""
+    subscription = Subscription(bank_id, asyncio.get_running_loop())
+    with _lock:
+        _subscribers.setdefault(bank_id, set()).add(subscription)
+    if _notify_enabled():
+        _ensure_listener()
+    return subscription
+
+
+def dispatch(bank_id: str, event: dict[str, Any]) -> None:
+    """Hand ``event`` to this process's subscribers for ``bank_id``."""
+    with _lock:
+        subscribers = list(_subscribers.get(bank_id, ()))
+    for subscription in subscribers:
+        subscription.deliver(event)
+
+
+def publish(events: Iterable[Event]) -> None:
+    """Publish events once the surrounding transaction commits (immediately outside one).
+
+    With the ``postgres`` backend this is a single ``pg_notify`` statement:
+    Postgres holds notifications until COMMIT and drops them on rollback,
+    and every worker's listener (this one included) fans them out. The
+    ``local`` backend only reaches subscribers in this process.
+    """
+    events = list(events)
+    if not events:
+        return
+    if not _notify_enabled():
+        transaction.on_commit(lambda: [dispatch(bank_id, event) for bank_id, event in events])
+        return
+    payloads = [json.dumps({"bank_id": bank_id, "event": event}, separators=(",", ":")) for bank_id, event in events]
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload", [CHANNEL, payloads])
+
+
+def _ensure_listener() -> None:
+    global _listener
+    with _lock:
+        if _listener is not None and _listener.is_alive():
+            return
+        _listener = threading.Thread(target=_listen, name="mara-banking-events", daemon=True)
+        _listener.start()
+
+
+def _listen() -> None:
+    """Hold one dedicated connection in LISTEN and fan notifications out to local subscribers."""
+    while True:
+        db = connections.create_connection("default")
+        try:
+            db.ensure_connection()
+            raw = db.connection
+            raw.autocommit = True
+            with raw.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            logger.info("Listening for banking events on channel '%s'", CHANNEL)
+            while True:
+                if select.select([raw], [], [], _POLL_TIMEOUT) == ([], [], []):
+                    continue
+                raw.poll()
+                while raw.notifies:
+                    notify = raw.notifies.pop(0)
+                    message = json.loads(notify.payload)
+                    dispatch(message["bank_id"], message["event"])
+        except Exception:
+            logger.exception("Banking event listener lost its connection; reconnecting")
+        finally:
+            db.close()
+        time.sleep(_RECONNECT_DELAY)
@@ -39,6 +39,11 @@ class RecipientNotFoundError(NotFoundError):
     default_message = "Recipient not found in the system."
 
 
+class IdempotencyKeyConflictError(MaraTechError):
+    status_code = 422
+    default_message = "Idempotency-Key was already used for a different request."
+
+
 class InsufficientFundsError(MaraTechError):
     status_code = 400
     default_message = "Insufficient funds."
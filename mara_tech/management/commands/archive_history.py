@@ -0,0 +1,65 @@
+"""Move old HistBanque rows into the archive table in small, resumable batches."""
+
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection
+from django.utils import timezone
+
+from ...models import HistBanque, HistBanqueArchive
+from ...services.archive_service import archive_batch
+
+
+class Command(BaseCommand):
+    help = "Archive HistBanque rows older than HISTORY_ARCHIVE_AFTER_DAYS; safe to interrupt and re-run."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.HISTORY_ARCHIVE_AFTER_DAYS,
+            help="Age threshold; may not be lower than HISTORY_ARCHIVE_AFTER_DAYS.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--max-batches", type=int, help="Stop after this many batches (resume later).")
+        parser.add_argument("--pause-ms", type=int, default=0, help="Sleep between batches to limit load on the primary.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if connection.vendor != "postgresql":
+            raise CommandError("History archival needs PostgreSQL.")
+        if options["older_than_days"] < settings.HISTORY_ARCHIVE_AFTER_DAYS:
+            raise CommandError(
+                f"--older-than-days must be at least HISTORY_ARCHIVE_AFTER_DAYS ({settings.HISTORY_ARCHIVE_AFTER_DAYS}); "
+                "history reads only look in the archive past that age."
+            )
+
+        cutoff = timezone.now() - timedelta(days=options["older_than_days"])
+        started = time.perf_counter()
+        moved = batches = 0
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            try:
+                count = archive_batch(cutoff, options["batch_size"])
+            except IntegrityError as exc:
+                raise CommandError(
+                    f"A row to archive already exists in {HistBanqueArchive._meta.db_table}; the batch was rolled back "
+                    f"and nothing was deleted ({moved} row(s) archived before). Resolve the duplicate id and re-run: {exc}"
+                ) from exc
+            if not count:
+                break
+            moved += count
+            batches += 1
+            self.stdout.write(f"batch {batches}: {count} row(s) archived ({moved} total)")
+            if options["pause_ms"]:
+                time.sleep(options["pause_ms"] / 1000)
+
+        if moved:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {HistBanque._meta.db_table}, {HistBanqueArchive._meta.db_table}")
+        remaining = HistBanque.objects.filter(time__lt=cutoff).exists()
+        self.stdout.write(
+            f"Archived {moved} row(s) older than {cutoff:%Y-%m-%d} in {time.perf_counter() - started:.1f}s"
+            + ("; more remain, run again to resume." if remaining else ".")
+        )
@@ -0,0 +1,55 @@
+"""Rebuild DailyAccountAggregate rows from the transaction history."""
+
+import time
+from datetime import date, timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from ...models import HistBanque, HistBanqueArchive
+from ...services.aggregate_service import rebuild_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recompute daily per-account aggregates from the (hot and archived) history, one window of days at a time."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--since", type=date.fromisoformat, help="First day to rebuild (default: oldest history row).")
+        parser.add_argument("--until", type=date.fromisoformat, help="Day to stop before (default: today).")
+        parser.add_argument("--window-days", type=int, default=7, help="Days rebuilt per transaction.")
+        parser.add_argument(
+            "--include-today",
+            action="store_true",
+            help="Also rebuild today; transfers committed while today's window is rebuilt may be missed.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        today = timezone.localdate()
+        until = options["until"] or (today + timedelta(days=1) if options["include_today"] else today)
+        since = options["since"]
+        if since is None:
+            candidates = [model.objects.aggregate(oldest=Min("time"))["oldest"] for model in (HistBanqueArchive, HistBanque)]
+            oldest = min((t for t in candidates if t is not None), default=None)
+            if oldest is None:
+                self.stdout.write("No history to aggregate.")
+                return
+            since = timezone.localdate(oldest)
+        if since >= until:
+            raise CommandError(f"Empty range: {since} → {until}.")
+        if until > today and not options["include_today"]:
+            raise CommandError("Rebuilding today races with live transfers; pass --include-today to do it anyway.")
+
+        step = timedelta(days=max(1, options["window_days"]))
+        started = time.perf_counter()
+        rows = 0
+        window_start = since
+        while window_start < until:
+            window_end = min(window_start + step, until)
+            written = rebuild_aggregates(window_start, window_end)
+            rows += written
+            self.stdout.write(f"{window_start} → {window_end}: {written} row(s)")
+            window_start = window_end
+
+        self.stdout.write(f"Rebuilt {rows} aggregate row(s) for {since} → {until} in {time.perf_counter() - started:.1f}s")
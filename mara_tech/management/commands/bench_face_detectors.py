@@ -0,0 +1,119 @@
+"""Benchmark the vision-fallback face/eye detector backends on a local image set."""
+
+import json
+import math
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+
+import cv2
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services.face_detectors import DETECTOR_BACKENDS, Box, FaceDetector, get_face_detector
+from ...services.vision_service import _assess_local
+
+_IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+def _iou(a: Box, b: Box) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+def _p95(ordered: list[float]) -> float:
+    """Nearest-rank 95th percentile of an ascending, non-empty list."""
+    return ordered[math.ceil(len(ordered) * 0.95) - 1]
+
+
+def _largest(faces: list[Box]) -> Box | None:
+    return max(faces, key=lambda box: box[2] * box[3]) if faces else None
+
+
+def _detect_frame(detector: FaceDetector, image: Any) -> tuple[Box | None, int]:
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    face = _largest(detector.detect_faces(gray, image))
+    if face is None:
+        return None, 0
+    x, y, w, h = face
+    return face, len(detector.detect_eyes(gray[y:y + h, x:x + w]))
+
+
+class Command(BaseCommand):
+    help = "Report per-frame latency and agreement of face/eye detector backends on a directory of images."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("images", help="Directory of face images.")
+        parser.add_argument("--backends", default=",".join(DETECTOR_BACKENDS), help="Comma-separated backends to compare.")
+        parser.add_argument("--reference", default="haar", help="Backend the others are compared against.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per frame.")
+        parser.add_argument("--labels", help="Optional JSON file mapping image file name to expected is_blind.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        paths = sorted(p for p in Path(options["images"]).iterdir() if p.suffix.lower() in _IMAGE_SUFFIXES)
+        frames = [(p.name, image) for p in paths if (image := cv2.imread(str(p))) is not None]
+        if not frames:
+            raise CommandError(f"No readable images in {options['images']}.")
+
+        labels: dict[str, bool] = {}
+        if options["labels"]:
+            labels = {name: bool(value) for name, value in json.loads(Path(options["labels"]).read_text()).items()}
+
+        names = [n.strip().lower() for n in options["backends"].split(",") if n.strip()]
+        reference = options["reference"].lower()
+        if reference not in names:
+            names.insert(0, reference)
+
+        results: dict[str, dict[str, Any]] = {}
+        for name in names:
+            detector = get_face_detector(name)
+            if detector.name != name:
+                self.stderr.write(f"{name}: backend unavailable, skipped.")
+                continue
+
+            latencies: list[float] = []
+            per_frame: dict[str, tuple[Box | None, int, bool]] = {}
+            for file_name, image in frames:
+                face, eye_count = _detect_frame(detector, image)
+                for _ in range(options["repeat"]):
+                    start = time.perf_counter()
+                    _detect_frame(detector, image)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                per_frame[file_name] = (face, eye_count, _assess_local(image, None, detector).is_blind)
+            results[name] = {"latencies": sorted(latencies), "frames": per_frame}
+
+        if reference not in results:
+            raise CommandError(f"Reference backend '{reference}' is unavailable.")
+        ref_frames = results[reference]["frames"]
+
+        self.stdout.write(f"{len(frames)} frame(s), reference={reference}")
+        self.stdout.write(f"{'backend':<8} {'mean ms':>8} {'p95 ms':>8} {'faces':>6} {'face agr':>9} {'IoU≥.5':>7} {'blind agr':>10} {'accuracy':>9}")
+        for name, result in results.items():
+            latencies = result["latencies"]
+            per_frame = result["frames"]
+            if not latencies:
+                self.stderr.write(f"{name}: no timed runs, skipped.")
+                continue
+            found = sum(1 for face, _, _ in per_frame.values() if face is not None)
+            face_agree = sum(1 for f, (face, _, _) in per_frame.items() if (face is None) == (ref_frames[f][0] is None))
+            overlap = sum(
+                1
+                for f, (face, _, _) in per_frame.items()
+                if face is not None and ref_frames[f][0] is not None and _iou(face, ref_frames[f][0]) >= 0.5
+            )
+            blind_agree = sum(1 for f, (_, _, blind) in per_frame.items() if blind == ref_frames[f][2])
+            labelled = [f for f in per_frame if f in labels]
+            accuracy = (
+                f"{sum(1 for f in labelled if per_frame[f][2] == labels[f]) / len(labelled):9.0%}" if labelled else f"{'-':>9}"
+            )
+            self.stdout.write(
+                f"{name:<8} {statistics.mean(latencies):8.2f} {_p95(latencies):8.2f} "
+                f"{found:6d} {face_agree / len(frames):9.0%} {overlap:7d} {blind_agree / len(frames):10.0%} {accuracy}"
+            )
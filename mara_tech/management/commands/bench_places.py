@@ -0,0 +1,78 @@
+"""Compare place-search latency: the in-process POI index against the Overpass network path."""
+
+import random
+import statistics
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services import places_service
+from ...services.poi_index import get_index
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    return sorted(samples)[max(0, int(len(samples) * q) - 1)]
+
+
+class Command(BaseCommand):
+    help = "Time nearby-place searches on the POI index and on a cold Overpass fetch for the same points."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--points", type=int, default=1000, help="Index searches (random points near indexed places).")
+        parser.add_argument("--network", type=int, default=5, help="Overpass searches (0 to skip the network path).")
+        parser.add_argument("--place-type", default="supermarket", choices=sorted(places_service.OSM_TAGS))
+        parser.add_argument("--overpass-url", help="Overpass endpoint to use instead of the public one (e.g. a local mirror).")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        index = get_index()
+        if index is None:
+            raise CommandError("No POI index at POI_INDEX_PATH; run build_poi_index first.")
+        if options["overpass_url"]:
+            places_service.OVERPASS_URL = options["overpass_url"]
+
+        rng = random.Random(options["seed"])
+        tag = places_service.OSM_TAGS[options["place_type"]]
+        # ~1 km jitter around indexed places, so searches land where the data is.
+        picks = [rng.randrange(len(index)) for _ in range(max(options["points"], options["network"]))]
+        points = [(float(index.lat[i]) + rng.uniform(-0.01, 0.01), float(index.lng[i]) + rng.uniform(-0.01, 0.01)) for i in picks]
+
+        def search_index(lat: float, lng: float) -> list[dict]:
+            return index.search(lat, lng, tag, radius_km=places_service.SEARCH_RADIUS_KM, limit=places_service.MAX_RESULTS)
+
+        def search_network(lat: float, lng: float) -> list[dict]:
+            fetched, _ = places_service._fetch_tiles({tag: places_service.search_tiles(lat, lng)})
+            return places_service._rank(lat, lng, [p for places in fetched.values() for p in places])
+
+        index_us: list[float] = []
+        found = 0
+        for lat, lng in points[:options["points"]]:
+            start = time.perf_counter()
+            found += bool(search_index(lat, lng))
+            index_us.append((time.perf_counter() - start) * 1e6)
+        self.stdout.write(f"{len(index)} indexed entries, tag {tag}, radius {places_service.SEARCH_RADIUS_KM} km")
+        self.stdout.write(f"{'path':<8} {'runs':>6} {'mean':>10} {'p50':>10} {'p95':>10} {'hits':>6} {'agree':>6}")
+        self.stdout.write(
+            f"{'index':<8} {len(index_us):6d} {statistics.mean(index_us):8.1f}µs {_percentile(index_us, 0.5):8.1f}µs "
+            f"{_percentile(index_us, 0.95):8.1f}µs {found:6d} {'-':>6}"
+        )
+        if not options["network"]:
+            return
+
+        network_ms: list[float] = []
+        found = agree = 0
+        for lat, lng in points[:options["network"]]:
+            start = time.perf_counter()
+            try:
+                places = search_network(lat, lng)
+            except Exception as exc:
+                raise CommandError(f"Overpass request failed: {exc}") from exc
+            network_ms.append((time.perf_counter() - start) * 1000)
+            found += bool(places)
+            agree += [p["name"] for p in places] == [p["name"] for p in search_index(lat, lng)]
+        self.stdout.write(
+            f"{'overpass':<8} {len(network_ms):6d} {statistics.mean(network_ms):8.1f}ms {_percentile(network_ms, 0.5):8.1f}ms "
+            f"{_percentile(network_ms, 0.95):8.1f}ms {found:6d} {agree:6d}"
+        )
+        self.stdout.write(f"index is {statistics.mean(network_ms) * 1000 / statistics.mean(index_us):,.0f}x faster on average")
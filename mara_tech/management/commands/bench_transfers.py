@@ -0,0 +1,105 @@
+"""Concurrency benchmark for banking_service.execute_transaction."""
+
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+
+from ...exceptions import MaraTechError
+from ...models import Compte, User, UserNameToken
+from ...services import banking_service, ledger_service
+
+_PREFIX = "BENCH-"
+
+
+class Command(BaseCommand):
+    help = "Run many parallel transfers between seeded accounts and report transfers per second."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--senders", type=int, default=32, help="Parallel sender threads (one account each).")
+        parser.add_argument("--recipients", type=int, default=4, help="Shared recipient accounts (contention hot spots).")
+        parser.add_argument("--transfers", type=int, default=25, help="Transfers per sender.")
+        parser.add_argument("--balance", type=Decimal, default=Decimal("1000.00"))
+        parser.add_argument("--ledger", action="store_true", help="Run in ledger mode (append-only entries), then compact.")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded rows after the run.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with override_settings(BANKING_LEDGER_MODE=options["ledger"]):
+            self._run(options)
+
+    def _run(self, options: dict[str, Any]) -> None:
+        senders, recipients = self._seed(options["senders"], options["recipients"], options["balance"])
+        everyone = senders + recipients
+        opening_total = self._total()
+
+        outcomes: Counter[str] = Counter()
+
+        def run_sender(sender: User) -> Counter[str]:
+            local: Counter[str] = Counter()
+            rng = random.Random(sender.bank_id)
+            try:
+                for _ in range(options["transfers"]):
+                    # Mostly pay a shared recipient; sometimes another sender, so both lock orders occur.
+                    target = rng.choice(recipients) if rng.random() < 0.8 else rng.choice(everyone)
+                    amount = Decimal(rng.randint(1, 5000)) / 100
+                    try:
+                        banking_service.execute_transaction(sender.bank_id, target.nom, amount, "bench")
+                        local["ok"] += 1
+                    except MaraTechError as exc:
+                        local[type(exc).__name__] += 1
+            finally:
+                connection.close()
+            return local
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(senders)) as pool:
+            for result in pool.map(run_sender, senders):
+                outcomes.update(result)
+        elapsed = time.perf_counter() - start
+
+        closing_total = self._total()
+        negatives = sum(1 for balance in self._balances().values() if balance < 0)
+
+        attempted = sum(outcomes.values())
+        self.stdout.write(f"{len(senders)} senders, {len(recipients)} shared recipients, {attempted} transfers in {elapsed:.2f}s")
+        self.stdout.write(f"throughput: {outcomes['ok'] / elapsed:.1f} committed transfers/s ({attempted / elapsed:.1f} attempted/s)")
+        self.stdout.write("outcomes: " + ", ".join(f"{k}={v}" for k, v in sorted(outcomes.items())))
+        self.stdout.write(f"balance conserved: {opening_total == closing_total} ({opening_total} → {closing_total}), negative balances: {negatives}")
+
+        if options["ledger"]:
+            start = time.perf_counter()
+            folded = ledger_service.compact()
+            self.stdout.write(
+                f"compaction: {folded} entries in {time.perf_counter() - start:.2f}s, "
+                f"balances unchanged: {self._total() == closing_total}"
+            )
+
+        if not options["keep"]:
+            User.objects.filter(bank_id__startswith=_PREFIX).delete()
+
+    def _seed(self, n_senders: int, n_recipients: int, balance: Decimal) -> tuple[list[User], list[User]]:
+        User.objects.filter(bank_id__startswith=_PREFIX).delete()
+
+        def make(role: str, i: int) -> User:
+            bank_id = f"{_PREFIX}{role}-{i:05d}"
+            return User(nom=f"Bench{role}{i:05d}", prenom="Bench", cin=bank_id, bank_id=bank_id)
+
+        users = User.objects.bulk_create([make("sender", i) for i in range(n_senders)] + [make("recipient", i) for i in range(n_recipients)])
+        Compte.objects.bulk_create([Compte(bank_id=user, solde=balance) for user in users])
+        UserNameToken.sync_for(*users)
+        return users[:n_senders], users[n_senders:]
+
+    def _balances(self) -> dict[str, Decimal]:
+        accounts = Compte.objects.filter(bank_id__bank_id__startswith=_PREFIX)
+        if ledger_service.ledger_enabled():
+            return ledger_service.balances(accounts.values_list("pk", flat=True))
+        return dict(accounts.values_list("pk", "solde"))
+
+    def _total(self) -> Decimal:
+        return sum(self._balances().values(), Decimal("0"))
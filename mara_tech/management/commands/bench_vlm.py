@@ -0,0 +1,121 @@
+"""Benchmark the VLM client against a local stub OpenAI-compatible server."""
+
+import json
+import statistics
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand
+
+from ...services.vlm_client import AsyncVLMClient
+
+_STUB_CONTENT = json.dumps({"score": 82, "ok": True, "is_blind": False, "reason": "Eyes are open and visible"})
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def _make_stub_handler(latency_s: float, connect_s: float) -> type[BaseHTTPRequestHandler]:
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            # Stands in for the TCP/TLS handshake paid once per new connection.
+            time.sleep(connect_s)
+            super().setup()
+
+        def do_POST(self) -> None:  # noqa: N802
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency_s)
+            body = json.dumps({"choices": [{"message": {"content": _STUB_CONTENT}}]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return StubHandler
+
+
+def _urllib_call(url: str, payload: dict[str, Any]) -> dict[str, Any]:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Authorization": "Bearer stub", "Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def _run(call: Callable[[], Any], requests: int, workers: int) -> dict[str, float]:
+    latencies: list[float] = []
+
+    def timed() -> None:
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(timed) for _ in range(requests)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "req_per_s": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare blocking urllib VLM calls with the pooled, micro-batching async client against a local stub."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--workers", type=int, default=16, help="Concurrent callers (simulated request threads).")
+        parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated server-side inference latency.")
+        parser.add_argument("--connect-ms", type=float, default=15.0, help="Simulated per-connection handshake cost.")
+        parser.add_argument("--max-concurrency", type=int, default=16)
+        parser.add_argument("--batch-window-ms", type=float, default=5.0)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        server = _StubServer(("127.0.0.1", 0), _make_stub_handler(options["latency_ms"] / 1000.0, options["connect_ms"] / 1000.0))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+        payload = {"model": "stub", "messages": [{"role": "user", "content": "ping"}]}
+
+        try:
+            baseline = _run(lambda: _urllib_call(url, payload), options["requests"], options["workers"])
+
+            client = AsyncVLMClient(
+                url,
+                "stub",
+                max_concurrency=options["max_concurrency"],
+                batch_window_ms=options["batch_window_ms"],
+            )
+            try:
+                pooled = _run(lambda: client.submit_sync(payload), options["requests"], options["workers"])
+                stats = client.stats()
+            finally:
+                client.close()
+        finally:
+            server.shutdown()
+
+        for label, result in (("urllib (per-call connection)", baseline), ("async pooled + micro-batch", pooled)):
+            self.stdout.write(
+                f"{label:<30} {result['req_per_s']:8.1f} req/s   p50 {result['p50_ms']:7.1f} ms   p95 {result['p95_ms']:7.1f} ms"
+            )
+        self.stdout.write(f"micro-batches: {stats.batches}, mean batch size: {stats.mean_batch_size:.2f}, failed: {stats.failed}")
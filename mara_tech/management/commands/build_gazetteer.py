@@ -0,0 +1,45 @@
+"""Build the offline reverse-geocoding gazetteer from a local OpenStreetMap extract."""
+
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services.geocoding_service import GAZETTEER_KEYS
+from ...services.osm_extract import read_elements, tagged_rows
+from ...services.poi_index import POIIndex
+
+
+class Command(BaseCommand):
+    help = "Import named localities, neighbourhoods and landmarks from a local OSM extract into GAZETTEER_PATH."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("extract", help="OSM extract: .osm.pbf (needs pyosmium), .geojson or .geojsonseq.")
+        parser.add_argument("--output", default=str(settings.GAZETTEER_PATH), help="Gazetteer file to write.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path = Path(options["extract"])
+        if not path.is_file():
+            raise CommandError(f"No such file: {path}")
+
+        started = time.perf_counter()
+        try:
+            rows = list(tagged_rows(read_elements(path, GAZETTEER_KEYS), GAZETTEER_KEYS))
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        if not rows:
+            raise CommandError(f"No named {'/'.join(GAZETTEER_KEYS)} features in {path}.")
+
+        gazetteer = POIIndex.build(rows)
+        output = Path(options["output"])
+        gazetteer.save(output)
+
+        places = Counter(tag for tag, _ in rows if tag.startswith("place="))
+        self.stdout.write(
+            f"{len(gazetteer)} entries ({', '.join(f'{t[6:]}: {n}' for t, n in places.most_common())}, "
+            f"landmarks: {len(rows) - places.total()}), {gazetteer.nbytes / 1e6:.1f} MB in memory, "
+            f"{output.stat().st_size / 1e6:.1f} MB on disk → {output} ({time.perf_counter() - started:.1f}s)"
+        )
@@ -0,0 +1,44 @@
+"""Build the offline POI index from a local OpenStreetMap extract (GeoJSON, or PBF with pyosmium)."""
+
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services.osm_extract import read_elements, tagged_rows
+from ...services.poi_index import INDEXED_KEYS, POIIndex
+
+
+class Command(BaseCommand):
+    help = "Import named shops and amenities from a local OSM extract into the POI index at POI_INDEX_PATH."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("extract", help="OSM extract: .osm.pbf (needs pyosmium), .geojson or .geojsonseq.")
+        parser.add_argument("--output", default=str(settings.POI_INDEX_PATH), help="Index file to write.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path = Path(options["extract"])
+        if not path.is_file():
+            raise CommandError(f"No such file: {path}")
+
+        started = time.perf_counter()
+        try:
+            rows = list(tagged_rows(read_elements(path, INDEXED_KEYS), INDEXED_KEYS))
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        if not rows:
+            raise CommandError(f"No named {'/'.join(INDEXED_KEYS)} features in {path}.")
+
+        index = POIIndex.build(rows)
+        output = Path(options["output"])
+        index.save(output)
+
+        per_key = Counter(tag.partition("=")[0] for tag, _ in rows)
+        self.stdout.write(
+            f"{len(index)} entries ({', '.join(f'{k}: {n}' for k, n in per_key.items())}), {len(index.tags)} tags, "
+            f"{index.shape[0]}x{index.shape[1]} grid, {index.nbytes / 1e6:.1f} MB in memory, "
+            f"{output.stat().st_size / 1e6:.1f} MB on disk → {output} ({time.perf_counter() - started:.1f}s)"
+        )
@@ -0,0 +1,46 @@
+"""Background compactor for ledger mode: fold new ledger entries into balance snapshots."""
+
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ...services import ledger_service
+
+
+class Command(BaseCommand):
+    help = "Fold ledger entries into balance snapshots and daily aggregates, once or every --interval seconds."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--loop", action="store_true", help="Keep running, compacting every --interval seconds.")
+        parser.add_argument("--interval", type=int, default=settings.LEDGER_COMPACT_INTERVAL)
+        parser.add_argument(
+            "--write-back",
+            action="store_true",
+            help="Leave ledger mode: copy balances into Compte.solde and clear the ledger (maintenance window only).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if connection.vendor != "postgresql":
+            raise CommandError("Ledger mode needs PostgreSQL.")
+
+        if options["write_back"]:
+            if settings.BANKING_LEDGER_MODE:
+                raise CommandError("Turn BANKING_LEDGER_MODE off (and restart the workers) before writing balances back.")
+            try:
+                updated = ledger_service.write_back()
+            except RuntimeError as exc:
+                raise CommandError(str(exc)) from exc
+            self.stdout.write(f"Wrote {updated} balance(s) back to Compte.solde; ledger cleared.")
+            return
+
+        while True:
+            started = time.perf_counter()
+            folded = ledger_service.compact()
+            self.stdout.write(f"Folded {folded} ledger entr{'y' if folded == 1 else 'ies'} in {(time.perf_counter() - started) * 1000:.0f} ms")
+            if not options["loop"]:
+                return
+            connection.close()
+            time.sleep(options["interval"])
@@ -0,0 +1,21 @@
+"""Delete idle shopping-assistant chat sessions."""
+
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...services.chat_session_service import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete chat sessions idle for longer than the TTL (run periodically, e.g. hourly from cron)."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--ttl-hours", type=int, default=settings.CHAT_SESSION_TTL_HOURS)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        deleted = purge_expired(timedelta(hours=options["ttl_hours"]), batch_size=options["batch_size"])
+        self.stdout.write(f"Deleted {deleted} chat session(s) idle for more than {options['ttl_hours']}h.")
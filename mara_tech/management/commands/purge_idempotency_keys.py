@@ -0,0 +1,21 @@
+"""Delete expired Idempotency-Key records."""
+
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...services.idempotency_service import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete Idempotency-Key records older than the TTL (run periodically, e.g. hourly from cron)."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--ttl-hours", type=int, default=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        deleted = purge_expired(timedelta(hours=options["ttl_hours"]), batch_size=options["batch_size"])
+        self.stdout.write(f"Deleted {deleted} idempotency key(s) older than {options['ttl_hours']}h.")
@@ -0,0 +1,24 @@
+"""Rebuild the recipient-search name tokens of every user."""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...models import User, UserNameToken
+
+
+class Command(BaseCommand):
+    help = "Recompute UserNameToken rows from nom/prenom (after bulk_create() or QuerySet.update(), which skip User.save())."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        users = User.objects.only("id", "nom", "prenom").order_by("id")
+        last_id, synced = 0, 0
+        while batch := list(users.filter(id__gt=last_id)[: options["batch_size"]]):
+            with transaction.atomic():
+                UserNameToken.sync_for(*batch)
+            last_id, synced = batch[-1].id, synced + len(batch)
+        self.stdout.write(f"Rebuilt name tokens for {synced} user(s).")
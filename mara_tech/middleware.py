@@ -0,0 +1,94 @@
+"""Debug middleware: count SQL queries per request and flag repeated ones."""
+
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.http import HttpRequest, HttpResponseBase
+
+logger = logging.getLogger(__name__)
+
+# (sql, repr(params)) as seen by the database wrapper
+Query = tuple[str, str]
+
+
+def repeated_queries(queries: list[Query]) -> list[tuple[str, int]]:
+    """Identical statements (same SQL and parameters) issued more than once."""
+    return [(sql, n) for (sql, _), n in Counter(queries).items() if n > 1]
+
+
+def n_plus_one_suspects(queries: list[Query], threshold: int) -> list[tuple[str, int]]:
+    """SQL shapes run at least ``threshold`` times with different parameters (the N in N+1)."""
+    return [(sql, n) for sql, n in Counter(sql for sql, _ in queries).items() if n >= threshold]
+
+
+class QueryCollector:
+    """``connection.execute_wrapper`` hook that records every statement."""
+
+    def __init__(self) -> None:
+        self.queries: list[Query] = []
+
+    def __call__(self, execute: Callable, sql: str, params, many: bool, context: dict):
+        self.queries.append((sql, repr(params)))
+        return execute(sql, params, many, context)
+
+
+class QueryInspectionMiddleware:
+    """Add ``X-Query-Count`` to responses and log requests that repeat queries.
+
+    Enabled by ``QUERY_INSPECTION`` (defaults to ``DEBUG``). Queries a
+    ``StreamingHttpResponse`` runs while streaming happen after this
+    middleware returns and are not counted. Sync and async capable, so it
+    does not force async views under ASGI through a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase | Awaitable[HttpResponseBase]]) -> None:
+        self.get_response = get_response
+        self.n_plus_one_threshold = settings.QUERY_N_PLUS_ONE_THRESHOLD
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        collector = QueryCollector()
+        with connection.execute_wrapper(collector):
+            response = self.get_response(request)
+        return self._report(request, response, collector.queries)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        # Under ASGI the ORM runs on the request's thread-sensitive thread (sync views and
+        # sync_to_async calls), whose connection is not this one: hook the collector there.
+        collector = QueryCollector()
+        await sync_to_async(_add_wrapper)(collector)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_remove_wrapper)(collector)
+        return self._report(request, response, collector.queries)
+
+    def _report(self, request: HttpRequest, response: HttpResponseBase, queries: list[Query]) -> HttpResponseBase:
+        response["X-Query-Count"] = str(len(queries))
+        repeated = repeated_queries(queries)
+        suspects = n_plus_one_suspects(queries, self.n_plus_one_threshold)
+        if repeated or suspects:
+            response["X-Repeated-Queries"] = str(len(repeated) + len(suspects))
+        for sql, n in repeated:
+            logger.warning("%s %s: identical query ran %d times: %s", request.method, request.path, n, sql)
+        for sql, n in suspects:
+            logger.warning("%s %s: possible N+1, query shape ran %d times: %s", request.method, request.path, n, sql)
+        return response
+
+
+def _add_wrapper(collector: QueryCollector) -> None:
+    connection.execute_wrappers.append(collector)
+
+
+def _remove_wrapper(collector: QueryCollector) -> None:
+    connection.execute_wrappers.remove(collector)
@@ -0,0 +1,50 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:05
+
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _tokens(*parts):
+    tokens = set()
+    for part in parts:
+        decomposed = unicodedata.normalize("NFKD", part or "")
+        stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+        tokens.update("".join(ch if ch.isalnum() else " " for ch in stripped.casefold()).split())
+    return tokens
+
+
+def backfill_name_tokens(apps, schema_editor):
+    User = apps.get_model('mara_tech', 'User')
+    UserNameToken = apps.get_model('mara_tech', 'UserNameToken')
+    batch = []
+    for user in User.objects.only('id', 'nom', 'prenom').iterator(chunk_size=2000):
+        batch.extend(UserNameToken(user_id=user.id, token=token[:100]) for token in _tokens(user.nom, user.prenom))
+        if len(batch) >= 5000:
+            UserNameToken.objects.bulk_create(batch)
+            batch = []
+    UserNameToken.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mara_tech', '0002_alter_user_options_user_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserNameToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='name_tokens', to='mara_tech.user')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token'], name='usernametoken_token_prefix', opclasses=['varchar_pattern_ops'])],
+                'constraints': [models.UniqueConstraint(fields=('user', 'token'), name='usernametoken_user_token_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_name_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:08
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mara_tech', '0003_usernametoken'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='histbanque',
+            index=models.Index(fields=['bid_sender', '-time', '-id'], name='histbanque_sender_time'),
+        ),
+        migrations.AddIndex(
+            model_name='histbanque',
+            index=models.Index(fields=['bid_reciever', '-time', '-id'], name='histbanque_reciever_time'),
+        ),
+        migrations.AddIndex(
+            model_name='histbanque',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['time'], name='histbanque_time_brin'),
+        ),
+        migrations.AlterField(
+            model_name='histbanque',
+            name='bid_reciever',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='transactions_received', to='mara_tech.user', to_field='bank_id'),
+        ),
+        migrations.AlterField(
+            model_name='histbanque',
+            name='bid_sender',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='transactions_sent', to='mara_tech.user', to_field='bank_id'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mara_tech', '0004_histbanque_party_time_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAccountAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('debit_total', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('credit_total', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('debit_count', models.PositiveIntegerField(default=0)),
+                ('credit_count', models.PositiveIntegerField(default=0)),
+                ('counterparties', models.JSONField(default=dict)),
+                ('bank_id', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='daily_aggregates', to='mara_tech.user', to_field='bank_id')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('bank_id', 'day'), name='dailyaggregate_account_day_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-19 18:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mara_tech', '0006_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistBanqueArchive',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('action', models.CharField(max_length=100)),
+                ('time', models.DateTimeField()),
+                ('montant', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('bid_reciever', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_received', to='mara_tech.user', to_field='bank_id')),
+                ('bid_sender', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_sent', to='mara_tech.user', to_field='bank_id')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['bid_sender', '-time', '-id'], name='histarchive_sender_time'), models.Index(fields=['bid_reciever', '-time', '-id'], name='histarchive_reciever_time'), models.Index(fields=['time'], name='histarchive_time')],
+            },
+        ),
+    ]
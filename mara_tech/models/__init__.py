@@ -1,7 +1,12 @@
 from .user import User
 from .produit import Produit
 from .compte import Compte
-from .hist_banque import HistBanque
+from .hist_banque import HistBanque, HistBanqueArchive
 from .shopping import Shopping
+from .user_name_token import UserNameToken
+from .daily_aggregate import DailyAccountAggregate
+from .idempotency_key import IdempotencyKey
+from .ledger import BalanceSnapshot, LedgerCheckpoint, LedgerEntry
+from .chat_session import ChatSession
 
-__all__ = ['User', 'Produit', 'Compte', 'HistBanque', 'Shopping']
+__all__ = ['User', 'Produit', 'Compte', 'HistBanque', 'HistBanqueArchive', 'Shopping', 'UserNameToken', 'DailyAccountAggregate', 'IdempotencyKey', 'LedgerEntry', 'BalanceSnapshot', 'LedgerCheckpoint', 'ChatSession']
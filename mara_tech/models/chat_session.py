@@ -0,0 +1,17 @@
+import uuid
+
+from django.db import models
+
+
+class ChatSession(models.Model):
+    """Server-side shopping-assistant conversation: a running summary plus the most recent turns"""
+    session_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Older turns, folded into a short summary once the history outgrows its token budget.
+    summary = models.TextField(blank=True, default="")
+    # Recent turns, oldest first: [{"role": "user" | "assistant", "content": "..."}]
+    turns = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"ChatSession {self.session_id} ({len(self.turns)} turns)"
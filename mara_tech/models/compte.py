@@ -1,4 +1,8 @@
 from django.db import models
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .. import cache
 from .user import User
 
 
@@ -6,6 +10,15 @@ class Compte(models.Model):
     """Compte (Account) table"""
     bank_id = models.OneToOneField(User, on_delete=models.CASCADE, to_field='bank_id', primary_key=True)
     solde = models.DecimalField(max_digits=15, decimal_places=2, default=0)
-    
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.invalidate_on_commit("balance", self.pk)
+
     def __str__(self):
         return f"Compte {self.bank_id} - Solde: {self.solde}"
+
+
+@receiver(post_delete, sender=Compte)
+def _invalidate_deleted_account(sender, instance: Compte, **kwargs) -> None:
+    cache.invalidate_on_commit("balance", instance.pk)
@@ -0,0 +1,21 @@
+from django.db import models
+
+from .user import User
+
+
+class DailyAccountAggregate(models.Model):
+    """Per-account, per-day spending totals, maintained with each transfer"""
+    bank_id = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_aggregates', to_field='bank_id', db_index=False)
+    day = models.DateField()
+    debit_total = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    credit_total = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    debit_count = models.PositiveIntegerField(default=0)
+    credit_count = models.PositiveIntegerField(default=0)
+    # {counterparty bank_id: {"out": "12.50", "in": "0", "n": 2}} — top entries by volume only.
+    counterparties = models.JSONField(default=dict)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['bank_id', 'day'], name='dailyaggregate_account_day_uniq')]
+
+    def __str__(self):
+        return f"{self.bank_id_id} {self.day}: -{self.debit_total} / +{self.credit_total}"
@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import BrinIndex
 from django.db import models
 from .user import User
 
@@ -5,11 +6,41 @@ from .user import User
 class HistBanque(models.Model):
     """Banking history table"""
     id = models.AutoField(primary_key=True)
-    bid_sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='transactions_sent', to_field='bank_id')
-    bid_reciever = models.ForeignKey(User, on_delete=models.CASCADE, related_name='transactions_received', to_field='bank_id')
+    # Indexed through the composite (party, time, id) indexes below.
+    bid_sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='transactions_sent', to_field='bank_id', db_index=False)
+    bid_reciever = models.ForeignKey(User, on_delete=models.CASCADE, related_name='transactions_received', to_field='bank_id', db_index=False)
     action = models.CharField(max_length=100)
     time = models.DateTimeField(auto_now_add=True)
     montant = models.DecimalField(max_digits=15, decimal_places=2)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['bid_sender', '-time', '-id'], name='histbanque_sender_time'),
+            models.Index(fields=['bid_reciever', '-time', '-id'], name='histbanque_reciever_time'),
+            # Rows are appended in time order, so a BRIN index serves time-range scans at a tiny size.
+            BrinIndex(fields=['time'], name='histbanque_time_brin'),
+        ]
     
     def __str__(self):
         return f"{self.action} - {self.montant} - {self.time}"
+
+
+class HistBanqueArchive(models.Model):
+    """Cold storage for HistBanque rows older than HISTORY_ARCHIVE_AFTER_DAYS (same columns and ids)"""
+    id = models.IntegerField(primary_key=True)
+    bid_sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_sent', to_field='bank_id', db_index=False)
+    bid_reciever = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_received', to_field='bank_id', db_index=False)
+    action = models.CharField(max_length=100)
+    time = models.DateTimeField()
+    montant = models.DecimalField(max_digits=15, decimal_places=2)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['bid_sender', '-time', '-id'], name='histarchive_sender_time'),
+            models.Index(fields=['bid_reciever', '-time', '-id'], name='histarchive_reciever_time'),
+            # B-tree (not BRIN): the archive watermark is read as MAX(time).
+            models.Index(fields=['time'], name='histarchive_time'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} - {self.montant} - {self.time} (archived)"
@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    """Stored outcome of a request sent with an Idempotency-Key header"""
+    key = models.CharField(max_length=255, primary_key=True)
+    # SHA-256 of the canonical request body, to reject a key reused for another request.
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    response = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.key} → {self.status_code}"
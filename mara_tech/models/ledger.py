@@ -0,0 +1,41 @@
+from django.db import models
+
+from .user import User
+
+
+class LedgerEntry(models.Model):
+    """Immutable debit (negative) or credit (positive) line, used instead of updating Compte.solde in ledger mode"""
+    id = models.BigAutoField(primary_key=True)
+    bank_id = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ledger_entries', to_field='bank_id', db_index=False)
+    counterparty = models.CharField(max_length=100)
+    amount = models.DecimalField(max_digits=15, decimal_places=2)
+    # HistBanque id (not a foreign key: history rows may move to the archive).
+    transaction_id = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['bank_id', 'id'], name='ledgerentry_account_id')]
+
+    def __str__(self):
+        return f"{self.bank_id_id} {self.amount:+} (#{self.transaction_id})"
+
+
+class BalanceSnapshot(models.Model):
+    """Balance of an account including every ledger entry up to last_entry_id"""
+    bank_id = models.OneToOneField(User, on_delete=models.CASCADE, related_name='balance_snapshot', to_field='bank_id', primary_key=True)
+    balance = models.DecimalField(max_digits=15, decimal_places=2)
+    last_entry_id = models.BigIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.bank_id_id}: {self.balance} @ {self.last_entry_id}"
+
+
+class LedgerCheckpoint(models.Model):
+    """How far the compactor has folded ledger entries into snapshots and daily aggregates"""
+    name = models.CharField(max_length=50, primary_key=True)
+    last_entry_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_entry_id}"
@@ -1,4 +1,9 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .. import cache
+from .user_name_token import UserNameToken
 
 
 class User(models.Model):
@@ -25,5 +30,27 @@ class User(models.Model):
         db_table = "user"
         ordering = ["-created_at"]
 
+    def save(self, *args, **kwargs):
+        # Name tokens follow nom/prenom here only: bulk_create() and QuerySet.update()
+        # bypass save(), so callers using them run UserNameToken.sync_for() themselves
+        # (or `python manage.py rebuild_name_tokens` afterwards).
+        update_fields = kwargs.get("update_fields")
+        # One transaction, so a user is never visible without its tokens (as Django does for multi-table saves).
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            if update_fields is None or {"nom", "prenom"} & set(update_fields):
+                UserNameToken.sync_for(self)
+        if self.bank_id:
+            cache.invalidate_on_commit("user", self.bank_id)
+            cache.invalidate_on_commit("balance", self.bank_id)
+
     def __str__(self):
-        return f"{self.prenom} {self.nom}"
\ No newline at end of file
+        return f"{self.prenom} {self.nom}"
+
+
+@receiver(post_delete, sender=User)
+def _invalidate_deleted_user(sender, instance: User, **kwargs) -> None:
+    # A signal rather than a delete() override: QuerySet.delete() sends it too.
+    if instance.bank_id:
+        cache.invalidate_on_commit("user", instance.bank_id)
+        cache.invalidate_on_commit("balance", instance.bank_id)
@@ -0,0 +1,36 @@
+import unicodedata
+
+from django.db import models
+
+
+def normalize_name(text: str) -> str:
+    """Fold case and accents and keep only letters/digits: ``"Bén-Ali"`` → ``"ben ali"``."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in stripped.casefold()).split())
+
+
+def name_tokens(*parts: str | None) -> set[str]:
+    return {token for part in parts for token in normalize_name(part or "").split()}
+
+
+class UserNameToken(models.Model):
+    """Normalized name tokens of a user (prefix index for recipient search)"""
+    user = models.ForeignKey("mara_tech.User", on_delete=models.CASCADE, related_name="name_tokens")
+    token = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["user", "token"], name="usernametoken_user_token_uniq")]
+        # varchar_pattern_ops lets Postgres serve both `token = x` and `token LIKE 'x%'` from one B-tree.
+        indexes = [models.Index(fields=["token"], name="usernametoken_token_prefix", opclasses=["varchar_pattern_ops"])]
+
+    @classmethod
+    def sync_for(cls, *users: models.Model) -> None:
+        """Replace the tokens of ``users`` with those of their current ``nom``/``prenom`` (two queries)."""
+        cls.objects.filter(user__in=users).delete()
+        cls.objects.bulk_create(
+            [cls(user=user, token=token[:100]) for user in users for token in name_tokens(user.nom, user.prenom)]
+        )
+
+    def __str__(self):
+        return f"{self.token} → {self.user_id}"
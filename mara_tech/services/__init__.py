@@ -1,17 +1,34 @@
 """Services layer exports."""
 
-from . import auth_service
-from .banking_service import BalanceInfo, TransactionHistory, TransactionResult, execute_transaction, get_balance, get_transaction_history
+from . import aggregate_service, auth_service, chat_session_service, idempotency_service
+from .banking_service import (
+    BalanceInfo,
+    BatchTransferResult,
+    TransactionHistory,
+    TransactionResult,
+    execute_batch_transfer,
+    execute_transaction,
+    get_balance,
+    get_transaction_history,
+)
+from .recipient_service import find_recipients, resolve_recipient
 from .vision_service import VisionResult, assess_vision_quality
 
 __all__ = [
+    "aggregate_service",
     "auth_service",
+    "chat_session_service",
+    "idempotency_service",
     "BalanceInfo",
+    "BatchTransferResult",
     "TransactionHistory",
     "TransactionResult",
     "VisionResult",
     "assess_vision_quality",
+    "execute_batch_transfer",
     "execute_transaction",
+    "find_recipients",
     "get_balance",
     "get_transaction_history",
+    "resolve_recipient",
 ]
@@ -0,0 +1,242 @@
+"""Daily per-account aggregates (debits, credits, counterparties) and spending summaries."""
+
+import calendar
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.db import transaction as db_transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..exceptions import UserNotFoundError, ValidationError
+from ..models import DailyAccountAggregate, HistBanque, HistBanqueArchive, User
+
+logger = logging.getLogger(__name__)
+
+# Counterparties kept per day row; the rest only count towards the totals.
+MAX_COUNTERPARTIES = 10
+
+_CENT = Decimal("0.01")
+
+# (sender bank_id, recipient bank_id, amount, time)
+Transfer = tuple[str, str, Decimal, datetime]
+
+
+@dataclass(slots=True)
+class _DayDelta:
+    debit_total: Decimal = Decimal("0")
+    credit_total: Decimal = Decimal("0")
+    debit_count: int = 0
+    credit_count: int = 0
+    counterparties: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def add(self, counterparty: str, *, sent: Decimal = Decimal("0"), received: Decimal = Decimal("0"), n: int = 1) -> None:
+        self.debit_total += sent
+        self.credit_total += received
+        if sent:
+            self.debit_count += n
+        if received:
+            self.credit_count += n
+        _merge_counterparty(self.counterparties, counterparty, sent, received, n)
+
+
+def _merge_counterparty(target: dict[str, dict[str, Any]], bank_id: str, sent: Decimal, received: Decimal, n: int) -> None:
+    entry = target.setdefault(bank_id, {"out": "0.00", "in": "0.00", "n": 0})
+    entry["out"] = str((Decimal(entry["out"]) + sent).quantize(_CENT))
+    entry["in"] = str((Decimal(entry["in"]) + received).quantize(_CENT))
+    entry["n"] += n
+
+
+def _volume(entry: dict[str, Any]) -> Decimal:
+    return Decimal(entry["out"]) + Decimal(entry["in"])
+
+
+def _top(counterparties: dict[str, dict[str, Any]], limit: int = MAX_COUNTERPARTIES) -> dict[str, dict[str, Any]]:
+    if len(counterparties) <= limit:
+        return counterparties
+    return dict(sorted(counterparties.items(), key=lambda kv: _volume(kv[1]), reverse=True)[:limit])
+
+
+def _deltas(transfers: Iterable[Transfer]) -> dict[tuple[str, date], _DayDelta]:
+    deltas: dict[tuple[str, date], _DayDelta] = defaultdict(_DayDelta)
+    for sender, recipient, amount, at in transfers:
+        day = timezone.localdate(at)
+        deltas[(sender, day)].add(recipient, sent=amount)
+        deltas[(recipient, day)].add(sender, received=amount)
+    return deltas
+
+
+def record_transfers(transfers: Iterable[Transfer]) -> None:
+    """Fold committed-in-this-transaction transfers into the daily aggregate rows.
+
+    Must run inside the transaction that debited/credited the accounts: the
+    ``Compte`` row locks it holds serialize every writer of a given account's
+    aggregate rows, so the read-modify-write below cannot lose updates.
+    """
+    deltas = _deltas(transfers)
+    if not deltas:
+        return
+
+    bank_ids = {bank_id for bank_id, _ in deltas}
+    days = {day for _, day in deltas}
+    existing = {
+        (row.bank_id_id, row.day): row
+        for row in DailyAccountAggregate.objects.filter(bank_id_id__in=bank_ids, day__in=days)
+        if (row.bank_id_id, row.day) in deltas
+    }
+
+    to_create: list[DailyAccountAggregate] = []
+    for (bank_id, day), delta in deltas.items():
+        row = existing.get((bank_id, day))
+        if row is None:
+            to_create.append(
+                DailyAccountAggregate(
+                    bank_id_id=bank_id,
+                    day=day,
+                    debit_total=delta.debit_total,
+                    credit_total=delta.credit_total,
+                    debit_count=delta.debit_count,
+                    credit_count=delta.credit_count,
+                    counterparties=_top(delta.counterparties),
+                )
+            )
+            continue
+        row.debit_total += delta.debit_total
+        row.credit_total += delta.credit_total
+        row.debit_count += delta.debit_count
+        row.credit_count += delta.credit_count
+        for counterparty, entry in delta.counterparties.items():
+            _merge_counterparty(row.counterparties, counterparty, Decimal(entry["out"]), Decimal(entry["in"]), entry["n"])
+        row.counterparties = _top(row.counterparties)
+
+    if existing:
+        DailyAccountAggregate.objects.bulk_update(
+            list(existing.values()), ["debit_total", "credit_total", "debit_count", "credit_count", "counterparties"]
+        )
+    if to_create:
+        DailyAccountAggregate.objects.bulk_create(to_create)
+
+
+def rebuild_aggregates(start: date, end: date) -> int:
+    """Recompute every aggregate row with ``start <= day < end`` from the hot and archived history.
+
+    Uses one ``GROUP BY (sender, recipient, day)`` query, so the work is
+    proportional to the number of distinct account pairs per day rather
+    than to the number of history rows. Returns the number of rows written.
+    """
+    tz = timezone.get_current_timezone()
+    since = datetime.combine(start, datetime.min.time(), tzinfo=tz)
+    until = datetime.combine(end, datetime.min.time(), tzinfo=tz)
+    deltas: dict[tuple[str, date], _DayDelta] = defaultdict(_DayDelta)
+    for model in (HistBanqueArchive, HistBanque):
+        grouped = (
+            model.objects.filter(time__gte=since, time__lt=until)
+            .annotate(day=TruncDate("time", tzinfo=tz))
+            .values("bid_sender_id", "bid_reciever_id", "day")
+            .annotate(total=Sum("montant"), n=Count("id"))
+            .order_by()
+        )
+        for row in grouped.iterator(chunk_size=5000):
+            sender, recipient, day = row["bid_sender_id"], row["bid_reciever_id"], row["day"]
+            deltas[(sender, day)].add(recipient, sent=row["total"], n=row["n"])
+            deltas[(recipient, day)].add(sender, received=row["total"], n=row["n"])
+
+    with db_transaction.atomic():
+        DailyAccountAggregate.objects.filter(day__gte=start, day__lt=end).delete()
+        DailyAccountAggregate.objects.bulk_create(
+            [
+                DailyAccountAggregate(
+                    bank_id_id=bank_id,
+                    day=day,
+                    debit_total=delta.debit_total,
+                    credit_total=delta.credit_total,
+                    debit_count=delta.debit_count,
+                    credit_count=delta.credit_count,
+                    counterparties=_top(delta.counterparties),
+                )
+                for (bank_id, day), delta in deltas.items()
+            ],
+            batch_size=2000,
+        )
+    return len(deltas)
+
+
+@dataclass(frozen=True, slots=True)
+class SpendingSummary:
+    bank_id: str
+    start: date
+    end: date
+    debit_total: float
+    credit_total: float
+    debit_count: int
+    credit_count: int
+    active_days: int
+    top_counterparties: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "bank_id": self.bank_id,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "spent": self.debit_total,
+            "received": self.credit_total,
+            "net": round(self.credit_total - self.debit_total, 2),
+            "debit_count": self.debit_count,
+            "credit_count": self.credit_count,
+            "active_days": self.active_days,
+            "top_counterparties": self.top_counterparties,
+        }
+
+
+def period_bounds(year: int, month: int | None = None) -> tuple[date, date]:
+    if not 1 <= year <= 9998 or (month is not None and not 1 <= month <= 12):
+        raise ValidationError("Invalid year or month.")
+    if month is None:
+        return date(year, 1, 1), date(year + 1, 1, 1)
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1]) + timedelta(days=1)
+
+
+def get_spending_summary(bank_id: str, year: int, month: int | None = None, *, top: int = 5) -> SpendingSummary:
+    """Totals for a month (or a whole year) read from at most 31 (366) day rows."""
+    start, end = period_bounds(year, month)
+    rows = list(
+        DailyAccountAggregate.objects.filter(bank_id_id=bank_id, day__gte=start, day__lt=end).values_list(
+            "debit_total", "credit_total", "debit_count", "credit_count", "counterparties"
+        )
+    )
+    if not rows and not User.objects.filter(bank_id=bank_id).exists():
+        raise UserNotFoundError(f"No user with bank_id='{bank_id}'.")
+
+    counterparties: dict[str, dict[str, Any]] = {}
+    for *_, day_counterparties in rows:
+        for counterparty, entry in day_counterparties.items():
+            _merge_counterparty(counterparties, counterparty, Decimal(entry["out"]), Decimal(entry["in"]), entry["n"])
+
+    ranked = sorted(counterparties.items(), key=lambda kv: (Decimal(kv[1]["out"]), Decimal(kv[1]["in"])), reverse=True)[:top]
+    names = {
+        u["bank_id"]: f"{u['prenom']} {u['nom']}"
+        for u in User.objects.filter(bank_id__in=[bank_id for bank_id, _ in ranked]).values("bank_id", "nom", "prenom")
+    }
+
+    summary = SpendingSummary(
+        bank_id=bank_id,
+        start=start,
+        end=end - timedelta(days=1),
+        debit_total=float(sum((r[0] for r in rows), Decimal("0"))),
+        credit_total=float(sum((r[1] for r in rows), Decimal("0"))),
+        debit_count=sum(r[2] for r in rows),
+        credit_count=sum(r[3] for r in rows),
+        active_days=len(rows),
+        top_counterparties=[
+            {"bank_id": cp, "name": names.get(cp, cp), "spent": float(Decimal(e["out"])), "received": float(Decimal(e["in"])), "count": e["n"]}
+            for cp, e in ranked
+        ],
+    )
+    logger.info("Spending summary for bank_id=%s, %s → %s", bank_id, start, end)
+    return summary
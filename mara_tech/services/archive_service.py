@@ -0,0 +1,49 @@
+"""Hot/cold split of the banking history: move old HistBanque rows into HistBanqueArchive."""
+
+import logging
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from ..models import HistBanque, HistBanqueArchive
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = "id, bid_sender_id, bid_reciever_id, action, time, montant"
+
+
+def archive_boundary() -> datetime:
+    """Every archived row is older than this; newer history is always in the hot table."""
+    return timezone.now() - timedelta(days=settings.HISTORY_ARCHIVE_AFTER_DAYS)
+
+
+def archive_batch(cutoff: datetime, batch_size: int = 5000) -> int:
+    """Move up to ``batch_size`` rows with ``time < cutoff`` to the archive; return how many moved.
+
+    The delete and the insert are one statement, hence one transaction: a
+    crash leaves every row in exactly one table, and the next run simply
+    picks up the remaining rows. An id already present in the archive
+    raises ``IntegrityError`` and rolls the whole batch back, rather than
+    deleting a row that was not archived. ``SKIP LOCKED`` keeps two
+    concurrent runs from blocking each other on the same rows.
+    """
+    if cutoff > archive_boundary():
+        raise ValueError("Refusing to archive rows newer than HISTORY_ARCHIVE_AFTER_DAYS: history reads would miss them.")
+
+    hot, cold = HistBanque._meta.db_table, HistBanqueArchive._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {hot}
+                WHERE id IN (SELECT id FROM {hot} WHERE time < %s LIMIT %s FOR UPDATE SKIP LOCKED)
+                RETURNING {_COLUMNS}
+            )
+            INSERT INTO {cold} ({_COLUMNS})
+            SELECT {_COLUMNS} FROM moved
+            """,
+            [cutoff, batch_size],
+        )
+        return cursor.rowcount
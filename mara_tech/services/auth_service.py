@@ -5,6 +5,7 @@ from __future__ import annotations
 import base64
 import logging
 from dataclasses import dataclass, field
+from datetime import datetime
 from io import BytesIO
 from typing import Any
 
@@ -203,6 +204,15 @@ def login_face(face_image: str) -> LoginResult:
     )
 
 
+def profile_version(user_id: int) -> tuple[str, datetime | None] | None:
+    """``(etag, last_modified)`` for :func:`get_profile` from ``User.updated_at`` (primary-key lookup)."""
+    rows = list(User.objects.filter(id=user_id).values_list("updated_at", flat=True)[:1])
+    if not rows:
+        return None
+    updated_at = rows[0]
+    return f"p{user_id}-{updated_at.timestamp() if updated_at else 0}", updated_at
+
+
 def get_profile(user_id: int) -> ProfileResult:
     """Return a user's public profile."""
     try:
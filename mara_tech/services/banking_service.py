@@ -1,14 +1,28 @@
 """Banking transaction service (balance, transactions, history)."""
 
+import base64
+import hashlib
+import heapq
 import logging
+import time
+from collections.abc import Iterator
 from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Any
 
+from django.db import connection
 from django.db import transaction as db_transaction
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
 
-from ..exceptions import AccountNotFoundError, InsufficientFundsError, RecipientNotFoundError, UserNotFoundError
-from ..models import Compte, HistBanque, User
+from .. import cache, events
+from ..exceptions import AccountNotFoundError, InsufficientFundsError, RecipientNotFoundError, UserNotFoundError, ValidationError
+from ..models import Compte, HistBanque, HistBanqueArchive, User
+from . import ledger_service
+from .aggregate_service import record_transfers
+from .archive_service import archive_boundary
+from .recipient_service import resolve_recipient
 
 logger = logging.getLogger(__name__)
 
@@ -50,56 +64,140 @@ class BalanceInfo:
 class TransactionHistory:
     bank_id: str
     transactions: list[dict[str, Any]] = field(default_factory=list)
-    page: int = 1
     page_size: int = 20
-    total: int = 0
+    next_cursor: str | None = None
+    total: int | None = None
 
     def to_dict(self) -> dict[str, Any]:
-        return {"bank_id": self.bank_id, "transactions": self.transactions, "page": self.page, "page_size": self.page_size, "total": self.total}
+        data = {"bank_id": self.bank_id, "transactions": self.transactions, "page_size": self.page_size, "next_cursor": self.next_cursor}
+        if self.total is not None:
+            data["total"] = self.total
+        return data
 
 
-def _get_user_and_account(bank_id: str) -> tuple[User, Compte]:
-    try:
-        user = User.objects.get(bank_id=bank_id)
-    except User.DoesNotExist:
-        raise UserNotFoundError(f"No user with bank_id='{bank_id}'.")
-    try:
-        compte = Compte.objects.get(bank_id=user)
-    except Compte.DoesNotExist:
+@dataclass(frozen=True, slots=True)
+class BatchTransferResult:
+    sender_bank_id: str
+    items: list[dict[str, Any]]
+    new_balance: float
+    elapsed_ms: float
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for item in self.items if item["status"] == "ok")
+
+    def to_dict(self) -> dict[str, Any]:
+        elapsed_s = self.elapsed_ms / 1000.0
+        return {
+            "sender_bank_id": self.sender_bank_id,
+            "succeeded": self.succeeded,
+            "failed": len(self.items) - self.succeeded,
+            "new_balance": self.new_balance,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+            "transfers_per_second": round(self.succeeded / elapsed_s, 1) if elapsed_s else None,
+            "items": self.items,
+        }
+
+
+def _get_user(bank_id: str) -> User:
+    def load() -> User:
+        try:
+            return User.objects.only("id", "nom", "prenom", "bank_id").get(bank_id=bank_id)
+        except User.DoesNotExist:
+            raise UserNotFoundError(f"No user with bank_id='{bank_id}'.")
+
+    return cache.read_through("user", bank_id, load)
+
+
+def _load_balance(bank_id: str) -> tuple[float, str]:
+    """Balance and holder name in one primary-key query (a second one only to tell a missing user from a missing account)."""
+    accounts = Compte.objects.filter(pk=bank_id)
+    if ledger_service.ledger_enabled():
+        row = ledger_service.with_balance(accounts).values_list("current", "bank_id__prenom", "bank_id__nom").first()
+    else:
+        row = accounts.values_list("solde", "bank_id__prenom", "bank_id__nom").first()
+    if row is None:
+        _get_user(bank_id)
         raise AccountNotFoundError(f"No account for bank_id='{bank_id}'.")
-    return user, compte
+    balance, prenom, nom = row
+    return float(balance), f"{prenom} {nom}"
 
 
 def get_balance(bank_id: str) -> BalanceInfo:
-    user, compte = _get_user_and_account(bank_id)
+    balance, account_holder = cache.read_through("balance", bank_id, lambda: _load_balance(bank_id))
     logger.info("Balance inquiry for bank_id=%s", bank_id)
-    return BalanceInfo(bank_id=bank_id, balance=float(compte.solde), account_holder=f"{user.prenom} {user.nom}")
+    return BalanceInfo(bank_id=bank_id, balance=balance, account_holder=account_holder)
 
 
-def execute_transaction(sender_bank_id: str, recipient_name: str, amount: Decimal, description: str) -> TransactionResult:
-    with db_transaction.atomic():
-        sender, sender_compte = _get_user_and_account(sender_bank_id)
+def balance_etag(bank_id: str) -> str | None:
+    """ETag for :func:`get_balance`, from one primary-key read of the account.
+
+    Read from the database rather than the cache, which is per process by
+    default: every worker sees a transfer as soon as it commits. The value
+    read is stored in the cache, so the :func:`get_balance` that follows a
+    changed ETag serves the same balance without another query.
+    """
+    try:
+        balance, account_holder = _load_balance(bank_id)
+    except (UserNotFoundError, AccountNotFoundError):
+        return None
+    cache.store("balance", bank_id, (balance, account_holder))
+    return hashlib.blake2b(f"{bank_id}|{balance!r}|{account_holder}".encode(), digest_size=8).hexdigest()
 
-        if sender_compte.solde < amount:
-            raise InsufficientFundsError(current_balance=float(sender_compte.solde), requested_amount=float(amount))
 
-        search_term = recipient_name.split()[-1] if " " in recipient_name else recipient_name
-        recipient_qs = User.objects.filter(nom__icontains=search_term)
-        if not recipient_qs.exists():
-            raise RecipientNotFoundError(f"Recipient '{recipient_name}' not found.")
-        recipient = recipient_qs.first()
+def _debit(bank_id: str, amount: Decimal) -> None:
+    """Conditional ``UPDATE … SET solde = solde - amount WHERE solde >= amount``."""
+    if Compte.objects.filter(pk=bank_id, solde__gte=amount).update(solde=F("solde") - amount):
+        return
+    current = Compte.objects.filter(pk=bank_id).values_list("solde", flat=True).first()
+    if current is None:
+        raise AccountNotFoundError(f"No account for bank_id='{bank_id}'.")
+    raise InsufficientFundsError(current_balance=float(current), requested_amount=float(amount))
+
+
+def _credit(bank_id: str, amount: Decimal) -> None:
+    if not Compte.objects.filter(pk=bank_id).update(solde=F("solde") + amount):
+        raise AccountNotFoundError("Recipient account not found.")
 
-        try:
-            recipient_compte = Compte.objects.get(bank_id=recipient)
-        except Compte.DoesNotExist:
-            raise AccountNotFoundError("Recipient account not found.")
 
-        sender_compte.solde -= amount
-        sender_compte.save(update_fields=["solde"])
-        recipient_compte.solde += amount
-        recipient_compte.save(update_fields=["solde"])
+def _ledger_transfer(sender: User, recipient: User, amount: Decimal) -> dict[str, Decimal]:
+    """Ledger-mode checks: lock only the sender, check its derived balance; return both balances after."""
+    ledger_service.lock_sender(sender.bank_id)
+    current = ledger_service.balances({sender.bank_id, recipient.bank_id})
+    if recipient.bank_id not in current:
+        raise AccountNotFoundError("Recipient account not found.")
+    if current[sender.bank_id] < amount:
+        raise InsufficientFundsError(current_balance=float(current[sender.bank_id]), requested_amount=float(amount))
+    current[sender.bank_id] -= amount
+    current[recipient.bank_id] += amount
+    return current
+
+
+def execute_transaction(sender_bank_id: str, recipient_name: str, amount: Decimal, description: str) -> TransactionResult:
+    sender = _get_user(sender_bank_id)
+    recipient = resolve_recipient(recipient_name)
+
+    with db_transaction.atomic():
+        if ledger_service.ledger_enabled():
+            balances = _ledger_transfer(sender, recipient, amount)
+            hist_entry = HistBanque.objects.create(bid_sender=sender, bid_reciever=recipient, action=description, montant=amount)
+            ledger_service.append(
+                [(sender.bank_id, recipient.bank_id, -amount, hist_entry.id), (recipient.bank_id, sender.bank_id, amount, hist_entry.id)]
+            )
+        else:
+            # Each UPDATE row-locks its Compte; taking them in bank_id order keeps
+            # opposite-direction transfers from deadlocking.
+            for bank_id in sorted({sender.bank_id, recipient.bank_id}):
+                if bank_id == sender.bank_id:
+                    _debit(bank_id, amount)
+                if bank_id == recipient.bank_id:
+                    _credit(bank_id, amount)
 
-        hist_entry = HistBanque.objects.create(bid_sender=sender, bid_reciever=recipient, action=description, montant=amount)
+            balances = dict(Compte.objects.filter(pk__in={sender.bank_id, recipient.bank_id}).values_list("pk", "solde"))
+            hist_entry = HistBanque.objects.create(bid_sender=sender, bid_reciever=recipient, action=description, montant=amount)
+            record_transfers([(sender.bank_id, recipient.bank_id, amount, hist_entry.time)])
+        _publish_transfers(sender, [(recipient, hist_entry)], balances)
+        cache.invalidate_on_commit("balance", sender.bank_id, recipient.bank_id)
         logger.info("Transaction #%d: %s → %s, amount=%s", hist_entry.id, sender.bank_id, recipient.bank_id, amount)
 
     return TransactionResult(
@@ -108,30 +206,265 @@ def execute_transaction(sender_bank_id: str, recipient_name: str, amount: Decima
         recipient_full_name=f"{recipient.prenom} {recipient.nom}",
         amount=float(amount),
         description=description,
-        new_balance=float(sender_compte.solde),
+        new_balance=float(balances[sender.bank_id]),
         timestamp=hist_entry.time.isoformat(),
     )
 
 
-def get_transaction_history(bank_id: str, *, page: int = 1, page_size: int = 20) -> TransactionHistory:
+_HISTORY_FIELDS = (
+    "id", "time", "montant", "action", "bid_sender_id", "bid_reciever_id",
+    "bid_sender__prenom", "bid_sender__nom", "bid_reciever__prenom", "bid_reciever__nom",
+)
+
+
+def _history_entry(bank_id: str, t: dict[str, Any]) -> dict[str, Any]:
+    """A history row (``_HISTORY_FIELDS`` values) as seen from ``bank_id``."""
+    if t["bid_sender_id"] == bank_id:
+        return {"id": t["id"], "type": "debit", "amount": -float(t["montant"]), "description": f"To {t['bid_reciever__prenom']} {t['bid_reciever__nom']} – {t['action']}", "date": t["time"].strftime("%b %d, %Y"), "timestamp": t["time"].isoformat()}
+    return {"id": t["id"], "type": "credit", "amount": float(t["montant"]), "description": f"From {t['bid_sender__prenom']} {t['bid_sender__nom']} – {t['action']}", "date": t["time"].strftime("%b %d, %Y"), "timestamp": t["time"].isoformat()}
+
+
+def _publish_transfers(sender: User, transfers: list[tuple[User, HistBanque]], balances: dict[str, Decimal]) -> None:
+    """Queue a ``transaction`` event (history entry + balance after commit) for both parties of each transfer."""
+    published: list[events.Event] = []
+    for recipient, entry in transfers:
+        row = {
+            "id": entry.id, "time": entry.time, "montant": entry.montant, "action": entry.action,
+            "bid_sender_id": sender.bank_id, "bid_reciever_id": recipient.bank_id,
+            "bid_sender__prenom": sender.prenom, "bid_sender__nom": sender.nom,
+            "bid_reciever__prenom": recipient.prenom, "bid_reciever__nom": recipient.nom,
+        }
+        for bank_id in dict.fromkeys((sender.bank_id, recipient.bank_id)):
+            published.append((bank_id, {"type": "transaction", "balance": float(balances[bank_id]), "transaction": _history_entry(bank_id, row)}))
+    events.publish(published)
+
+
+def execute_batch_transfer(sender_bank_id: str, transfers: list[tuple[str, Decimal, str]]) -> BatchTransferResult:
+    """Pay many recipients (by bank_id) from one account in a single transaction.
+
+    All involved ``Compte`` rows are locked once, in bank_id order (only the
+    sender's in ledger mode), then items are applied in request order; an
+    item fails on its own (unknown recipient, no account, insufficient
+    remaining funds) without aborting the rest. Balances are written with
+    one ``bulk_update`` (or appended as ledger entries) and history rows
+    with one ``bulk_create``.
+    """
+    started = time.perf_counter()
+    sender = _get_user(sender_bank_id)
+    recipient_ids = {bank_id for bank_id, _, _ in transfers}
+    recipients = {u.bank_id: u for u in User.objects.filter(bank_id__in=recipient_ids).only("id", "nom", "prenom", "bank_id").order_by()}
+
+    ledger = ledger_service.ledger_enabled()
+    items: list[dict[str, Any]] = []
+    with db_transaction.atomic():
+        if ledger:
+            ledger_service.lock_sender(sender.bank_id)
+            balances = ledger_service.balances(recipient_ids | {sender.bank_id})
+        else:
+            comptes = {c.pk: c for c in Compte.objects.select_for_update().filter(pk__in=recipient_ids | {sender.bank_id}).order_by("pk")}
+            balances = {bank_id: compte.solde for bank_id, compte in comptes.items()}
+        if sender.bank_id not in balances:
+            raise AccountNotFoundError(f"No account for bank_id='{sender.bank_id}'.")
+
+        touched: set[str] = set()
+        pending: list[tuple[dict[str, Any], HistBanque]] = []
+        for index, (bank_id, amount, description) in enumerate(transfers):
+            item: dict[str, Any] = {"index": index, "recipient_bank_id": bank_id, "amount": float(amount), "status": "failed"}
+            items.append(item)
+            if bank_id not in recipients:
+                item["error"] = RecipientNotFoundError.default_message
+            elif bank_id not in balances:
+                item["error"] = "Recipient account not found."
+            elif balances[sender.bank_id] < amount:
+                item["error"] = InsufficientFundsError.default_message
+            else:
+                balances[sender.bank_id] -= amount
+                balances[bank_id] += amount
+                touched.update((sender.bank_id, bank_id))
+                item["status"] = "ok"
+                pending.append((item, HistBanque(bid_sender=sender, bid_reciever=recipients[bank_id], action=description, montant=amount)))
+
+        if pending:
+            created = HistBanque.objects.bulk_create([entry for _, entry in pending])
+            for (item, _), entry in zip(pending, created):
+                item["transaction_id"] = entry.id
+            if ledger:
+                ledger_service.append(
+                    line
+                    for entry in created
+                    for line in (
+                        (sender.bank_id, entry.bid_reciever_id, -entry.montant, entry.id),
+                        (entry.bid_reciever_id, sender.bank_id, entry.montant, entry.id),
+                    )
+                )
+            else:
+                for bank_id in touched:
+                    comptes[bank_id].solde = balances[bank_id]
+                Compte.objects.bulk_update([comptes[bank_id] for bank_id in sorted(touched)], ["solde"])
+                record_transfers((sender.bank_id, entry.bid_reciever_id, entry.montant, entry.time) for entry in created)
+            _publish_transfers(sender, [(recipients[entry.bid_reciever_id], entry) for entry in created], balances)
+            cache.invalidate_on_commit("balance", *touched)
+
+    result = BatchTransferResult(
+        sender_bank_id=sender.bank_id,
+        items=items,
+        new_balance=float(balances[sender.bank_id]),
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+    logger.info("Batch from %s: %d/%d transfers in %.1f ms", sender.bank_id, result.succeeded, len(items), result.elapsed_ms)
+    return result
+
+
+def _encode_cursor(at: datetime, entry_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{at.isoformat()}|{entry_id}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
     try:
-        user = User.objects.get(bank_id=bank_id)
-    except User.DoesNotExist:
-        raise UserNotFoundError(f"No user with bank_id='{bank_id}'.")
-
-    sent_qs = HistBanque.objects.filter(bid_sender=user).select_related("bid_reciever").order_by("-time")
-    received_qs = HistBanque.objects.filter(bid_reciever=user).select_related("bid_sender").order_by("-time")
-
-    entries: list[dict[str, Any]] = []
-    for t in sent_qs:
-        entries.append({"id": t.id, "type": "debit", "amount": -float(t.montant), "description": f"To {t.bid_reciever.prenom} {t.bid_reciever.nom} – {t.action}", "date": t.time.strftime("%b %d, %Y"), "timestamp": t.time.isoformat()})
-    for t in received_qs:
-        entries.append({"id": t.id, "type": "credit", "amount": float(t.montant), "description": f"From {t.bid_sender.prenom} {t.bid_sender.nom} – {t.action}", "date": t.time.strftime("%b %d, %Y"), "timestamp": t.time.isoformat()})
-
-    entries.sort(key=lambda e: e["timestamp"], reverse=True)
-    total = len(entries)
-    start = (page - 1) * page_size
-    paginated = entries[start : start + page_size]
-
-    logger.info("History for bank_id=%s — page %d/%d", bank_id, page, (total // page_size) + 1)
-    return TransactionHistory(bank_id=bank_id, transactions=paginated, page=page, page_size=page_size, total=total)
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        time_part, id_part = raw.rsplit("|", 1)
+        return datetime.fromisoformat(time_part), int(id_part)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValidationError("Invalid history cursor.") from exc
+
+
+def history_queryset(bank_id: str, *, limit: int, cursor: str | None = None, model: type[HistBanque | HistBanqueArchive] = HistBanque) -> QuerySet:
+    """Newest-first history rows for ``bank_id`` after ``cursor`` (``UNION ALL`` of both parties)."""
+    keyset = Q()
+    if cursor:
+        after_time, after_id = _decode_cursor(cursor)
+        keyset = Q(time__lt=after_time) | Q(time=after_time, id__lt=after_id)
+
+    def branch(**party: str) -> QuerySet:
+        return model.objects.filter(keyset, **party).order_by("-time", "-id").values(*_HISTORY_FIELDS)[:limit]
+
+    return branch(bid_sender_id=bank_id).union(branch(bid_reciever_id=bank_id), all=True).order_by("-time", "-id")[:limit]
+
+
+def history_version(bank_id: str) -> tuple[str, datetime] | None:
+    """``(etag, last_modified)`` of ``bank_id``'s history from its newest row, ``None`` if there is no such user.
+
+    One statement: four ``LIMIT 1`` probes of the ``(party, time, id)``
+    indexes, the archive ones only run when the hot table has no row for
+    the account (archival moves the oldest rows, so the newest stays put).
+    Transfers touching an account are serialised by its ``Compte`` row
+    lock, so its newest row only ever moves forward. In ledger mode credits
+    are not serialised, and two committing out of order can leave the ETag
+    unchanged until the account's next transfer.
+    """
+    hot, cold, users = HistBanque._meta.db_table, HistBanqueArchive._meta.db_table, User._meta.db_table
+    newest = "(SELECT id, time FROM {table} WHERE {party} = %(bank_id)s ORDER BY time DESC, id DESC LIMIT 1)"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH hot AS ({newest.format(table=hot, party="bid_sender_id")} UNION ALL {newest.format(table=hot, party="bid_reciever_id")}),
+                 cold AS ({newest.format(table=cold, party="bid_sender_id")} UNION ALL {newest.format(table=cold, party="bid_reciever_id")})
+            SELECT u.created_at, latest.id, latest.time
+            FROM "{users}" u
+            LEFT JOIN (
+                SELECT * FROM hot
+                UNION ALL
+                (SELECT * FROM cold WHERE NOT EXISTS (SELECT 1 FROM hot))
+                ORDER BY time DESC, id DESC LIMIT 1
+            ) latest ON true
+            WHERE u.bank_id = %(bank_id)s
+            """,
+            {"bank_id": bank_id},
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    created_at, entry_id, at = row
+    return f"h{entry_id or 0}", at or created_at
+
+
+def get_transaction_history(bank_id: str, *, page_size: int = 20, cursor: str | None = None, include_total: bool = False) -> TransactionHistory:
+    """One page of history, newest first, keyset-paginated on ``(time, id)``.
+
+    Sent and received rows are fetched as a ``UNION ALL`` of two ordered,
+    limited branches, so each page reads at most ``2 * (page_size + 1)`` rows
+    whatever the size of the account's history. The archive is only queried
+    once the page runs short or reaches rows older than the archive boundary.
+    """
+    limit = page_size + 1
+    rows = list(history_queryset(bank_id, limit=limit, cursor=cursor))
+    if len(rows) < limit or rows[-1]["time"] < archive_boundary():
+        archived = list(history_queryset(bank_id, limit=limit, cursor=cursor, model=HistBanqueArchive))
+        if archived:
+            rows = sorted(rows + archived, key=lambda t: (t["time"], t["id"]), reverse=True)[:limit]
+    if not rows and not cursor:
+        _get_user(bank_id)
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    entries = [_history_entry(bank_id, t) for t in rows]
+
+    total = None
+    if include_total:
+        party = Q(bid_sender_id=bank_id) | Q(bid_reciever_id=bank_id)
+        total = HistBanque.objects.filter(party).count() + HistBanqueArchive.objects.filter(party).count()
+    next_cursor = _encode_cursor(rows[-1]["time"], rows[-1]["id"]) if has_more else None
+
+    logger.info("History for bank_id=%s — %d entries, more=%s", bank_id, len(entries), has_more)
+    return TransactionHistory(bank_id=bank_id, transactions=entries, page_size=page_size, next_cursor=next_cursor, total=total)
+
+
+EXPORT_COLUMNS = ("id", "timestamp", "type", "amount", "counterparty_bank_id", "counterparty", "description")
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time(), tzinfo=timezone.get_current_timezone())
+
+
+def iter_history_export(bank_id: str, *, since: date | None = None, until: date | None = None, chunk_size: int = 2000) -> Iterator[dict[str, Any]]:
+    """Every history row of ``bank_id`` oldest first, ``since <= day <= until``, without loading them all.
+
+    Sent and received rows are read through server-side cursors (two per
+    table, archive included when the range reaches it), each walking its
+    ``(party, time, id)`` index in order, and merged here; the database never
+    sorts the full ledger, so the first row is available immediately and
+    memory stays at a few chunks.
+    """
+    _get_user(bank_id)  # raise before the caller starts streaming
+
+    window = Q()
+    if since:
+        window &= Q(time__gte=_day_start(since))
+    if until:
+        window &= Q(time__lt=_day_start(until + timedelta(days=1)))
+
+    models: list[type[HistBanque | HistBanqueArchive]] = [HistBanque]
+    if since is None or _day_start(since) < archive_boundary():
+        models.insert(0, HistBanqueArchive)
+    sides = [
+        model.objects.filter(window, **party).order_by("time", "id").values(*_HISTORY_FIELDS).iterator(chunk_size=chunk_size)
+        for model in models
+        for party in ({"bid_sender_id": bank_id}, {"bid_reciever_id": bank_id})
+    ]
+    return _export_rows(bank_id, sides)
+
+
+def _export_rows(bank_id: str, sides: list[Iterator[dict[str, Any]]]) -> Iterator[dict[str, Any]]:
+    # Inside a transaction the server-side cursors are declared without WITH HOLD,
+    # so Postgres streams them instead of materialising the whole result first.
+    with db_transaction.atomic():
+        yield from _export_entries(bank_id, heapq.merge(*sides, key=lambda t: (t["time"], t["id"])))
+
+
+def _export_entries(bank_id: str, rows: Iterator[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+    last_id = None
+    for t in rows:
+        if t["id"] == last_id:
+            continue  # a transfer to oneself comes out of both cursors
+        last_id = t["id"]
+        debit = t["bid_sender_id"] == bank_id
+        yield {
+            "id": t["id"],
+            "timestamp": t["time"].isoformat(),
+            "type": "debit" if debit else "credit",
+            "amount": str(-t["montant"] if debit else t["montant"]),
+            "counterparty_bank_id": t["bid_reciever_id"] if debit else t["bid_sender_id"],
+            "counterparty": f"{t['bid_reciever__prenom']} {t['bid_reciever__nom']}" if debit else f"{t['bid_sender__prenom']} {t['bid_sender__nom']}",
+            "description": t["action"],
+        }
@@ -0,0 +1,161 @@
+"""Server-side shopping-assistant conversations with a token-bounded prompt history."""
+
+import logging
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import ChatSession
+
+logger = logging.getLogger(__name__)
+
+Turn = dict[str, str]
+# (current summary, turns being folded into it) -> new summary
+Summarizer = Callable[[str, list[Turn]], str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Conservative token count for French/Arabic chat text (~3 characters per token, plus per-message overhead)."""
+    return len(text) // 3 + 4
+
+
+def _clip(text: str, max_tokens: int) -> str:
+    """The end of ``text``, at most ``max_tokens`` (estimated) long."""
+    max_chars = max(0, (max_tokens - 4) * 3)
+    return text if len(text) <= max_chars else "…" + text[-max_chars:]
+
+
+def _fitting(turns: list[Turn], budget: int) -> int:
+    """How many of the newest ``turns`` fit in ``budget`` tokens."""
+    kept = 0
+    for turn in reversed(turns):
+        budget -= estimate_tokens(turn["content"])
+        if budget < 0:
+            break
+        kept += 1
+    return kept
+
+
+@dataclass(frozen=True, slots=True)
+class ChatContext:
+    session_id: str
+    summary: str
+    turns: list[Turn]
+    # Not stored yet (or expired): :func:`record_turn` writes it, with these turns, along with the first exchange.
+    is_new: bool = False
+
+    def messages(self, system_prompt: str, user_message: str) -> list[dict[str, str]]:
+        """Prompt messages: system prompt (+ summary), the newest turns that fit the budget, the new message."""
+        if self.summary:
+            system_prompt += f"\n\n🧠 RÉSUMÉ DE LA CONVERSATION PRÉCÉDENTE:\n{self.summary}"
+        recent = self.turns[len(self.turns) - _fitting(self.turns, settings.CHAT_HISTORY_TOKEN_BUDGET):]
+        return [{"role": "system", "content": system_prompt}, *recent, {"role": "user", "content": user_message}]
+
+
+def _is_expired(session: ChatSession) -> bool:
+    return session.updated_at < timezone.now() - timedelta(hours=settings.CHAT_SESSION_TTL_HOURS)
+
+
+def open_session(session_id: str | None, seed_history: list[Any] | None = None) -> ChatContext:
+    """The conversation for ``session_id``, or a new one if it is missing, unknown or expired.
+
+    A new session may be seeded with a client-side ``history`` (clients
+    predating sessions); only its valid turns within the budget are kept.
+    Nothing is written here: a new session is stored by :func:`record_turn`,
+    so requests that fail before a reply leave no row behind.
+    """
+    session = None
+    if session_id:
+        try:
+            session = ChatSession.objects.filter(session_id=uuid.UUID(str(session_id))).first()
+        except ValueError:
+            session = None
+    if session is not None and not _is_expired(session):
+        return ChatContext(str(session.session_id), session.summary, session.turns)
+
+    turns = [
+        {"role": t["role"], "content": t["content"]}
+        for t in seed_history or []
+        if isinstance(t, dict) and t.get("role") in {"user", "assistant"} and isinstance(t.get("content"), str)
+    ]
+    turns = turns[len(turns) - _fitting(turns, settings.CHAT_HISTORY_TOKEN_BUDGET):]
+    # An expired session keeps its id (and is reset by record_turn); otherwise a fresh one.
+    new_id = session.session_id if session is not None else uuid.uuid4()
+    return ChatContext(str(new_id), "", turns, is_new=True)
+
+
+def record_turn(conversation: ChatContext, user_message: str, assistant_msg: str) -> bool:
+    """Append one exchange; returns whether the history is now over budget (see :func:`compact`).
+
+    A new conversation is stored here, with its seed turns. One purged
+    since it was opened is stored again from what the request saw.
+    """
+    exchange = [{"role": "user", "content": user_message}, {"role": "assistant", "content": assistant_msg}]
+    with transaction.atomic():
+        session = None
+        if not conversation.is_new:
+            session = ChatSession.objects.select_for_update().filter(session_id=conversation.session_id).first()
+        if session is None:
+            session, _ = ChatSession.objects.update_or_create(
+                session_id=conversation.session_id,
+                defaults={"summary": conversation.summary, "turns": [*conversation.turns, *exchange]},
+            )
+        else:
+            session.turns = [*session.turns, *exchange]
+            session.save(update_fields=["turns", "updated_at"])
+    return sum(estimate_tokens(t["content"]) for t in session.turns) > settings.CHAT_HISTORY_TOKEN_BUDGET
+
+
+def _fallback_summary(summary: str, turns: list[Turn]) -> str:
+    """Extractive summary when the model is unavailable: what the user asked for, most recent last."""
+    asked = "; ".join(t["content"] for t in turns if t["role"] == "user")
+    return " ".join(part for part in (summary, f"L'utilisateur a demandé: {asked}." if asked else "") if part)
+
+
+def compact(session_id: str, summarize: Summarizer) -> None:
+    """Fold the oldest turns into the summary until the rest takes half the budget.
+
+    Halving leaves room for several more exchanges before the next
+    compaction. The model call runs outside any transaction; the result is
+    applied only if no other request compacted the same turns meanwhile.
+    """
+    session = ChatSession.objects.filter(session_id=session_id).first()
+    if session is None:  # purged meanwhile
+        return
+    folded = session.turns[: len(session.turns) - _fitting(session.turns, settings.CHAT_HISTORY_TOKEN_BUDGET // 2)]
+    if not folded:
+        return
+
+    try:
+        summary = summarize(session.summary, folded).strip()
+    except Exception as exc:
+        logger.warning(f"⚠️ Résumé de conversation indisponible, résumé extractif: {exc}")
+        summary = _fallback_summary(session.summary, folded)
+    summary = _clip(summary, settings.CHAT_SUMMARY_MAX_TOKENS)
+
+    with transaction.atomic():
+        current = ChatSession.objects.select_for_update().filter(session_id=session_id).first()
+        if current is None or current.summary != session.summary or current.turns[: len(folded)] != folded:
+            return
+        current.summary, current.turns = summary, current.turns[len(folded):]
+        current.save(update_fields=["summary", "turns", "updated_at"])
+    logger.info(f"🧠 Session {session_id}: {len(folded)} tour(s) résumé(s), {len(current.turns)} conservé(s)")
+
+
+def purge_expired(ttl: timedelta | None = None, *, batch_size: int = 5000) -> int:
+    """Delete sessions idle for longer than ``ttl`` (default ``CHAT_SESSION_TTL_HOURS``) in batches."""
+    if ttl is None:
+        ttl = timedelta(hours=settings.CHAT_SESSION_TTL_HOURS)
+    cutoff = timezone.now() - ttl
+    deleted = 0
+    while True:
+        batch = list(ChatSession.objects.filter(updated_at__lt=cutoff).values_list("session_id", flat=True)[:batch_size])
+        if not batch:
+            return deleted
+        deleted += ChatSession.objects.filter(session_id__in=batch).delete()[0]
@@ -0,0 +1,51 @@
+"""Vectorized great-circle distances and nearest-k selection over coordinate arrays."""
+
+from math import cos, radians
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG = 111.32
+
+# Below this many points the bounding-box pass costs more than the trigonometry it saves.
+PREFILTER_MIN_POINTS = 256
+
+
+def bbox_deltas(lat: float, radius_km: float) -> tuple[float, float]:
+    """Half-height and half-width (degrees) of the box around a circle of ``radius_km`` at ``lat``."""
+    return radius_km / KM_PER_DEG, radius_km / (KM_PER_DEG * max(cos(radians(lat)), 1e-6))
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Distance in km from ``(lat, lng)`` to each point (float64 whatever the input dtype)."""
+    lat1, lng1 = radians(lat), radians(lng)
+    lat2 = np.radians(lats, dtype=np.float64)
+    lng2 = np.radians(lngs, dtype=np.float64)
+    a = np.sin((lat2 - lat1) * 0.5) ** 2 + cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) * 0.5) ** 2
+    return (2 * EARTH_RADIUS_KM) * np.arcsin(np.sqrt(a))
+
+
+def nearest(
+    lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray, *, radius_km: float, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Positions and distances (km) of the ``k`` points closest to ``(lat, lng)`` within ``radius_km``, closest first.
+
+    On inputs of ``PREFILTER_MIN_POINTS`` or more, points outside the
+    circle's bounding box are dropped before any trigonometry. The ``k``
+    closest are picked with ``argpartition``, so only those are sorted.
+    """
+    lats, lngs = np.asarray(lats), np.asarray(lngs)
+    if len(lats) >= PREFILTER_MIN_POINTS:
+        dlat, dlng = bbox_deltas(lat, radius_km)
+        positions = np.flatnonzero((np.abs(lats - lat) <= dlat) & (np.abs(lngs - lng) <= dlng))
+        lats, lngs = lats[positions], lngs[positions]
+    else:
+        positions = np.arange(len(lats))
+    distances = haversine_km(lat, lng, lats, lngs)
+    within = distances <= radius_km
+    positions, distances = positions[within], distances[within]
+    if len(distances) > k:
+        closest = np.argpartition(distances, k - 1)[:k]
+        positions, distances = positions[closest], distances[closest]
+    order = np.argsort(distances, kind="stable")
+    return positions[order], distances[order]
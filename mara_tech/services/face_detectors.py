@@ -0,0 +1,150 @@
+"""Face/eye detector backends for the OpenCV vision fallback (Haar, LBP, YuNet)."""
+
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Box = tuple[int, int, int, int]
+
+_HAAR_FACE_CASCADE = os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml")
+_HAAR_EYE_CASCADE = os.path.join(cv2.data.haarcascades, "haarcascade_eye.xml")
+
+
+def _load_cascade(path: str) -> cv2.CascadeClassifier:
+    cascade = cv2.CascadeClassifier(path)
+    if cascade.empty():
+        raise FileNotFoundError(f"Could not load cascade '{path}'.")
+    return cascade
+
+
+class FaceDetector(ABC):
+    """Locate faces in a frame and open eyes inside a face region.
+
+    Eye detection defaults to the Haar eye cascade for every backend: the
+    closed-eye heuristic relies on it finding *open* eyes only, which
+    landmark-based detectors do not distinguish.
+    """
+
+    name: str = ""
+
+    def __init__(self) -> None:
+        self._eye_cascade = _load_cascade(_HAAR_EYE_CASCADE)
+
+    @abstractmethod
+    def detect_faces(self, gray: np.ndarray, image: np.ndarray) -> list[Box]:
+        ...
+
+    def detect_eyes(self, roi_gray: np.ndarray) -> list[Box]:
+        # First attempt: strict detection for open eyes
+        eyes = self._eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.05, minNeighbors=8, minSize=(25, 25))
+        # Second attempt: more lenient if no eyes found
+        if len(eyes) == 0:
+            eyes = self._eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.1, minNeighbors=5, minSize=(20, 20))
+        return [tuple(int(v) for v in box) for box in eyes]
+
+
+class HaarDetector(FaceDetector):
+    name = "haar"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._face_cascade = _load_cascade(os.getenv("VISION_HAAR_FACE_CASCADE", _HAAR_FACE_CASCADE))
+
+    def detect_faces(self, gray: np.ndarray, image: np.ndarray) -> list[Box]:
+        faces = self._face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5)
+        return [tuple(int(v) for v in box) for box in faces]
+
+
+class LBPDetector(FaceDetector):
+    """LBP frontal-face cascade – faster than Haar, slightly less precise.
+
+    OpenCV wheels only bundle Haar cascades, so ``VISION_LBP_CASCADE`` must
+    point at ``lbpcascade_frontalface_improved.xml`` (or similar).
+    """
+
+    name = "lbp"
+
+    def __init__(self) -> None:
+        super().__init__()
+        path = os.getenv("VISION_LBP_CASCADE")
+        if not path:
+            raise FileNotFoundError("VISION_LBP_CASCADE is not set.")
+        self._face_cascade = _load_cascade(path)
+
+    def detect_faces(self, gray: np.ndarray, image: np.ndarray) -> list[Box]:
+        faces = self._face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=4)
+        return [tuple(int(v) for v in box) for box in faces]
+
+
+class YuNetDetector(FaceDetector):
+    """OpenCV's DNN face detector (``cv2.FaceDetectorYN``), run on CPU.
+
+    ``VISION_YUNET_MODEL`` must point at the ONNX model, e.g.
+    ``face_detection_yunet_2023mar.onnx`` from the OpenCV model zoo.
+    """
+
+    name = "yunet"
+
+    def __init__(self) -> None:
+        super().__init__()
+        path = os.getenv("VISION_YUNET_MODEL")
+        if not path or not os.path.exists(path):
+            raise FileNotFoundError("VISION_YUNET_MODEL is not set or does not exist.")
+        self._detector = cv2.FaceDetectorYN.create(path, "", (320, 320), score_threshold=0.8)
+        self._input_size: tuple[int, int] = (320, 320)
+
+    def detect_faces(self, gray: np.ndarray, image: np.ndarray) -> list[Box]:
+        height, width = image.shape[:2]
+        if self._input_size != (width, height):
+            self._detector.setInputSize((width, height))
+            self._input_size = (width, height)
+        _, faces = self._detector.detect(image)
+        if faces is None:
+            return []
+
+        boxes: list[Box] = []
+        for row in faces:
+            x, y, w, h = (int(round(v)) for v in row[:4])
+            x, y = max(0, x), max(0, y)
+            w, h = min(w, width - x), min(h, height - y)
+            if w > 0 and h > 0:
+                boxes.append((x, y, w, h))
+        return boxes
+
+
+DETECTOR_BACKENDS: dict[str, type[FaceDetector]] = {
+    HaarDetector.name: HaarDetector,
+    LBPDetector.name: LBPDetector,
+    YuNetDetector.name: YuNetDetector,
+}
+
+# OpenCV detectors keep per-call state, so each thread gets its own instances.
+_local = threading.local()
+
+
+def get_face_detector(name: str | None = None) -> FaceDetector:
+    """Return this thread's detector for ``name`` (default: ``VISION_FACE_DETECTOR``, else Haar).
+
+    Backends that cannot be loaded (missing model file, unknown name) fall
+    back to Haar so the vision check keeps working.
+    """
+    name = (name or os.getenv("VISION_FACE_DETECTOR", HaarDetector.name)).lower()
+    cache: dict[str, FaceDetector] = _local.__dict__.setdefault("detectors", {})
+    if name in cache:
+        return cache[name]
+
+    try:
+        detector = DETECTOR_BACKENDS[name]()
+    except (KeyError, FileNotFoundError, cv2.error) as exc:
+        logger.warning("Face detector backend '%s' unavailable (%s) — using Haar.", name, exc)
+        detector = cache.get(HaarDetector.name) or HaarDetector()
+        cache[HaarDetector.name] = detector
+
+    cache[name] = detector
+    return detector
@@ -0,0 +1,139 @@
+"""Reverse geocoding: a local gazetteer, else Nominatim behind a persistent, coordinate-bucketed LRU cache."""
+
+import logging
+from typing import Any
+
+import requests
+from django.conf import settings
+
+from .. import cache
+from ..sqlite_store import SQLiteStore
+from . import geohash, poi_index
+from .distance import nearest
+
+logger = logging.getLogger(__name__)
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/reverse"
+
+# Precision-8 geohash cells are ~38 m x 19 m. A lookup reads the point's cell and its neighbours
+# and reuses the closest cached name within BUCKET_RADIUS_KM, so cell edges do not cause misses.
+BUCKET_PRECISION = 8
+BUCKET_RADIUS_KM = 0.025
+
+FALLBACK_NAME = "votre position"
+
+# OSM keys imported by build_gazetteer, and the gazetteer entries standing in for each Nominatim
+# address part: address key → (OSM tag, search radius in km). The closest entry in range wins.
+GAZETTEER_KEYS = ("place", "amenity", "building")
+GAZETTEER_LEVELS = {
+    "amenity": ("amenity", 0.1),
+    "building": ("building", 0.05),
+    "neighbourhood": ("place=neighbourhood", 1.0),
+    "quarter": ("place=quarter", 1.5),
+    "suburb": ("place=suburb", 3.0),
+    "town": ("place=town", 6.0),
+    "city": ("place=city", 12.0),
+    # location_name() only shows city/town/municipality, so villages stand in for the latter.
+    "municipality": ("place=village", 3.0),
+}
+
+_store = SQLiteStore(settings.PLACE_CACHE_PATH, "reverse_geocode", max_entries=settings.GEOCODE_CACHE_MAX_ENTRIES)
+
+
+def location_name(address: dict[str, Any]) -> str:
+    """Short spoken name ("lieu, quartier, ville") from a Nominatim ``address`` block."""
+    # Extraction intelligente du lieu
+    location = (
+        address.get("amenity")
+        or address.get("building")
+        or address.get("university")
+        or address.get("school")
+        or address.get("neighbourhood")
+        or address.get("suburb")
+        or address.get("quarter")
+        or address.get("road")
+        or "position actuelle"
+    )
+
+    # Ajout ville
+    city = address.get("city") or address.get("town") or address.get("municipality") or ""
+    suburb = address.get("suburb") or address.get("city_district") or ""
+
+    # Construction nom complet
+    parts = [location]
+    if suburb and suburb not in location:
+        parts.append(suburb)
+    if city and city not in location and city != suburb:
+        parts.append(city)
+    return ", ".join(parts)
+
+
+def _nominatim(lat: float, lng: float) -> str:
+    params = {
+        "lat": lat,
+        "lon": lng,
+        "format": "json",
+        "addressdetails": 1,
+        "zoom": 18,
+        "accept-language": "fr",
+    }
+    headers = {"User-Agent": "IBSAR-Assistant/1.0"}
+    response = requests.get(NOMINATIM_URL, params=params, headers=headers, timeout=8)
+    response.raise_for_status()
+    return location_name(response.json().get("address", {}))
+
+
+def _gazetteer_name(lat: float, lng: float) -> str | None:
+    gazetteer = poi_index.get_index(settings.GAZETTEER_PATH)
+    if gazetteer is None or not gazetteer.covers(lat, lng):
+        return None
+    found = gazetteer.nearest_names(lat, lng, dict(GAZETTEER_LEVELS.values()))
+    if not found:
+        return None
+    return location_name({key: found[tag] for key, (tag, _) in GAZETTEER_LEVELS.items() if tag in found})
+
+
+def reverse_geocode(lat: float, lng: float) -> str:
+    """Geocoding inversé Nominatim - GRATUIT.
+
+    With a gazetteer built by ``build_gazetteer`` at ``GAZETTEER_PATH``, the
+    name is composed in-process from the nearest localities and landmarks.
+    Points it does not cover go to Nominatim (unless
+    ``GEOCODE_NOMINATIM_FALLBACK`` is off), whose names are cached per
+    ~25 m geohash cell for ``GEOCODE_CACHE_TTL`` (LRU-bounded to
+    ``GEOCODE_CACHE_MAX_ENTRIES``); a user within 25 m of a cached point
+    gets its name without any network call. Hit ratios are logged with
+    the other caches (``geocode`` namespace).
+    """
+    name = _gazetteer_name(lat, lng)
+    if name is not None:
+        return name
+    if not settings.GEOCODE_NOMINATIM_FALLBACK:
+        return FALLBACK_NAME
+
+    cells = geohash.block(lat, lng, BUCKET_PRECISION)
+    try:
+        cached = _store.get_many(cells, settings.GEOCODE_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"⚠️ Cache geocoding indisponible: {e}")
+        cached = {}
+    entries = list(cached.values())
+    closest, _ = nearest(
+        lat, lng, [entry["lat"] for entry in entries], [entry["lng"] for entry in entries], radius_km=BUCKET_RADIUS_KM, k=1
+    )
+    cache.record_lookup("geocode", len(closest) > 0)
+    if len(closest):
+        return entries[closest[0]]["name"]
+
+    try:
+        full_name = _nominatim(lat, lng)
+    except Exception as e:
+        logger.error(f"❌ Erreur geocoding: {e}")
+        return FALLBACK_NAME
+
+    logger.info(f"📍 Lieu détecté: {full_name}")
+    try:
+        _store.set_many({cells[0]: {"name": full_name, "lat": lat, "lng": lng}})
+    except Exception as e:
+        logger.warning(f"⚠️ Cache geocoding indisponible: {e}")
+    return full_name
@@ -0,0 +1,97 @@
+"""Geohash encoding, tile bounds, neighbours and bounding-box covers (no external dependency)."""
+
+from math import floor
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(_BASE32)}
+
+# (south, west, north, east) in degrees
+BBox = tuple[float, float, float, float]
+
+
+def encode(lat: float, lng: float, precision: int) -> str:
+    lat_lo, lat_hi, lng_lo, lng_hi = -90.0, 90.0, -180.0, 180.0
+    chars: list[str] = []
+    bits = value = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            value = value * 2 + (lng >= mid)
+            lng_lo, lng_hi = (mid, lng_hi) if lng >= mid else (lng_lo, mid)
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            value = value * 2 + (lat >= mid)
+            lat_lo, lat_hi = (mid, lat_hi) if lat >= mid else (lat_lo, mid)
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def bounds(geohash: str) -> BBox:
+    lat_lo, lat_hi, lng_lo, lng_hi = -90.0, 90.0, -180.0, 180.0
+    even = True
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                lng_lo, lng_hi = (mid, lng_hi) if bit else (lng_lo, mid)
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+            even = not even
+    return lat_lo, lng_lo, lat_hi, lng_hi
+
+
+def neighbours(geohash: str) -> list[str]:
+    """The 8 surrounding tiles of the same precision (fewer at the poles)."""
+    south, west, north, east = bounds(geohash)
+    lat, lng = (south + north) / 2, (west + east) / 2
+    dlat, dlng = north - south, east - west
+    found: list[str] = []
+    for i in (-1, 0, 1):
+        for j in (-1, 0, 1):
+            n_lat = lat + i * dlat
+            if (i, j) == (0, 0) or not -90 < n_lat < 90:
+                continue
+            n_lng = (lng + j * dlng + 180) % 360 - 180
+            tile = encode(n_lat, n_lng, len(geohash))
+            if tile not in found:
+                found.append(tile)
+    return found
+
+
+def children(geohash: str) -> list[str]:
+    """The 32 tiles one precision finer that make up ``geohash``."""
+    return [geohash + char for char in _BASE32]
+
+
+def block(lat: float, lng: float, precision: int) -> list[str]:
+    """The tile containing ``(lat, lng)`` followed by its neighbours."""
+    centre = encode(lat, lng, precision)
+    return [centre, *neighbours(centre)]
+
+
+def covering(bbox: BBox, precision: int) -> list[str]:
+    """Every tile of ``precision`` that intersects ``bbox`` (south, west, north, east), row by row.
+
+    Tiles of one precision form a regular grid (``precision * 5`` bits
+    split between longitude and latitude), so the cover is a range of grid
+    cells; a box crossing the antimeridian wraps around.
+    """
+    lng_bits = (precision * 5 + 1) // 2
+    dlat, dlng = 180.0 / 2 ** (precision * 5 - lng_bits), 360.0 / 2 ** lng_bits
+    south, west, north, east = bbox
+    rows = range(floor((max(south, -90.0) + 90) / dlat), floor((min(north, 90.0) + 90) / dlat - 1e-12) + 1)
+    first_col = floor((west + 180) / dlng)
+    n_cols = min(floor((east + 180) / dlng - 1e-12) - first_col + 1, 2 ** lng_bits)
+    return [
+        encode(-90 + (row + 0.5) * dlat, -180 + ((first_col + col) % 2 ** lng_bits + 0.5) * dlng, precision)
+        for row in rows
+        for col in range(n_cols)
+    ]
@@ -0,0 +1,64 @@
+"""Idempotency-Key handling: run a request once, replay its stored response afterwards."""
+
+import hashlib
+import json
+import logging
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction as db_transaction
+from django.utils import timezone
+
+from ..exceptions import IdempotencyKeyConflictError
+from ..models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+Response = tuple[int, dict[str, Any]]
+
+
+def fingerprint(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+
+def run_once(key: str, request_fingerprint: str, handler: Callable[[], Response]) -> tuple[int, dict[str, Any], bool]:
+    """Run ``handler`` for the first request with ``key``; replay its response for the others.
+
+    The key row is inserted in the same transaction as the handler's writes,
+    so it only becomes visible once the transfer has committed. A concurrent
+    duplicate blocks on the primary-key index until then and reads the
+    stored response; if the first request raises, everything rolls back and
+    the duplicate runs instead. ``handler`` must turn expected failures into
+    a response (they are stored and replayed too) rather than raise.
+
+    Returns ``(status_code, body, replayed)``.
+    """
+    with db_transaction.atomic():
+        record, created = IdempotencyKey.objects.get_or_create(
+            key=key, defaults={"fingerprint": request_fingerprint, "status_code": 0, "response": {}}
+        )
+        if not created:
+            if record.fingerprint != request_fingerprint:
+                raise IdempotencyKeyConflictError()
+            logger.info("Replaying stored response for Idempotency-Key %s", key)
+            return record.status_code, record.response, True
+
+        status_code, body = handler()
+        record.status_code, record.response = status_code, body
+        record.save(update_fields=["status_code", "response"])
+    return status_code, body, False
+
+
+def purge_expired(ttl: timedelta | None = None, *, batch_size: int = 5000) -> int:
+    """Delete keys older than ``ttl`` (default ``IDEMPOTENCY_KEY_TTL_HOURS``) in batches."""
+    if ttl is None:
+        ttl = timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    cutoff = timezone.now() - ttl
+    deleted = 0
+    while True:
+        batch = list(IdempotencyKey.objects.filter(created_at__lt=cutoff).values_list("key", flat=True)[:batch_size])
+        if not batch:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(key__in=batch).delete()[0]
@@ -0,0 +1,163 @@
+"""Event-sourced ledger mode: insert-only transfers, balances derived from snapshots plus entries."""
+
+import logging
+from collections.abc import Iterable
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction as db_transaction
+from django.db.models import DecimalField, OuterRef, QuerySet, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from ..exceptions import AccountNotFoundError
+from ..models import BalanceSnapshot, Compte, LedgerCheckpoint, LedgerEntry
+from .aggregate_service import record_transfers
+
+logger = logging.getLogger(__name__)
+
+# pg advisory lock keys. Transfers hold _APPEND_LOCK shared (they never block each other);
+# the compactor takes it exclusive for an instant to find an id below which every entry is committed.
+_APPEND_LOCK = 0x4D41_0001
+_COMPACTOR_LOCK = 0x4D41_0002
+
+_CHECKPOINT = "ledger"
+_AMOUNT = DecimalField(max_digits=15, decimal_places=2)
+
+# (account bank_id, counterparty bank_id, signed amount, HistBanque id)
+Entry = tuple[str, str, Decimal, int]
+
+
+def ledger_enabled() -> bool:
+    return settings.BANKING_LEDGER_MODE
+
+
+def with_balance(accounts: QuerySet) -> QuerySet:
+    """``Compte`` rows annotated with ``current``: latest snapshot (or ``Compte.solde``) + later entries."""
+    entries_after = (
+        LedgerEntry.objects.filter(
+            bank_id=OuterRef("pk"),
+            id__gt=Coalesce(OuterRef("bank_id__balance_snapshot__last_entry_id"), Value(0)),
+        )
+        .order_by()
+        .values("bank_id")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    return accounts.annotate(
+        current=Coalesce("bank_id__balance_snapshot__balance", "solde", output_field=_AMOUNT)
+        + Coalesce(Subquery(entries_after, output_field=_AMOUNT), Value(Decimal("0")), output_field=_AMOUNT)
+    )
+
+
+def balances(bank_ids: Iterable[str]) -> dict[str, Decimal]:
+    """Current balance of each account that exists (see :func:`with_balance`)."""
+    return dict(with_balance(Compte.objects.filter(pk__in=list(bank_ids))).values_list("pk", "current"))
+
+
+def lock_sender(bank_id: str) -> None:
+    """Serialize transfers *from* ``bank_id`` (so its balance check holds) without touching recipients.
+
+    Must run inside the transfer's transaction.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock_shared(%s)", [_APPEND_LOCK])
+    if not Compte.objects.select_for_update().filter(pk=bank_id).exists():
+        raise AccountNotFoundError(f"No account for bank_id='{bank_id}'.")
+
+
+def append(entries: Iterable[Entry]) -> None:
+    LedgerEntry.objects.bulk_create(
+        [
+            LedgerEntry(bank_id_id=bank_id, counterparty=counterparty, amount=amount, transaction_id=transaction_id)
+            for bank_id, counterparty, amount, transaction_id in entries
+        ]
+    )
+
+
+def _committed_horizon() -> int:
+    """Highest entry id such that no entry at or below it is still uncommitted."""
+    with db_transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [_APPEND_LOCK])
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {LedgerEntry._meta.db_table}")
+        return cursor.fetchone()[0]
+
+
+def compact(chunk_size: int = 5000) -> int:
+    """Fold entries committed since the last run into snapshots and daily aggregates.
+
+    Returns the number of entries folded (0 if another compactor is running).
+    Snapshots, aggregates and the checkpoint move together in one transaction,
+    so every entry is folded exactly once.
+    """
+    horizon = _committed_horizon()
+    entries, snapshots, compte = LedgerEntry._meta.db_table, BalanceSnapshot._meta.db_table, Compte._meta.db_table
+
+    with db_transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [_COMPACTOR_LOCK])
+            if not cursor.fetchone()[0]:
+                return 0
+        checkpoint, _ = LedgerCheckpoint.objects.select_for_update().get_or_create(name=_CHECKPOINT)
+        start = checkpoint.last_entry_id
+        if horizon <= start:
+            return 0
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {snapshots} (bank_id_id, balance, last_entry_id, updated_at)
+                SELECT e.bank_id_id, COALESCE(s.balance, c.solde, 0) + SUM(e.amount), %(horizon)s, now()
+                FROM {entries} e
+                LEFT JOIN {snapshots} s ON s.bank_id_id = e.bank_id_id
+                LEFT JOIN {compte} c ON c.bank_id_id = e.bank_id_id
+                WHERE e.id > %(start)s AND e.id <= %(horizon)s
+                GROUP BY e.bank_id_id, s.balance, c.solde
+                ON CONFLICT (bank_id_id) DO UPDATE
+                SET balance = EXCLUDED.balance, last_entry_id = EXCLUDED.last_entry_id, updated_at = EXCLUDED.updated_at
+                """,
+                {"start": start, "horizon": horizon},
+            )
+
+        # Daily aggregates are a projection of the debit side (one debit entry per transfer).
+        debits = (
+            LedgerEntry.objects.filter(id__gt=start, id__lte=horizon, amount__lt=0)
+            .order_by("id")
+            .values_list("bank_id_id", "counterparty", "amount", "created_at")
+        )
+        batch: list[tuple] = []
+        for sender, recipient, amount, at in debits.iterator(chunk_size=chunk_size):
+            batch.append((sender, recipient, -amount, at))
+            if len(batch) >= chunk_size:
+                record_transfers(batch)
+                batch = []
+        record_transfers(batch)
+
+        checkpoint.last_entry_id = horizon
+        checkpoint.save(update_fields=["last_entry_id", "updated_at"])
+
+    folded = LedgerEntry.objects.filter(id__gt=start, id__lte=horizon).count()
+    logger.info("Ledger compaction: %d entries folded (ids %d → %d)", folded, start, horizon)
+    return folded
+
+
+def write_back() -> int:
+    """Leave ledger mode: copy snapshot balances into ``Compte.solde`` and drop the ledger state.
+
+    Run with BANKING_LEDGER_MODE off everywhere and no transfers in flight;
+    HistBanque remains the audit trail. Returns the number of accounts updated.
+    """
+    compact()
+    with db_transaction.atomic(), connection.cursor() as cursor:
+        folded_up_to = LedgerCheckpoint.objects.filter(name=_CHECKPOINT).values_list("last_entry_id", flat=True).first() or 0
+        if LedgerEntry.objects.filter(id__gt=folded_up_to).exists():
+            raise RuntimeError("Ledger entries were appended during write-back; stop ledger-mode transfers and retry.")
+        cursor.execute(
+            f"UPDATE {Compte._meta.db_table} c SET solde = s.balance FROM {BalanceSnapshot._meta.db_table} s "
+            "WHERE s.bank_id_id = c.bank_id_id"
+        )
+        updated = cursor.rowcount
+        BalanceSnapshot.objects.all().delete()
+        LedgerEntry.objects.all().delete()
+        LedgerCheckpoint.objects.filter(name=_CHECKPOINT).update(last_entry_id=0)
+    return updated
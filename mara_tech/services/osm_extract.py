@@ -0,0 +1,101 @@
+"""Read named features from a local OpenStreetMap extract as Overpass-style elements."""
+
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from .places_service import place_from_element
+
+try:
+    import osmium  # type: ignore[import-untyped]
+except Exception:  # pragma: no cover
+    osmium = None  # type: ignore[assignment]
+
+# GeoJSON text sequences: one feature per line, optionally RS-prefixed (`osmium export -f geojsonseq`).
+_SEQUENCE_SUFFIXES = {".geojsonseq", ".geojsonl", ".jsonl"}
+
+
+def _centre(coordinates: Any) -> tuple[float, float] | None:
+    """Mean (lat, lon) of every position in a GeoJSON coordinates array."""
+    positions: list[list[float]] = []
+    stack = [coordinates]
+    while stack:
+        item = stack.pop()
+        if item and isinstance(item[0], (int, float)):
+            positions.append(item)
+        elif item:
+            stack.extend(item)
+    if not positions:
+        return None
+    return sum(p[1] for p in positions) / len(positions), sum(p[0] for p in positions) / len(positions)
+
+
+def _geojson_features(path: Path) -> Iterator[dict[str, Any]]:
+    with open(path, encoding="utf-8") as fh:
+        if path.suffix in _SEQUENCE_SUFFIXES:
+            for line in fh:
+                line = line.strip().lstrip("\x1e")
+                if line:
+                    yield json.loads(line)
+            return
+        data = json.load(fh)
+    yield from data.get("features", []) if data.get("type") == "FeatureCollection" else [data]
+
+
+def _geojson_elements(path: Path) -> Iterator[dict[str, Any]]:
+    """Features as elements; tags are the properties (or ``properties["tags"]``)."""
+    for feature in _geojson_features(path):
+        properties = feature.get("properties") or {}
+        tags = properties.get("tags") if isinstance(properties.get("tags"), dict) else properties
+        centre = _centre((feature.get("geometry") or {}).get("coordinates") or [])
+        if centre is not None:
+            yield {"lat": centre[0], "lon": centre[1], "tags": tags}
+
+
+def _pbf_elements(path: Path, keys: tuple[str, ...]) -> list[dict[str, Any]]:
+    if osmium is None:
+        raise ValueError("Reading .osm.pbf extracts needs pyosmium (pip install osmium); or pass a GeoJSON export.")
+
+    elements: list[dict[str, Any]] = []
+
+    def wanted(tags: Any) -> bool:
+        return "name" in tags and any(key in tags for key in keys)
+
+    class Handler(osmium.SimpleHandler):
+        def node(self, node: Any) -> None:
+            if wanted(node.tags):
+                elements.append({"lat": node.location.lat, "lon": node.location.lon, "tags": {t.k: t.v for t in node.tags}})
+
+        def way(self, way: Any) -> None:
+            if wanted(way.tags):
+                points = [(n.lat, n.lon) for n in way.nodes if n.location.valid()]
+                if points:
+                    elements.append({
+                        "lat": sum(p[0] for p in points) / len(points),
+                        "lon": sum(p[1] for p in points) / len(points),
+                        "tags": {t.k: t.v for t in way.tags},
+                    })
+
+    Handler().apply_file(str(path), locations=True)
+    return elements
+
+
+def read_elements(path: Path, keys: tuple[str, ...]) -> Iterable[dict[str, Any]]:
+    """Elements (``lat``, ``lon``, ``tags``) of a .osm.pbf (needs pyosmium), .geojson or .geojsonseq extract.
+
+    Nodes and ways are placed at the mean of their coordinates. PBF input is
+    pre-filtered to named features carrying one of ``keys``; GeoJSON input
+    is returned whole.
+    """
+    return _pbf_elements(path, keys) if path.name.endswith(".pbf") else _geojson_elements(path)
+
+
+def tagged_rows(elements: Iterable[dict[str, Any]], keys: tuple[str, ...]) -> Iterator[tuple[str, dict[str, Any]]]:
+    """``(key=value, place)`` for each of ``keys`` a named element carries, ready for ``POIIndex.build``."""
+    for element in elements:
+        place = place_from_element(element)
+        if place is None:
+            continue
+        tags = element["tags"]
+        yield from ((f"{key}={tags[key]}", place) for key in keys if tags.get(key))
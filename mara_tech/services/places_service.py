@@ -0,0 +1,247 @@
+"""Nearby place search: the local POI index, else Overpass behind a persistent geohash-tile cache."""
+
+import logging
+from math import asin, cos, radians, sin, sqrt
+from typing import Any
+
+import numpy as np
+import requests
+from django.conf import settings
+
+from ..sqlite_store import SQLiteStore
+from . import geohash, poi_index
+from .distance import bbox_deltas, nearest
+
+logger = logging.getLogger(__name__)
+
+OVERPASS_URL = "http://overpass-api.de/api/interpreter"
+
+OSM_TAGS = {
+    "supermarket": "shop=supermarket",
+    "grocery": "shop=convenience",
+    "pharmacy": "amenity=pharmacy",
+    "clothes": "shop=clothes",
+    "curtains": "shop=curtain",
+    "decoration": "shop=interior_decoration",
+    "fabric": "shop=fabric",
+}
+DEFAULT_TAG = "shop"
+
+SEARCH_RADIUS_KM = 5.0
+MAX_RESULTS = 6
+
+# Overpass `out` limit per statement. A tag that reaches it is asked again tile by tile, then per
+# 32nd of a tile; a tile that still reaches it may be truncated, so it is not cached.
+OVERPASS_LIMIT_PER_TAG = 500
+
+# Precision-5 tiles are ~4.9 km tall and 3.9-4.9 km wide at Tunisian latitudes; a search
+# reads every tile its SEARCH_RADIUS_KM circle touches (3x3 to 4x4 of them).
+TILE_PRECISION = 5
+
+_store = SQLiteStore(settings.PLACE_CACHE_PATH, "overpass_tiles")
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Calcule la distance GPS en kilomètres entre deux points."""
+    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    c = 2 * asin(sqrt(a))
+    return round(6371 * c, 2)
+
+
+def _location(element: dict[str, Any]) -> tuple[float, float] | None:
+    lat = element.get("lat") or element.get("center", {}).get("lat")
+    lng = element.get("lon") or element.get("center", {}).get("lon")
+    return (lat, lng) if lat and lng else None
+
+
+def place_from_element(element: dict[str, Any]) -> dict[str, Any] | None:
+    """Overpass element → cached place (without distance), ``None`` if unnamed or unlocated."""
+    tags = element.get("tags")
+    if not tags:
+        return None
+    name = tags.get("name", "")
+    if not name or name == "Sans nom":
+        return None
+    location = _location(element)
+    if location is None:
+        return None
+    lat, lng = location
+
+    # Adresse simplifiée
+    addr_parts = [tags[key] for key in ("addr:street", "addr:city") if key in tags]
+    return {
+        "name": name,
+        "address": ", ".join(addr_parts) if addr_parts else "Adresse non disponible",
+        "lat": lat,
+        "lng": lng,
+        "phone": tags.get("phone", ""),
+    }
+
+
+def _matches(tags: dict[str, str], osm_tag: str) -> bool:
+    key, _, value = osm_tag.partition("=")
+    return tags.get(key) == value if value else key in tags
+
+
+def _fetch_tiles(
+    missing: dict[str, list[str]], *, precision: int | None = None
+) -> tuple[dict[tuple[str, str], list[dict[str, Any]]], set[tuple[str, str]]]:
+    """One Overpass request for every (tag, tile) in ``missing``; places split back by tag and tile.
+
+    By default the request has one ``node``/``way`` union and its own ``out``
+    statement per tag, over the bounding box of that tag's missing tiles, so
+    each tag gets its own ``OVERPASS_LIMIT_PER_TAG`` limit. With ``precision``
+    every tag gets a statement, box and limit per geohash cell of that
+    precision instead (``TILE_PRECISION`` for one per tile, one more for 32
+    per tile). Also returns the (tag, tile) pairs of the statements that
+    reached the limit: their places may be incomplete.
+    """
+    groups: list[tuple[str, list[str], geohash.BBox]] = []
+    for tag, tiles in missing.items():
+        if precision is None:
+            tile_boxes = [geohash.bounds(tile) for tile in tiles]
+            box = (
+                min(b[0] for b in tile_boxes),
+                min(b[1] for b in tile_boxes),
+                max(b[2] for b in tile_boxes),
+                max(b[3] for b in tile_boxes),
+            )
+            groups.append((tag, tiles, box))
+            continue
+        for tile in tiles:
+            cells = [tile]
+            while len(cells[0]) < precision:
+                cells = [child for cell in cells for child in geohash.children(cell)]
+            groups += [(tag, [tile], geohash.bounds(cell)) for cell in cells]
+    statements = []
+    for tag, _, box in groups:
+        bbox = ",".join(map(str, box))
+        statements.append(f"(node[{tag}]({bbox});way[{tag}]({bbox}););out center {OVERPASS_LIMIT_PER_TAG};")
+    query = f"[out:json][timeout:15];{''.join(statements)}"
+    response = requests.post(OVERPASS_URL, data={"data": query}, timeout=20)
+    response.raise_for_status()
+
+    found: dict[tuple[str, str], list[dict[str, Any]]] = {(tag, tile): [] for tag, tiles in missing.items() for tile in tiles}
+    # Distinct elements per statement, unnamed ones included: they count towards the `out` limit too.
+    returned: list[set[tuple[str, int]]] = [set() for _ in groups]
+    placed: set[tuple[str, tuple[str, int]]] = set()
+    for element in response.json().get("elements", []):
+        tags = element.get("tags") or {}
+        ident = (element.get("type", ""), element.get("id", 0))
+        matching = [tag for tag in missing if _matches(tags, tag)]
+        location = _location(element)
+        for i, (tag, _, (south, west, north, east)) in enumerate(groups):
+            if tag in matching and (location is None or (south <= location[0] <= north and west <= location[1] <= east)):
+                returned[i].add(ident)
+        place = place_from_element(element)
+        if place is None:
+            continue
+        tile = geohash.encode(place["lat"], place["lng"], TILE_PRECISION)
+        for tag in matching:
+            # An element matching several tags comes back once per `out` statement.
+            if (tag, tile) in found and (tag, ident) not in placed:
+                placed.add((tag, ident))
+                found[(tag, tile)].append(place)
+    truncated = {
+        (tag, tile)
+        for (tag, tiles, _), idents in zip(groups, returned)
+        if len(idents) >= OVERPASS_LIMIT_PER_TAG
+        for tile in tiles
+    }
+    return found, truncated
+
+
+def _tile_places(tags: list[str], tiles: list[str]) -> dict[str, list[dict[str, Any]]]:
+    keys = {(tag, tile): f"{tag}|{tile}" for tag in tags for tile in tiles}
+    cached = _store.get_many(keys.values(), settings.PLACE_CACHE_TTL)
+    places: dict[str, list[dict[str, Any]]] = {tag: [] for tag in tags}
+    missing: dict[str, list[str]] = {}
+    for (tag, tile), key in keys.items():
+        if key in cached:
+            places[tag] += cached[key]
+        else:
+            missing.setdefault(tag, []).append(tile)
+    logger.info("🗺️ Cache tuiles %s: %d/%d en cache", "+".join(tags), len(cached), len(keys))
+    if missing:
+        fetched, truncated = _fetch_tiles(missing)
+        # What hit the limit is asked again per tile, then per 32nd of a tile, each cell with its own limit
+        # (a tag whose only missing tile was truncated goes straight to the finer cells).
+        for precision in (TILE_PRECISION, TILE_PRECISION + 1):
+            retry: dict[str, list[str]] = {}
+            for tag, tile in sorted(truncated):
+                if precision > TILE_PRECISION or len(missing[tag]) > 1:
+                    retry.setdefault(tag, []).append(tile)
+            if not retry:
+                continue
+            logger.info(f"✂️ Overpass: limite de {OVERPASS_LIMIT_PER_TAG} atteinte pour {', '.join(sorted(retry))}, requête par cellule de précision {precision}")
+            refetched, still_truncated = _fetch_tiles(retry, precision=precision)
+            fetched.update(refetched)
+            truncated = {pair for pair in truncated if pair not in refetched} | still_truncated
+        if truncated:
+            logger.warning(
+                f"⚠️ Overpass: limite de {OVERPASS_LIMIT_PER_TAG} atteinte pour {len(truncated)} tuile(s) "
+                f"({', '.join(sorted({tag for tag, _ in truncated}))}), non mises en cache"
+            )
+        _store.set_many({keys[pair]: tile_places for pair, tile_places in fetched.items() if pair not in truncated})
+        for (tag, _), tile_places in fetched.items():
+            places[tag] += tile_places
+    return places
+
+
+def search_tiles(lat: float, lng: float) -> list[str]:
+    """Every ``TILE_PRECISION`` tile intersecting the bounding box of the search circle around ``(lat, lng)``."""
+    dlat, dlng = bbox_deltas(lat, SEARCH_RADIUS_KM)
+    return geohash.covering((lat - dlat, lng - dlng, lat + dlat, lng + dlng), TILE_PRECISION)
+
+
+def _rank(lat: float, lng: float, candidates: list[dict[str, Any]]) -> list[dict]:
+    lats = np.fromiter((place["lat"] for place in candidates), dtype=np.float64, count=len(candidates))
+    lngs = np.fromiter((place["lng"] for place in candidates), dtype=np.float64, count=len(candidates))
+    positions, distances = nearest(lat, lng, lats, lngs, radius_km=SEARCH_RADIUS_KM, k=MAX_RESULTS)
+    places = []
+    for i, dist in zip(positions, distances):
+        dist = round(float(dist), 2)
+        places.append({**candidates[i], "distance": dist, "distance_m": int(dist * 1000)})
+    return places
+
+
+def search_nearby(lat: float, lng: float, place_types: list[str]) -> dict[str, list[dict]]:
+    """Recherche Overpass API - 100% GRATUIT, pour plusieurs catégories à la fois.
+
+    When a POI index built by ``build_poi_index`` exists at ``POI_INDEX_PATH``
+    and covers the point, it answers in-process and Overpass is not used.
+    Otherwise results are cached per (geohash tile, OSM tag) for ``PLACE_CACHE_TTL``;
+    a search reads every tile its ``SEARCH_RADIUS_KM`` circle touches for every category,
+    fetches whatever is missing in a single union query and re-ranks each
+    category by exact distance. A repeat search in the same neighbourhood
+    does not touch the network. Returns the places per ``place_type``
+    (empty lists if Overpass fails).
+    """
+    tags = {place_type: OSM_TAGS.get(place_type, DEFAULT_TAG) for place_type in place_types}
+    logger.info(f"🔍 Recherche: {', '.join(f'{t} ({tag})' for t, tag in tags.items())}")
+    index = poi_index.get_index()
+    if index is not None and index.covers(lat, lng):
+        results = {
+            place_type: index.search(lat, lng, tag, radius_km=SEARCH_RADIUS_KM, limit=MAX_RESULTS)
+            for place_type, tag in tags.items()
+        }
+        logger.info(f"✅ Index local: {', '.join(f'{t}: {len(p)}' for t, p in results.items())} lieu(x) trouvé(s)")
+        return results
+
+    try:
+        candidates = _tile_places(list(dict.fromkeys(tags.values())), search_tiles(lat, lng))
+    except Exception as e:
+        logger.error(f"❌ Erreur Overpass: {e}")
+        return {place_type: [] for place_type in place_types}
+
+    results = {place_type: _rank(lat, lng, candidates[tag]) for place_type, tag in tags.items()}
+    logger.info(f"✅ {', '.join(f'{t}: {len(p)}' for t, p in results.items())} lieu(x) trouvé(s)")
+    return results
+
+
+def search_nearby_places(lat: float, lng: float, place_type: str) -> list[dict]:
+    """Recherche Overpass API pour une seule catégorie (voir :func:`search_nearby`)."""
+    return search_nearby(lat, lng, [place_type])[place_type]
@@ -0,0 +1,229 @@
+"""In-process POI index (also used for the gazetteer): a uniform lat/lng grid over packed NumPy arrays."""
+
+import logging
+import os
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from django.conf import settings
+
+from .distance import bbox_deltas, nearest
+
+logger = logging.getLogger(__name__)
+
+# ~2.2 km of latitude per cell: a 5 km search touches about 5 x 6 cells.
+CELL_DEG = 0.02
+
+# OSM keys imported into the index (one row per matching key=value of a named feature).
+INDEXED_KEYS = ("shop", "amenity")
+
+
+def _pack(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """UTF-8 blob + offsets (``len(strings) + 1``) for a list of strings."""
+    encoded = [s.encode() for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack(blob: np.ndarray, offsets: np.ndarray, i: int) -> str:
+    return blob[offsets[i]:offsets[i + 1]].tobytes().decode()
+
+
+@dataclass(frozen=True, slots=True)
+class POIIndex:
+    """Rows sorted by grid cell; ``cell_start`` holds each cell's first row (CSR layout).
+
+    Names, addresses and phones are UTF-8 blobs addressed by offset arrays,
+    and ``tag`` indexes into the ``tags`` table ("shop=supermarket", ...),
+    so the whole index is a handful of flat arrays. ``tag_rows`` lists the
+    rows of each tag (from ``tag_start``), so a search for a rare tag over a
+    wide radius scans that list instead of every row in the covered cells.
+    """
+
+    origin: tuple[float, float]
+    shape: tuple[int, int]
+    cell_start: np.ndarray
+    lat: np.ndarray
+    lng: np.ndarray
+    tag: np.ndarray
+    tags: tuple[str, ...]
+    tag_start: np.ndarray
+    tag_rows: np.ndarray
+    names: np.ndarray
+    name_offsets: np.ndarray
+    addresses: np.ndarray
+    address_offsets: np.ndarray
+    phones: np.ndarray
+    phone_offsets: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, f).nbytes for f in self.__slots__ if isinstance(getattr(self, f), np.ndarray))
+
+    @classmethod
+    def build(cls, places: Iterable[tuple[str, dict[str, Any]]]) -> "POIIndex":
+        """Index ``(osm_tag, place)`` pairs; places are ``places_service.place_from_element`` dicts."""
+        rows = list(places)
+        if not rows:
+            raise ValueError("No places to index.")
+        tags = tuple(sorted({tag for tag, _ in rows}))
+        tag_ids = {tag: i for i, tag in enumerate(tags)}
+        lat = np.array([p["lat"] for _, p in rows], dtype=np.float64)
+        lng = np.array([p["lng"] for _, p in rows], dtype=np.float64)
+
+        origin = (float(np.floor(lat.min() / CELL_DEG) * CELL_DEG), float(np.floor(lng.min() / CELL_DEG) * CELL_DEG))
+        row = ((lat - origin[0]) / CELL_DEG).astype(np.int64)
+        col = ((lng - origin[1]) / CELL_DEG).astype(np.int64)
+        shape = (int(row.max()) + 1, int(col.max()) + 1)
+        cell = row * shape[1] + col
+        order = np.argsort(cell, kind="stable")
+        cell_start = np.searchsorted(cell[order], np.arange(shape[0] * shape[1] + 1)).astype(np.uint32)
+
+        ordered = [rows[i] for i in order]
+        tag = np.array([tag_ids[t] for t, _ in ordered], dtype=np.uint16)
+        tag_start = np.zeros(len(tags) + 1, dtype=np.uint32)
+        np.cumsum(np.bincount(tag, minlength=len(tags)), out=tag_start[1:])
+        names, name_offsets = _pack([p["name"] for _, p in ordered])
+        addresses, address_offsets = _pack([p["address"] for _, p in ordered])
+        phones, phone_offsets = _pack([p["phone"] for _, p in ordered])
+        return cls(
+            origin=origin,
+            shape=shape,
+            cell_start=cell_start,
+            lat=lat[order].astype(np.float32),
+            lng=lng[order].astype(np.float32),
+            tag=tag,
+            tags=tags,
+            tag_start=tag_start,
+            tag_rows=np.argsort(tag, kind="stable").astype(np.uint32),
+            names=names,
+            name_offsets=name_offsets,
+            addresses=addresses,
+            address_offsets=address_offsets,
+            phones=phones,
+            phone_offsets=phone_offsets,
+        )
+
+    def save(self, path: Path | str) -> None:
+        """Write to ``path`` through a rename, so workers never load a half-written file."""
+        arrays = {f: getattr(self, f) for f in self.__slots__ if isinstance(getattr(self, f), np.ndarray)}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f"{path.name}.partial")
+        with open(partial, "wb") as fh:
+            np.savez(fh, origin=np.array(self.origin), shape=np.array(self.shape), tags=np.array(self.tags, dtype=str), **arrays)
+        partial.replace(path)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "POIIndex":
+        with np.load(path) as data:
+            fields = {f: data[f] for f in cls.__slots__ if f not in {"origin", "shape", "tags"}}
+            return cls(
+                origin=tuple(float(x) for x in data["origin"]),
+                shape=tuple(int(x) for x in data["shape"]),
+                tags=tuple(str(t) for t in data["tags"]),
+                **fields,
+            )
+
+    def covers(self, lat: float, lng: float) -> bool:
+        row = (lat - self.origin[0]) / CELL_DEG
+        col = (lng - self.origin[1]) / CELL_DEG
+        return 0 <= row < self.shape[0] and 0 <= col < self.shape[1]
+
+    def _cell_slices(self, lat: float, lng: float, radius_km: float) -> list[tuple[int, int]]:
+        """Row ranges of the grid cells overlapping the search circle's bounding box."""
+        dlat, dlng = bbox_deltas(lat, radius_km)
+        rows, cols = self.shape
+        r0 = max(0, int((lat - dlat - self.origin[0]) // CELL_DEG))
+        r1 = min(rows - 1, int((lat + dlat - self.origin[0]) // CELL_DEG))
+        c0 = max(0, int((lng - dlng - self.origin[1]) // CELL_DEG))
+        c1 = min(cols - 1, int((lng + dlng - self.origin[1]) // CELL_DEG))
+        if c0 > c1:
+            return []
+        # Cells of one grid row are contiguous, so each row is a single slice.
+        return [(int(self.cell_start[r * cols + c0]), int(self.cell_start[r * cols + c1 + 1])) for r in range(r0, r1 + 1)]
+
+    def _candidates(self, lat: float, lng: float, radius_km: float, osm_tag: str) -> np.ndarray:
+        """Rows with ``osm_tag`` that may lie within ``radius_km``: the covered cells or the tag's rows, whichever is smaller."""
+        tag_ids = self._tag_ids(osm_tag)
+        slices = self._cell_slices(lat, lng, radius_km)
+        tagged = [(int(self.tag_start[i]), int(self.tag_start[i + 1])) for i in tag_ids]
+        if sum(stop - start for start, stop in tagged) < sum(stop - start for start, stop in slices):
+            return np.concatenate([self.tag_rows[start:stop] for start, stop in tagged]) if tagged else np.empty(0, dtype=np.uint32)
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        rows = np.concatenate([np.arange(start, stop) for start, stop in slices])
+        return rows[np.isin(self.tag[rows], tag_ids)]
+
+    def _tag_ids(self, osm_tag: str) -> np.ndarray:
+        if "=" in osm_tag:
+            return np.array([i for i, t in enumerate(self.tags) if t == osm_tag], dtype=np.uint16)
+        return np.array([i for i, t in enumerate(self.tags) if t.startswith(f"{osm_tag}=")], dtype=np.uint16)
+
+    def search(self, lat: float, lng: float, osm_tag: str, *, radius_km: float, limit: int) -> list[dict[str, Any]]:
+        """Nearest ``limit`` places with ``osm_tag`` within ``radius_km``, closest first."""
+        rows = self._candidates(lat, lng, radius_km, osm_tag)
+        positions, distances = nearest(lat, lng, self.lat[rows], self.lng[rows], radius_km=radius_km, k=limit)
+
+        places = []
+        for i, dist in zip(rows[positions], distances):
+            dist = round(float(dist), 2)
+            places.append({
+                "name": _unpack(self.names, self.name_offsets, i),
+                "address": _unpack(self.addresses, self.address_offsets, i),
+                "lat": float(self.lat[i]),
+                "lng": float(self.lng[i]),
+                "phone": _unpack(self.phones, self.phone_offsets, i),
+                "distance": dist,
+                "distance_m": int(dist * 1000),
+            })
+        return places
+
+    def nearest_names(self, lat: float, lng: float, radii: dict[str, float]) -> dict[str, str]:
+        """Name of the closest entry for each OSM tag in ``radii`` within that tag's radius (km).
+
+        Tags with nothing in range are left out.
+        """
+        names: dict[str, str] = {}
+        for osm_tag, radius_km in radii.items():
+            rows = self._candidates(lat, lng, radius_km, osm_tag)
+            if not len(rows):
+                continue
+            positions, _ = nearest(lat, lng, self.lat[rows], self.lng[rows], radius_km=radius_km, k=1)
+            if len(positions):
+                names[osm_tag] = _unpack(self.names, self.name_offsets, rows[positions[0]])
+        return names
+
+
+_lock = threading.Lock()
+_loaded: dict[Path, tuple[float, POIIndex]] = {}
+
+
+def get_index(path: Path | str | None = None) -> POIIndex | None:
+    """The index at ``path`` (default ``POI_INDEX_PATH``), reloaded when the file changes; ``None`` if there is none."""
+    path = Path(path or settings.POI_INDEX_PATH)
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    entry = _loaded.get(path)
+    if entry is not None and entry[0] == mtime:
+        return entry[1]
+    with _lock:
+        entry = _loaded.get(path)
+        if entry is None or entry[0] != mtime:
+            try:
+                entry = _loaded[path] = (mtime, POIIndex.load(path))
+            except Exception:
+                logger.exception("Could not load the index at %s", path)
+                return None
+            logger.info("Index %s loaded: %d entries, %.1f MB", path.name, len(entry[1]), entry[1].nbytes / 1e6)
+        return entry[1]
@@ -0,0 +1,55 @@
+"""Recipient resolution for voice transfers (bank_id/CIN fast path + name-token prefix index)."""
+
+import logging
+
+from django.db.models import Count, Q
+
+from ..exceptions import RecipientNotFoundError
+from ..models import User
+from ..models.user_name_token import normalize_name
+
+logger = logging.getLogger(__name__)
+
+_MIN_TOKEN_LENGTH = 2
+
+
+def find_recipients(query: str, *, limit: int = 5) -> list[User]:
+    """Return up to ``limit`` users matching ``query``, best match first.
+
+    A single token containing a digit is first tried as an exact ``bank_id``
+    or ``cin``. Otherwise every spoken word is prefix-matched against the
+    normalized name tokens; users are ranked by exact token hits, then by
+    prefix hits, in one query.
+    """
+    raw = query.strip()
+    if raw and " " not in raw and any(ch.isdigit() for ch in raw):
+        if exact := list(User.objects.filter(Q(bank_id=raw) | Q(cin=raw)).exclude(bank_id__isnull=True)[:1]):
+            return exact
+
+    tokens = sorted({t for t in normalize_name(raw).split() if len(t) >= _MIN_TOKEN_LENGTH})
+    if not tokens:
+        return []
+
+    prefix_match = Q()
+    for token in tokens:
+        prefix_match |= Q(name_tokens__token__startswith=token)
+
+    return list(
+        User.objects.filter(prefix_match)
+        .exclude(bank_id__isnull=True)
+        .only("id", "nom", "prenom", "cin", "bank_id", "created_at")
+        .annotate(
+            exact_hits=Count("name_tokens", filter=Q(name_tokens__token__in=tokens)),
+            prefix_hits=Count("name_tokens"),
+        )
+        .order_by("-exact_hits", "-prefix_hits", "-created_at")[:limit]
+    )
+
+
+def resolve_recipient(query: str) -> User:
+    candidates = find_recipients(query, limit=2)
+    if not candidates:
+        raise RecipientNotFoundError(f"Recipient '{query}' not found.")
+    if len(candidates) > 1:
+        logger.info("Recipient '%s' is ambiguous; picked bank_id=%s", query, candidates[0].bank_id)
+    return candidates[0]
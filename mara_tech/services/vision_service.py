@@ -1,11 +1,10 @@
 """Vision-quality assessment service (VLM + OpenCV fallback)."""
 
 import base64
+import http.client
 import json
 import logging
 import os
-import urllib.error
-import urllib.request
 from dataclasses import dataclass
 from typing import Any
 
@@ -13,6 +12,8 @@ import cv2
 import numpy as np
 
 from ..exceptions import InvalidImageError
+from .face_detectors import FaceDetector, get_face_detector
+from .vlm_client import get_vlm_client
 
 logger = logging.getLogger(__name__)
 
@@ -107,32 +108,20 @@ Only set is_blind to TRUE when you are certain the person is blind, has closed e
         "response_format": {"type": "json_object"},
     }
 
-    request = urllib.request.Request(
-        _build_openai_url(base_url),
-        data=json.dumps(payload).encode("utf-8"),
-        headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-        method="POST",
-    )
-
     try:
-        with urllib.request.urlopen(request, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
-            parsed = json.loads(data["choices"][0]["message"]["content"])
-            score = float(parsed.get("score", 0.0))
-            ok = score >= threshold if threshold is not None else bool(parsed.get("ok", False))
-            is_blind = bool(parsed.get("is_blind", False))
-            logger.info(f"VLM Response: score={score}, is_blind={is_blind}, reason={parsed.get('reason', '')}")
-            return VisionResult(ok=ok, score=round(score, 2), reason=str(parsed.get("reason", "")), model=model, source="vlm", is_blind=is_blind)
-    except (urllib.error.HTTPError, urllib.error.URLError, TimeoutError, KeyError, IndexError, json.JSONDecodeError) as exc:
+        data = get_vlm_client(_build_openai_url(base_url), api_key).submit_sync(payload)
+        parsed = json.loads(data["choices"][0]["message"]["content"])
+        score = float(parsed.get("score", 0.0))
+        ok = score >= threshold if threshold is not None else bool(parsed.get("ok", False))
+        is_blind = bool(parsed.get("is_blind", False))
+        logger.info(f"VLM Response: score={score}, is_blind={is_blind}, reason={parsed.get('reason', '')}")
+        return VisionResult(ok=ok, score=round(score, 2), reason=str(parsed.get("reason", "")), model=model, source="vlm", is_blind=is_blind)
+    except (OSError, http.client.HTTPException, KeyError, IndexError, json.JSONDecodeError) as exc:
         logger.warning("VLM request failed: %s", exc)
         return None
 
 
-_FACE_CASCADE = os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml")
-_EYE_CASCADE = os.path.join(cv2.data.haarcascades, "haarcascade_eye.xml")
-
-
-def _assess_local(image: np.ndarray, threshold: float | None) -> VisionResult:
+def _assess_local(image: np.ndarray, threshold: float | None, detector: FaceDetector | None = None) -> VisionResult:
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     sharpness_raw = float(cv2.Laplacian(gray, cv2.CV_64F).var())
     normalized_sharpness = min(100.0, sharpness_raw / 5.0)
@@ -156,9 +145,8 @@ def _assess_local(image: np.ndarray, threshold: float | None) -> VisionResult:
         reason_parts.append("Contraste faible")
 
     try:
-        face_cascade = cv2.CascadeClassifier(_FACE_CASCADE)
-        eye_cascade = cv2.CascadeClassifier(_EYE_CASCADE)
-        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5)
+        detector = detector or get_face_detector()
+        faces = detector.detect_faces(gray, image)
         
         if len(faces) > 0:
             x, y, w, h = max(faces, key=lambda box: box[2] * box[3])
@@ -172,14 +160,7 @@ def _assess_local(image: np.ndarray, threshold: float | None) -> VisionResult:
             
             # Detect eyes in the face region with stricter parameters
             roi_gray = gray[y:y+h, x:x+w]
-            roi_color = image[y:y+h, x:x+w]
-            
-            # First attempt: strict detection for open eyes
-            eyes = eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.05, minNeighbors=8, minSize=(25, 25))
-            
-            # Second attempt: more lenient if no eyes found
-            if len(eyes) == 0:
-                eyes = eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.1, minNeighbors=5, minSize=(20, 20))
+            eyes = detector.detect_eyes(roi_gray)
             
             # Analyze eye region for closed eyes detection
             eye_region_top = roi_gray[int(h*0.25):int(h*0.6), :]  # Upper half where eyes should be
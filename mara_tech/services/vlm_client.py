@@ -0,0 +1,254 @@
+"""Async VLM client – pooled keep-alive connection, concurrency limit and micro-batching."""
+
+import asyncio
+import http.client
+import json
+import logging
+import os
+import queue
+import threading
+import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class VLMHTTPError(OSError):
+    def __init__(self, status: int, body: str) -> None:
+        super().__init__(f"VLM server returned HTTP {status}: {body}")
+        self.status = status
+
+
+class VLMClientClosedError(OSError):
+    def __init__(self) -> None:
+        super().__init__("VLM client closed before the request completed")
+
+
+@dataclass(frozen=True, slots=True)
+class VLMClientStats:
+    submitted: int
+    completed: int
+    failed: int
+    batches: int
+    in_flight: int
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.submitted / self.batches if self.batches else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "in_flight": self.in_flight,
+            "mean_batch_size": round(self.mean_batch_size, 2),
+        }
+
+
+class AsyncVLMClient:
+    """Submit chat-completion payloads to an OpenAI-compatible (vLLM) endpoint.
+
+    The client owns a private event loop running in a daemon thread, so both
+    sync Django views and async callers share one pool of keep-alive
+    connections, at most ``max_concurrency`` of them in use at once.
+    Payloads arriving within ``batch_window_ms`` of each other are released
+    together, so vLLM's continuous batching sees them as one wave.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: str,
+        *,
+        max_concurrency: int = 8,
+        batch_window_ms: float = 5.0,
+        max_batch_size: int = 16,
+        timeout: float = 30.0,
+    ) -> None:
+        self.url = url
+        parsed = urllib.parse.urlsplit(url)
+        self._connection_class = http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+        self._host = parsed.netloc
+        self._path = parsed.path or "/"
+        self._headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        self._max_concurrency = max(1, max_concurrency)
+        self._batch_window = max(0.0, batch_window_ms) / 1000.0
+        self._max_batch_size = max(1, max_batch_size)
+        self._timeout = timeout
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._batches = 0
+        self._in_flight = 0
+        self._closed = False
+
+        self._connections: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue()
+        self._executor = ThreadPoolExecutor(max_workers=self._max_concurrency, thread_name_prefix="vlm-io")
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="vlm-client", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._queue: asyncio.Queue[tuple[dict[str, Any], asyncio.Future[dict[str, Any]]]] = asyncio.Queue()
+        self._pending: set[asyncio.Task[None]] = set()
+        # Futures of every accepted request not yet answered (queued or in flight), failed on close.
+        self._waiting: set[asyncio.Future[dict[str, Any]]] = set()
+        self._dispatcher = self._loop.create_task(self._dispatch_loop())
+        self._ready.set()
+        self._loop.run_forever()
+
+    # -- public API ---------------------------------------------------------
+
+    def submit_sync(self, payload: dict[str, Any], timeout: float | None = None) -> dict[str, Any]:
+        """Blocking submit for sync code (Django views, management commands)."""
+        if self._closed:
+            raise VLMClientClosedError()
+        future: Future[dict[str, Any]] = asyncio.run_coroutine_threadsafe(self._enqueue(payload), self._loop)
+        return future.result(timeout if timeout is not None else self._timeout + 1.0)
+
+    async def submit(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Awaitable submit usable from any event loop (e.g. async views)."""
+        if self._closed:
+            raise VLMClientClosedError()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._enqueue(payload), self._loop))
+
+    def stats(self) -> VLMClientStats:
+        return VLMClientStats(
+            submitted=self._submitted,
+            completed=self._completed,
+            failed=self._failed,
+            batches=self._batches,
+            in_flight=self._in_flight,
+        )
+
+    def close(self) -> None:
+        """Stop the client; callers still waiting get ``VLMClientClosedError`` at once."""
+        if self._closed or not self._loop.is_running():
+            return
+        self._closed = True
+        asyncio.run_coroutine_threadsafe(self._aclose(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False)
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
+    # -- event-loop side ----------------------------------------------------
+
+    async def _enqueue(self, payload: dict[str, Any]) -> dict[str, Any]:
+        if self._closed:
+            raise VLMClientClosedError()
+        future: asyncio.Future[dict[str, Any]] = self._loop.create_future()
+        self._waiting.add(future)
+        future.add_done_callback(self._waiting.discard)
+        self._submitted += 1
+        await self._queue.put((payload, future))
+        return await future
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self._batch_window
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            self._batches += 1
+            logger.debug("VLM micro-batch of %d request(s)", len(batch))
+            for payload, future in batch:
+                task = self._loop.create_task(self._send(payload, future))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+
+    async def _send(self, payload: dict[str, Any], future: asyncio.Future[dict[str, Any]]) -> None:
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                data = await self._loop.run_in_executor(self._executor, self._post, json.dumps(payload).encode("utf-8"))
+            except Exception as exc:
+                self._failed += 1
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                self._completed += 1
+                if not future.done():
+                    future.set_result(data)
+            finally:
+                self._in_flight -= 1
+
+    async def _aclose(self) -> None:
+        self._dispatcher.cancel()
+        for task in self._pending:
+            task.cancel()
+        for future in list(self._waiting):
+            if not future.done():
+                future.set_exception(VLMClientClosedError())
+
+    # -- I/O threads ----------------------------------------------------------
+
+    def _post(self, body: bytes) -> dict[str, Any]:
+        try:
+            connection, reused = self._connections.get_nowait(), True
+        except queue.Empty:
+            connection, reused = self._connection_class(self._host, timeout=self._timeout), False
+
+        try:
+            connection.request("POST", self._path, body=body, headers=self._headers)
+            response = connection.getresponse()
+            raw = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            connection.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry once on a fresh one.
+            return self._post(body)
+        except Exception:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._connections.put(connection)
+
+        if response.status >= 400:
+            raise VLMHTTPError(response.status, raw[:200].decode("utf-8", "replace"))
+        return json.loads(raw)
+
+
+_client: AsyncVLMClient | None = None
+_client_key: tuple[str, str] | None = None
+_client_lock = threading.Lock()
+
+
+def get_vlm_client(url: str, api_key: str) -> AsyncVLMClient:
+    """Return the process-wide client for ``url``, creating it on first use."""
+    global _client, _client_key
+    with _client_lock:
+        if _client is None or _client_key != (url, api_key):
+            if _client is not None:
+                _client.close()
+            _client = AsyncVLMClient(
+                url,
+                api_key,
+                max_concurrency=int(os.getenv("VLM_MAX_CONCURRENCY", "8")),
+                batch_window_ms=float(os.getenv("VLM_BATCH_WINDOW_MS", "5")),
+                max_batch_size=int(os.getenv("VLM_MAX_BATCH_SIZE", "16")),
+                timeout=float(os.getenv("VLM_TIMEOUT", "30")),
+            )
+            _client_key = (url, api_key)
+        return _client
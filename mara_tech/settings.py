@@ -63,6 +63,12 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-request SQL query count and repeated-query warnings (see mara_tech/middleware.py).
+QUERY_INSPECTION = os.getenv("QUERY_INSPECTION", str(DEBUG)).lower() in {"1", "true", "yes"}
+QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", "5"))
+if QUERY_INSPECTION:
+    MIDDLEWARE.insert(0, 'mara_tech.middleware.QueryInspectionMiddleware')
+
 ROOT_URLCONF = 'mara_tech.urls'
 
 TEMPLATES: list[dict[str, object]] = [
@@ -98,6 +104,67 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Local memory by default; set CACHE_REDIS_URL to share the cache between workers.
+
+if cache_redis_url := os.getenv("CACHE_REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': cache_redis_url,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'mara-tech',
+        }
+    }
+
+# Upper bound (seconds) on how stale a cached balance or user lookup can be.
+MARA_CACHE_TTL = int(os.getenv("MARA_CACHE_TTL", "30"))
+
+# Idempotency-Key records are kept at least this long (purge_idempotency_keys removes older ones).
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
+# archive_history moves HistBanque rows older than this into HistBanqueArchive.
+HISTORY_ARCHIVE_AFTER_DAYS = int(os.getenv("HISTORY_ARCHIVE_AFTER_DAYS", "365"))
+
+# Ledger mode: transfers append LedgerEntry rows instead of updating Compte.solde;
+# compact_ledger folds them into BalanceSnapshot rows every LEDGER_COMPACT_INTERVAL seconds.
+BANKING_LEDGER_MODE = os.getenv("BANKING_LEDGER_MODE", "False").lower() in {"1", "true", "yes"}
+LEDGER_COMPACT_INTERVAL = int(os.getenv("LEDGER_COMPACT_INTERVAL", "60"))
+
+# Shopping assistant: Overpass results cached per (geohash tile, OSM tag) and reverse-geocoded
+# names per ~25 m bucket, in one local SQLite file.
+PLACE_CACHE_PATH = Path(os.getenv("PLACE_CACHE_PATH", BASE_DIR / "var" / "geo_cache.sqlite3"))
+PLACE_CACHE_TTL = int(os.getenv("PLACE_CACHE_TTL", str(7 * 24 * 3600)))
+GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", str(30 * 24 * 3600)))
+GEOCODE_CACHE_MAX_ENTRIES = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "50000"))
+# Offline POI index written by build_poi_index; place searches use it instead of Overpass when present.
+POI_INDEX_PATH = Path(os.getenv("POI_INDEX_PATH", BASE_DIR / "var" / "poi_index.npz"))
+# Offline gazetteer written by build_gazetteer; location names use it first, then (optionally) Nominatim.
+GAZETTEER_PATH = Path(os.getenv("GAZETTEER_PATH", BASE_DIR / "var" / "gazetteer.npz"))
+GEOCODE_NOMINATIM_FALLBACK = os.getenv("GEOCODE_NOMINATIM_FALLBACK", "True").lower() in {"1", "true", "yes"}
+# Shopping-assistant conversations are kept server-side: the prompt carries at most
+# CHAT_HISTORY_TOKEN_BUDGET tokens of recent turns plus a summary of older ones.
+CHAT_SESSION_TTL_HOURS = int(os.getenv("CHAT_SESSION_TTL_HOURS", "24"))
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1200"))
+CHAT_SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "200"))
+CHAT_MESSAGE_MAX_CHARS = int(os.getenv("CHAT_MESSAGE_MAX_CHARS", "1000"))
+# Geocoding and place searches for a chat message run concurrently, bounded by this deadline (seconds).
+CHAT_LOOKUP_DEADLINE = float(os.getenv("CHAT_LOOKUP_DEADLINE", "8"))
+CHAT_LOOKUP_WORKERS = int(os.getenv("CHAT_LOOKUP_WORKERS", "16"))
+
+# Banking event stream (/api/banking/events/): "postgres" fans out across workers with LISTEN/NOTIFY,
+# "local" only reaches clients connected to the worker that committed the transfer.
+BANKING_EVENTS_BACKEND = os.getenv("BANKING_EVENTS_BACKEND", "postgres")
+BANKING_EVENTS_KEEPALIVE = int(os.getenv("BANKING_EVENTS_KEEPALIVE", "15"))
+BANKING_EVENTS_QUEUE_SIZE = int(os.getenv("BANKING_EVENTS_QUEUE_SIZE", "100"))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
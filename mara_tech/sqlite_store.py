@@ -0,0 +1,85 @@
+"""Small persistent key/value store on SQLite, shared by the workers of one host."""
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+
+class SQLiteStore:
+    """JSON values with a write timestamp, in one table of a local SQLite file.
+
+    Each thread keeps its own connection; WAL mode lets several worker
+    processes read while one writes. Entries older than the ``ttl`` passed
+    to :meth:`get_many` are treated as missing and overwritten on refill.
+    With ``max_entries``, reads also refresh a last-used time and writes
+    evict the least recently used entries beyond that size (LRU).
+    """
+
+    def __init__(self, path: Path | str, table: str, *, max_entries: int | None = None) -> None:
+        self.path = Path(path)
+        self.table = table
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL, used_at REAL NOT NULL DEFAULT 0)"
+            )
+            if "used_at" not in {row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")}:
+                conn.execute(f"ALTER TABLE {self.table} ADD COLUMN used_at REAL NOT NULL DEFAULT 0")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_used_at ON {self.table} (used_at)")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys: Iterable[str], ttl: float) -> dict[str, Any]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        now = time.time()
+        conn = self._connection()
+        placeholders = ",".join("?" * len(keys))
+        rows = conn.execute(
+            f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders}) AND stored_at >= ?",
+            [*keys, now - ttl],
+        )
+        found = {key: json.loads(value) for key, value in rows}
+        if found and self.max_entries:
+            conn.execute(f"UPDATE {self.table} SET used_at = ? WHERE key IN ({','.join('?' * len(found))})", [now, *found])
+        return found
+
+    def set_many(self, items: dict[str, Any]) -> None:
+        if not items:
+            return
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, stored_at, value, used_at) VALUES (?, ?, ?, ?)",
+                [(key, now, json.dumps(value, ensure_ascii=False, separators=(",", ":")), now) for key, value in items.items()],
+            )
+            if self.max_entries:
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE used_at <= "
+                    f"(SELECT used_at FROM {self.table} ORDER BY used_at DESC LIMIT 1 OFFSET ?)",
+                    [self.max_entries],
+                )
+
+    def purge(self, ttl: float) -> int:
+        """Delete entries older than ``ttl`` seconds; returns how many."""
+        with self._connection() as conn:
+            return conn.execute(f"DELETE FROM {self.table} WHERE stored_at < ?", [time.time() - ttl]).rowcount
+
+    def __len__(self) -> int:
+        return self._connection().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
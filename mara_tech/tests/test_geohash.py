@@ -0,0 +1,41 @@
+"""Geohash tile covers used by the Overpass tile cache."""
+
+import random
+
+from django.test import SimpleTestCase
+
+from ..services import geohash
+from ..services.places_service import SEARCH_RADIUS_KM, TILE_PRECISION, search_tiles
+
+
+class CoveringTests(SimpleTestCase):
+    def test_covers_every_point_of_the_box(self) -> None:
+        rng = random.Random(0)
+        for _ in range(50):
+            precision = rng.choice([4, 5, 6])
+            lat, lng, d = rng.uniform(-80, 80), rng.uniform(-170, 170), rng.uniform(0.01, 0.3)
+            box = (lat - d, lng - d, lat + d, lng + d)
+            tiles = geohash.covering(box, precision)
+            self.assertEqual(len(tiles), len(set(tiles)))
+            for i in range(21):
+                for j in range(21):
+                    point = (box[0] + (box[2] - box[0]) * i / 20, box[1] + (box[3] - box[1]) * j / 20)
+                    self.assertIn(geohash.encode(*point, precision), tiles)
+
+    def test_wraps_around_the_antimeridian(self) -> None:
+        tiles = geohash.covering((10.0, 179.9, 10.1, 180.1), 3)
+        self.assertEqual(sorted(tiles), sorted({geohash.encode(10.05, 179.95, 3), geohash.encode(10.05, -179.95, 3)}))
+
+    def test_children_partition_the_tile(self) -> None:
+        tile = geohash.encode(36.8, 10.18, TILE_PRECISION)
+        south, west, north, east = geohash.bounds(tile)
+        cells = geohash.children(tile)
+        self.assertEqual(sorted(cells), sorted(geohash.covering((south, west, north - 1e-9, east - 1e-9), TILE_PRECISION + 1)))
+        self.assertTrue(all(cell.startswith(tile) for cell in cells))
+
+    def test_search_tiles_reach_the_radius_from_a_tile_edge(self) -> None:
+        # A user on the east edge of their tile: the old 3x3 block stopped ~3.9 km east of them.
+        south, _, north, east = geohash.bounds(geohash.encode(36.8, 10.18, TILE_PRECISION))
+        lat, lng = (south + north) / 2, east - 1e-6
+        reach = (SEARCH_RADIUS_KM - 0.01) / (111.32 * 0.8)  # cos(36.8°) ≈ 0.8
+        self.assertIn(geohash.encode(lat, lng + reach, TILE_PRECISION), search_tiles(lat, lng))
@@ -0,0 +1,147 @@
+"""Per-endpoint SQL query budgets: every view in mara_tech/urls.py, against seeded accounts.
+
+``TransactionTestCase`` rather than ``TestCase``: views then run their own
+top-level transactions (no extra SAVEPOINTs counted) and ``on_commit``
+cache invalidations fire as in production. Budgets count every statement
+``assertNumQueries`` sees, BEGIN/COMMIT/SAVEPOINT included: each is a
+round trip too.
+"""
+
+import base64
+import json
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+from unittest import mock
+
+from django.core.cache import caches
+from django.db import connection
+from django.http import HttpResponseBase
+from django.test import TransactionTestCase, override_settings
+from django.urls import URLPattern, get_resolver, reverse
+from django.utils import timezone
+
+from ..middleware import QueryCollector, n_plus_one_suspects, repeated_queries
+from ..models import Compte, User
+from ..services import banking_service
+
+_PREFIX = "QB-"
+SENDER = f"{_PREFIX}0"
+TRANSFER = {"sender_bank_id": SENDER, "recipient": "Budget1", "amount": "1.50", "description": "budget"}
+N_PLUS_ONE_THRESHOLD = 3
+
+# 1x1 PNG; the embedding itself is patched, so the budgets do not depend on DeepFace being installed.
+_PIXEL = base64.b64encode(
+    bytes.fromhex(
+        "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+        "0000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+    )
+).decode()
+_EMBEDDING = [0.5] * 128
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class QueryBudgetTests(TransactionTestCase):
+    # URL names with a budget below; test_every_endpoint_has_a_budget keeps this in step with urls.py.
+    covered = {
+        "vision-quality", "banking-transaction", "banking-batch-transaction", "account-balance",
+        "transaction-history", "transaction-history-export", "banking-events", "spending-summary",
+        "register", "login", "profile", "shopping-page", "shopping-chat", "shopping-chat-stream",
+    }
+    history = 60
+
+    def setUp(self) -> None:
+        caches["default"].clear()
+        self.users = [User(nom=f"Budget{i}", prenom="Query", cin=f"{_PREFIX}{i}", bank_id=f"{_PREFIX}{i}") for i in range(4)]
+        for user in self.users:
+            user.save()
+        Compte.objects.bulk_create([Compte(bank_id=user, solde=Decimal("10000.00")) for user in self.users])
+        for i in range(self.history):
+            banking_service.execute_transaction(self.users[i % 2].bank_id, self.users[(i + 1) % 2].nom, Decimal("2.00"), "seed")
+        caches["default"].clear()
+
+    def call(self, url_name: str, method: str = "get", data: dict[str, Any] | None = None, **kwargs: Any) -> Callable[..., HttpResponseBase]:
+        path = reverse(url_name, kwargs=kwargs)
+
+        def request(**headers: str) -> HttpResponseBase:
+            if method == "post":
+                return self.client.post(path, json.dumps(data), content_type="application/json", headers=headers)
+            return self.client.get(path, data or {}, headers=headers)
+
+        return request
+
+    def assertQueryBudget(self, budget: int, request: Callable[..., HttpResponseBase], **headers: str) -> HttpResponseBase:
+        """Exactly ``budget`` queries (streamed bodies included), none repeated and no N+1 pattern."""
+        collector = QueryCollector()
+        with self.assertNumQueries(budget), connection.execute_wrapper(collector):
+            response = request(**headers)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(repeated_queries(collector.queries), [], "identical queries repeated")
+        self.assertEqual(n_plus_one_suspects(collector.queries, N_PLUS_ONE_THRESHOLD), [], "possible N+1")
+        return response
+
+    def assertRevalidates(self, budget: int, request: Callable[..., HttpResponseBase]) -> None:
+        etag = request()["ETag"]
+        response = self.assertQueryBudget(budget, request, If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_every_endpoint_has_a_budget(self) -> None:
+        names = {p.name for p in get_resolver().url_patterns if isinstance(p, URLPattern) and p.name}
+        self.assertEqual(names - self.covered, set())
+
+    def test_vision_quality_rejects_without_queries(self) -> None:
+        self.assertQueryBudget(0, self.call("vision-quality", "post", {}))
+
+    def test_transfer(self) -> None:
+        response = self.assertQueryBudget(12, self.call("banking-transaction", "post", TRANSFER))
+        self.assertEqual(response.status_code, 200)
+
+    def test_transfer_with_idempotency_key(self) -> None:
+        request = self.call("banking-transaction", "post", TRANSFER)
+        self.assertQueryBudget(19, request, Idempotency_Key="qb-1")
+        replay = self.assertQueryBudget(3, request, Idempotency_Key="qb-1")
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+
+    def test_batch_transfer(self) -> None:
+        batch = {"sender_bank_id": SENDER, "transfers": [{"recipient_bank_id": f"{_PREFIX}{i}", "amount": "1"} for i in (1, 2, 3)]}
+        response = self.assertQueryBudget(11, self.call("banking-batch-transaction", "post", batch))
+        self.assertEqual(response.status_code, 200)
+
+    def test_balance(self) -> None:
+        request = self.call("account-balance", data={"bank_id": SENDER})
+        self.assertQueryBudget(1, request)
+        self.assertQueryBudget(1, request)
+        self.assertRevalidates(1, request)
+
+    def test_history(self) -> None:
+        self.assertQueryBudget(2, self.call("transaction-history", data={"bank_id": SENDER}))
+        self.assertQueryBudget(4, self.call("transaction-history", data={"bank_id": SENDER, "include_total": "1"}))
+        self.assertRevalidates(1, self.call("transaction-history", data={"bank_id": SENDER}))
+
+    def test_history_export_streams_full_ledger(self) -> None:
+        response = self.assertQueryBudget(7, self.call("transaction-history-export", data={"bank_id": SENDER}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_events_wsgi_snapshot(self) -> None:
+        self.assertQueryBudget(1, self.call("banking-events", data={"bank_id": SENDER}))
+
+    def test_spending_summary(self) -> None:
+        today = timezone.localdate()
+        self.assertQueryBudget(2, self.call("spending-summary", data={"bank_id": SENDER, "year": today.year, "month": today.month}))
+
+    @mock.patch("mara_tech.services.auth_service._extract_embedding", return_value=_EMBEDDING)
+    def test_register_and_login(self, _embedding: mock.Mock) -> None:
+        new_user = {"nom": "Budget", "prenom": "New", "cin": f"{_PREFIX}NEW", "face_image": _PIXEL}
+        self.assertEqual(self.assertQueryBudget(6, self.call("register", "post", new_user)).status_code, 201)
+        self.assertEqual(self.assertQueryBudget(1, self.call("login", "post", {"face_image": _PIXEL})).status_code, 200)
+
+    def test_profile(self) -> None:
+        request = self.call("profile", user_id=self.users[0].pk)
+        self.assertQueryBudget(2, request)
+        self.assertRevalidates(1, request)
+
+    def test_shopping_without_queries(self) -> None:
+        self.assertQueryBudget(0, self.call("shopping-page"))
+        self.assertQueryBudget(0, self.call("shopping-chat", "post", {"message": ""}))
+        self.assertQueryBudget(0, self.call("shopping-chat-stream", "post", {"message": ""}))
@@ -0,0 +1,60 @@
+"""EXPLAIN the history and admin queries against the migrated schema and check the HistBanque indexes are used."""
+
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import HistBanque, User
+from ..services.banking_service import _encode_cursor, history_queryset
+
+_PREFIX = "PLAN-"
+PARTY_TIME_INDEXES = ("histbanque_sender_time", "histbanque_reciever_time")
+
+
+@skipUnless(connection.vendor == "postgresql", "Query plans are PostgreSQL-specific.")
+class HistoryQueryPlanTests(TestCase):
+    rows = 100_000
+    users = 200
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        users = User.objects.bulk_create(
+            [User(nom=f"Plan{i:05d}", prenom="Plan", cin=f"{_PREFIX}{i:05d}", bank_id=f"{_PREFIX}{i:05d}") for i in range(cls.users)]
+        )
+        cls.bank_id = users[0].bank_id
+        # Raw INSERT so `time` can be back-dated (auto_now_add would overwrite it): one year of
+        # history, oldest rows first, as an append-only ledger is laid out on disk.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO mara_tech_histbanque (bid_sender_id, bid_reciever_id, action, montant, time)
+                SELECT %(prefix)s || lpad((g %% %(users)s)::text, 5, '0'),
+                       %(prefix)s || lpad(((g * 7 + 1) %% %(users)s)::text, 5, '0'),
+                       'plan', 1, now() - (%(rows)s - g) * (interval '365 days' / %(rows)s)
+                FROM generate_series(1, %(rows)s) AS g
+                """,
+                {"prefix": _PREFIX, "users": cls.users, "rows": cls.rows},
+            )
+            cursor.execute('ANALYZE mara_tech_histbanque, "user"')
+
+    def assertPlanUses(self, queryset: QuerySet, *indexes: str) -> None:
+        plan = queryset.explain()
+        for index in indexes:
+            self.assertIn(index, plan, f"{index} not used:\n{plan}")
+
+    def test_history_first_page_uses_party_time_indexes(self) -> None:
+        self.assertPlanUses(history_queryset(self.bank_id, limit=21), *PARTY_TIME_INDEXES)
+
+    def test_history_cursor_page_uses_party_time_indexes(self) -> None:
+        newest = HistBanque.objects.filter(bid_sender_id=self.bank_id).order_by("-time", "-id").first()
+        cursor = _encode_cursor(newest.time, newest.id)
+        self.assertPlanUses(history_queryset(self.bank_id, limit=21, cursor=cursor), *PARTY_TIME_INDEXES)
+
+    def test_admin_time_range_uses_brin_index(self) -> None:
+        now = timezone.now()
+        queryset = HistBanque.objects.filter(time__gte=now - timedelta(days=1), time__lt=now).values("id")
+        self.assertPlanUses(queryset, "histbanque_time_brin")
@@ -0,0 +1,28 @@
+"""Batch transfer payload validation."""
+
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from ..exceptions import ValidationError
+from ..validators import validate_batch_payload
+
+
+def _batch(*amounts: object) -> dict:
+    return {"sender_bank_id": "S", "transfers": [{"recipient_bank_id": "R", "amount": a} for a in amounts]}
+
+
+class BatchPayloadTests(SimpleTestCase):
+    def test_valid_amounts(self) -> None:
+        _, items = validate_batch_payload(_batch("12.50", 3, "9999999999999.99"))
+        self.assertEqual([amount for _, amount, _ in items], [Decimal("12.50"), Decimal("3"), Decimal("9999999999999.99")])
+
+    def test_out_of_range_amounts_are_validation_errors(self) -> None:
+        for amount in ("1e30", "10000000000000", "1e-30", "12.345", "-1", "0", "NaN", "Infinity"):
+            with self.subTest(amount=amount), self.assertRaises(ValidationError):
+                validate_batch_payload(_batch(amount))
+
+    def test_non_object_body(self) -> None:
+        for payload in ([1, 2], "transfers", None):
+            with self.subTest(payload=payload), self.assertRaises(ValidationError):
+                validate_batch_payload(payload)
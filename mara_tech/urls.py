@@ -23,8 +23,12 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/vision/quality/', views.vision_quality, name='vision-quality'),
     path('api/banking/transaction/', views.banking_transaction, name='banking-transaction'),
+    path('api/banking/transaction/batch/', views.banking_batch_transaction, name='banking-batch-transaction'),
     path('api/banking/balance/', views.get_account_balance, name='account-balance'),
     path('api/banking/history/', views.get_transaction_history, name='transaction-history'),
+    path('api/banking/history/export/', views.export_transaction_history, name='transaction-history-export'),
+    path('api/banking/events/', views.banking_events, name='banking-events'),
+    path('api/banking/summary/', views.get_spending_summary, name='spending-summary'),
     # Authentication (face recognition)
     path('api/auth/register/', views.register_user, name='register'),
     path('api/auth/login/', views.login_face_recognition, name='login'),
@@ -32,4 +36,5 @@ urlpatterns = [
     # Shopping assistant (IBSAR)
     path('shopping/', views.shopping_page, name='shopping-page'),
     path('api/chat/', views.chat, name='shopping-chat'),
+    path('api/chat/stream/', views.chat_stream, name='shopping-chat-stream'),
 ]
@@ -1,5 +1,6 @@
 """Input validation helpers for API payloads."""
 
+from datetime import date
 from decimal import Decimal, InvalidOperation
 from typing import Any
 
@@ -39,7 +40,81 @@ def validate_transaction_payload(payload: dict[str, Any]) -> tuple[str, str, Dec
     return str(payload["sender_bank_id"]), str(payload["recipient"]), amount, str(payload["description"])
 
 
+MAX_BATCH_SIZE = 1000
+# Largest value Compte.solde (15 digits, 2 decimals) can hold.
+MAX_TRANSFER_AMOUNT = Decimal("9999999999999.99")
+
+
+def validate_batch_payload(payload: dict[str, Any]) -> tuple[str, list[tuple[str, Decimal, str]]]:
+    if not isinstance(payload, dict):
+        raise ValidationError("Body must be a JSON object.")
+    sender_bank_id = payload.get("sender_bank_id")
+    transfers = payload.get("transfers")
+    if not sender_bank_id:
+        raise ValidationError("Missing required field: sender_bank_id")
+    if not isinstance(transfers, list) or not transfers:
+        raise ValidationError("'transfers' must be a non-empty list.")
+    if len(transfers) > MAX_BATCH_SIZE:
+        raise ValidationError(f"A batch may contain at most {MAX_BATCH_SIZE} transfers.")
+
+    items: list[tuple[str, Decimal, str]] = []
+    errors: list[str] = []
+    for index, item in enumerate(transfers):
+        if not isinstance(item, dict) or not item.get("recipient_bank_id") or not item.get("amount"):
+            errors.append(f"#{index}: recipient_bank_id and amount are required")
+            continue
+        try:
+            amount = Decimal(str(item["amount"]))
+        except (InvalidOperation, ValueError, TypeError):
+            errors.append(f"#{index}: amount must be a valid number")
+            continue
+        if not amount.is_finite() or amount <= 0 or amount > MAX_TRANSFER_AMOUNT:
+            errors.append(f"#{index}: amount must be positive and at most {MAX_TRANSFER_AMOUNT}")
+            continue
+        # Bounded above, so quantize cannot exceed the context precision.
+        if amount != amount.quantize(Decimal("0.01")):
+            errors.append(f"#{index}: amount must have at most 2 decimals")
+            continue
+        items.append((str(item["recipient_bank_id"]), amount, str(item.get("description") or "Batch transfer")[:100]))
+
+    if errors:
+        raise ValidationError("Invalid transfers: " + "; ".join(errors))
+    return str(sender_bank_id), items
+
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+def validate_idempotency_key(key: str | None) -> str | None:
+    if key is None:
+        return None
+    key = key.strip()
+    if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise ValidationError(f"Idempotency-Key must be 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters.")
+    return key
+
+
 def validate_bank_id_param(bank_id: str | None) -> str:
     if not bank_id:
         raise ValidationError("'bank_id' query parameter is required.")
     return str(bank_id)
+
+
+def validate_period_params(year: str | None, month: str | None) -> tuple[int, int | None]:
+    if not year:
+        raise ValidationError("'year' query parameter is required.")
+    try:
+        return int(year), int(month) if month else None
+    except ValueError as exc:
+        raise ValidationError("'year' and 'month' must be integers.") from exc
+
+
+def validate_date_range(since: str | None, until: str | None) -> tuple[date | None, date | None]:
+    try:
+        start = date.fromisoformat(since) if since else None
+        end = date.fromisoformat(until) if until else None
+    except ValueError as exc:
+        raise ValidationError("'from' and 'to' must be dates (YYYY-MM-DD).") from exc
+    if start and end and start > end:
+        raise ValidationError("'from' must not be after 'to'.")
+    return start, end
@@ -1,14 +1,27 @@
 """Views package exports."""
 
 from .auth import get_user_profile, login_face_recognition, register_user
-from .banking import banking_transaction, get_account_balance, get_transaction_history
-from .shopping import chat, shopping_page
+from .banking import (
+    banking_batch_transaction,
+    banking_events,
+    banking_transaction,
+    export_transaction_history,
+    get_account_balance,
+    get_spending_summary,
+    get_transaction_history,
+)
+from .shopping import chat, chat_stream, shopping_page
 from .vision import vision_quality
 
 __all__ = [
+    "banking_batch_transaction",
+    "banking_events",
     "banking_transaction",
     "chat",
+    "chat_stream",
+    "export_transaction_history",
     "get_account_balance",
+    "get_spending_summary",
     "get_transaction_history",
     "get_user_profile",
     "login_face_recognition",
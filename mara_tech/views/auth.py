@@ -9,6 +9,7 @@ from django.views.decorators.http import require_GET, require_POST
 
 from ..exceptions import MaraTechError
 from ..services import auth_service
+from .conditional import Version, versioned
 
 logger = logging.getLogger(__name__)
 
@@ -58,8 +59,13 @@ def login_face_recognition(request: HttpRequest) -> JsonResponse:
         return JsonResponse({"error": str(exc)}, status=500)
 
 
+def _profile_version(request: HttpRequest, user_id: int) -> Version | None:
+    return auth_service.profile_version(user_id)
+
+
 @csrf_exempt
 @require_GET
+@versioned(_profile_version)
 def get_user_profile(request: HttpRequest, user_id: int) -> JsonResponse:
     """Récupérer le profil d'un utilisateur."""
     try:
@@ -1,15 +1,30 @@
 """Banking API views."""
 
+import csv
 import json
 import logging
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
 
-from django.http import HttpRequest, JsonResponse
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, HttpResponseBase, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
 
+from .. import events
 from ..exceptions import InsufficientFundsError, MaraTechError
-from ..services import banking_service
-from ..validators import validate_bank_id_param, validate_transaction_payload
+from ..services import aggregate_service, banking_service, idempotency_service
+from ..validators import (
+    validate_bank_id_param,
+    validate_batch_payload,
+    validate_date_range,
+    validate_idempotency_key,
+    validate_period_params,
+    validate_transaction_payload,
+)
+from .conditional import Version, versioned
 
 logger = logging.getLogger(__name__)
 
@@ -22,19 +37,66 @@ def banking_transaction(request: HttpRequest) -> JsonResponse:
     except (json.JSONDecodeError, UnicodeDecodeError):
         return JsonResponse({"error": "Invalid JSON body."}, status=400)
 
+    try:
+        key = validate_idempotency_key(request.headers.get("Idempotency-Key"))
+        if key is None:
+            status_code, body = _run_transaction(payload)
+            return JsonResponse(body, status=status_code)
+        status_code, body, replayed = idempotency_service.run_once(
+            key, idempotency_service.fingerprint(payload), lambda: _run_transaction(payload)
+        )
+    except MaraTechError as exc:
+        return JsonResponse({"error": exc.message}, status=exc.status_code)
+
+    response = JsonResponse(body, status=status_code)
+    if replayed:
+        response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _run_transaction(payload: dict) -> tuple[int, dict]:
     try:
         sender_bank_id, recipient_name, amount, description = validate_transaction_payload(payload)
         result = banking_service.execute_transaction(sender_bank_id, recipient_name, amount, description)
-        return JsonResponse(result.to_dict())
+        return 200, result.to_dict()
     except InsufficientFundsError as exc:
-        return JsonResponse({"error": exc.message, "current_balance": exc.current_balance, "requested_amount": exc.requested_amount}, status=exc.status_code)
+        return exc.status_code, {"error": exc.message, "current_balance": exc.current_balance, "requested_amount": exc.requested_amount}
     except MaraTechError as exc:
         logger.warning("Transaction failed: %s", exc.message)
+        return exc.status_code, {"error": exc.message}
+
+
+@csrf_exempt
+@require_POST
+def banking_batch_transaction(request: HttpRequest) -> JsonResponse:
+    try:
+        payload = json.loads(request.body.decode("utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse({"error": "Invalid JSON body."}, status=400)
+
+    try:
+        sender_bank_id, transfers = validate_batch_payload(payload)
+        result = banking_service.execute_batch_transfer(sender_bank_id, transfers)
+        return JsonResponse(result.to_dict())
+    except MaraTechError as exc:
+        logger.warning("Batch transfer failed: %s", exc.message)
         return JsonResponse({"error": exc.message}, status=exc.status_code)
 
 
+def _balance_version(request: HttpRequest) -> Version | None:
+    bank_id = request.GET.get("bank_id")
+    etag = banking_service.balance_etag(bank_id) if bank_id else None
+    return (etag, None) if etag else None
+
+
+def _history_version(request: HttpRequest) -> Version | None:
+    bank_id = request.GET.get("bank_id")
+    return banking_service.history_version(bank_id) if bank_id else None
+
+
 @csrf_exempt
 @require_GET
+@versioned(_balance_version)
 def get_account_balance(request: HttpRequest) -> JsonResponse:
     try:
         bank_id = validate_bank_id_param(request.GET.get("bank_id"))
@@ -46,14 +108,151 @@ def get_account_balance(request: HttpRequest) -> JsonResponse:
 
 @csrf_exempt
 @require_GET
+@versioned(_history_version)
 def get_transaction_history(request: HttpRequest) -> JsonResponse:
     try:
         bank_id = validate_bank_id_param(request.GET.get("bank_id"))
-        page = int(request.GET.get("page", 1))
         page_size = int(request.GET.get("page_size", 20))
-        history = banking_service.get_transaction_history(bank_id, page=max(1, page), page_size=min(100, max(1, page_size)))
+        include_total = request.GET.get("include_total", "").lower() in {"1", "true", "yes"}
+        history = banking_service.get_transaction_history(
+            bank_id, page_size=min(100, max(1, page_size)), cursor=request.GET.get("cursor") or None, include_total=include_total
+        )
         return JsonResponse(history.to_dict())
     except (ValueError, TypeError):
-        return JsonResponse({"error": "page and page_size must be integers."}, status=400)
+        return JsonResponse({"error": "page_size must be an integer."}, status=400)
+    except MaraTechError as exc:
+        return JsonResponse({"error": exc.message}, status=exc.status_code)
+
+
+@csrf_exempt
+@require_GET
+def get_spending_summary(request: HttpRequest) -> JsonResponse:
+    try:
+        bank_id = validate_bank_id_param(request.GET.get("bank_id"))
+        year, month = validate_period_params(request.GET.get("year"), request.GET.get("month"))
+        summary = aggregate_service.get_spending_summary(bank_id, year, month)
+        return JsonResponse(summary.to_dict())
     except MaraTechError as exc:
         return JsonResponse({"error": exc.message}, status=exc.status_code)
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the line, for ``csv.writer`` streaming."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _ndjson_lines(rows: Iterator[dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def _csv_lines(rows: Iterator[dict[str, Any]]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(banking_service.EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow([row[column] for column in banking_service.EXPORT_COLUMNS])
+
+
+# Lines per hop to the sync thread when an export is streamed under ASGI.
+_EXPORT_LINES_PER_CHUNK = 500
+
+
+def _chunk(lines: Iterator[str]) -> str:
+    return "".join(line for _, line in zip(range(_EXPORT_LINES_PER_CHUNK), lines))
+
+
+async def _async_lines(lines: Iterator[str]) -> AsyncIterator[str]:
+    """Drive a sync export generator from ASGI a chunk at a time.
+
+    Given a sync iterator, Django's ASGI handler reads it whole with
+    ``sync_to_async(list)`` before sending anything. Every step runs on the
+    request's thread-sensitive thread, so the generator's transaction and
+    server-side cursors stay on one connection.
+    """
+    try:
+        while chunk := await sync_to_async(_chunk)(lines):
+            yield chunk
+    finally:
+        await sync_to_async(lines.close)()
+
+
+_EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", _ndjson_lines),
+    "csv": ("text/csv; charset=utf-8", _csv_lines),
+}
+
+
+@csrf_exempt
+@require_GET
+def export_transaction_history(request: HttpRequest) -> HttpResponseBase:
+    export_format = request.GET.get("format", "ndjson").lower()
+    if export_format not in _EXPORT_FORMATS:
+        return JsonResponse({"error": f"format must be one of: {', '.join(_EXPORT_FORMATS)}."}, status=400)
+
+    try:
+        bank_id = validate_bank_id_param(request.GET.get("bank_id"))
+        since, until = validate_date_range(request.GET.get("from"), request.GET.get("to"))
+        rows = banking_service.iter_history_export(bank_id, since=since, until=until)
+    except MaraTechError as exc:
+        return JsonResponse({"error": exc.message}, status=exc.status_code)
+
+    content_type, render = _EXPORT_FORMATS[export_format]
+    lines = render(rows)
+    response = StreamingHttpResponse(_async_lines(lines) if isinstance(request, ASGIRequest) else lines, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="history-{bank_id}.{export_format}"'
+    logger.info("History export for bank_id=%s (%s, %s → %s)", bank_id, export_format, since, until)
+    return response
+
+
+def _sse(event: dict[str, Any]) -> str:
+    lines = [f"event: {event['type']}"]
+    if "transaction" in event:
+        lines.append(f"id: {event['transaction']['id']}")
+    lines.append(f"data: {json.dumps(event, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _sse_snapshot(balance: banking_service.BalanceInfo) -> Iterator[str]:
+    """WSGI fallback: one balance event, then close; ``retry`` paces the browser's reconnects."""
+    yield f"retry: {settings.BANKING_EVENTS_KEEPALIVE * 1000}\n\n"
+    yield _sse({"type": "balance", **balance.to_dict()})
+
+
+async def _sse_stream(subscription: events.Subscription, balance: banking_service.BalanceInfo) -> AsyncIterator[str]:
+    try:
+        yield _sse({"type": "balance", **balance.to_dict()})
+        while (event := await subscription.get(settings.BANKING_EVENTS_KEEPALIVE)) is not None:
+            yield _sse(event) if event else ": keep-alive\n\n"
+    finally:
+        subscription.close()
+
+
+@csrf_exempt
+@require_GET
+async def banking_events(request: HttpRequest) -> HttpResponseBase:
+    """Server-sent events for one account: a ``balance`` event, then a ``transaction`` event per committed transfer.
+
+    Streams indefinitely under ASGI; under WSGI it sends the balance and
+    closes, which degrades to polling every ``BANKING_EVENTS_KEEPALIVE``.
+    """
+    try:
+        bank_id = validate_bank_id_param(request.GET.get("bank_id"))
+    except MaraTechError as exc:
+        return JsonResponse({"error": exc.message}, status=exc.status_code)
+
+    # Subscribe before reading the balance so no transfer committing in between is missed.
+    subscription = events.subscribe(bank_id) if isinstance(request, ASGIRequest) else None
+    try:
+        balance = await sync_to_async(banking_service.get_balance)(bank_id)
+    except MaraTechError as exc:
+        if subscription is not None:
+            subscription.close()
+        return JsonResponse({"error": exc.message}, status=exc.status_code)
+
+    stream = _sse_stream(subscription, balance) if subscription is not None else _sse_snapshot(balance)
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
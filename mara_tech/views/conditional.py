@@ -0,0 +1,33 @@
+"""Conditional GET (ETag / Last-Modified) from one version lookup per request."""
+
+from collections.abc import Callable
+from datetime import datetime
+
+from django.http import HttpRequest
+from django.views.decorators.http import condition
+
+# (etag, last_modified); the lookup returns None to let the view answer (e.g. 400/404)
+Version = tuple[str, datetime | None]
+
+
+def versioned(lookup: Callable[..., Version | None]) -> Callable:
+    """``django.views.decorators.http.condition`` fed by a single ``lookup(request, *args, **kwargs)``.
+
+    A matching ``If-None-Match`` / ``If-Modified-Since`` gets a 304 before
+    the view runs, so the payload is neither built nor serialised.
+    """
+
+    def version(request: HttpRequest, *args, **kwargs) -> Version | None:
+        if not hasattr(request, "_resource_version"):
+            request._resource_version = lookup(request, *args, **kwargs)
+        return request._resource_version
+
+    def etag(request: HttpRequest, *args, **kwargs) -> str | None:
+        found = version(request, *args, **kwargs)
+        return found[0] if found else None
+
+    def last_modified(request: HttpRequest, *args, **kwargs) -> datetime | None:
+        found = version(request, *args, **kwargs)
+        return found[1] if found else None
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
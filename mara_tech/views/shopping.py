@@ -3,17 +3,35 @@
 import json
 import logging
 import os
-from math import asin, cos, radians, sin, sqrt
-
-import requests
-from django.http import HttpRequest, JsonResponse
+import re
+import statistics
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection
+from django.http import HttpRequest, HttpResponseBase, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from ..services import chat_session_service
+from ..services.geocoding_service import FALLBACK_NAME, reverse_geocode
+from ..services.places_service import search_nearby
 
 logger = logging.getLogger(__name__)
 
+# Shared by all requests: geocoding and place searches are I/O-bound HTTP calls.
+_lookups = ThreadPoolExecutor(max_workers=settings.CHAT_LOOKUP_WORKERS, thread_name_prefix="chat-lookup")
+# Conversation summaries are written after the reply has been sent.
+_compactions = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chat-summary")
+
 # Initialisation du client OpenAI avec clé depuis variable d'environnement
 openai_api_key = os.getenv("OPENAI_API_KEY")
 openai_base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
@@ -34,13 +52,16 @@ if openai_api_key:
     if openai_base_url != "https://api.openai.com/v1":
         # URL personnalisée (pour VLLM ou autres serveurs)
         client = OpenAI(api_key=openai_api_key, base_url=openai_base_url)
+        async_client = AsyncOpenAI(api_key=openai_api_key, base_url=openai_base_url)
         logger.info("✅ Client OpenAI initialisé avec URL personnalisée: %s", openai_base_url)
     else:
         # URL OpenAI standard
         client = OpenAI(api_key=openai_api_key)
+        async_client = AsyncOpenAI(api_key=openai_api_key)
         logger.info("✅ Client OpenAI initialisé avec URL standard")
 else:
     client = None
+    async_client = None
     logger.error("❌ Client OpenAI non initialisé - l'API ne fonctionnera pas")
 
 SYSTEM_PROMPT = """Tu es un assistant vocal IBSAR pour malvoyants en Tunisie, comme un guide personnel bienveillant.
@@ -89,149 +110,43 @@ Réponse: Je peux vous aider ! Pour des produits nouveaux, je vous suggère le s
 - Pour les listes, utilise des phrases naturelles, pas de numérotation (ex: "Je vous suggère Super U, Cash & Carry, ou Frutésol" au lieu de "1. Super U 2. Cash & Carry")"""
 
 
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calcule la distance GPS en kilomètres entre deux points."""
-    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    c = 2 * asin(sqrt(a))
-    return round(6371 * c, 2)
-
-
-def reverse_geocode(lat: float, lng: float) -> str:
-    """Geocoding inversé Nominatim - GRATUIT."""
-    try:
-        url = "https://nominatim.openstreetmap.org/reverse"
-        params = {
-            "lat": lat,
-            "lon": lng,
-            "format": "json",
-            "addressdetails": 1,
-            "zoom": 18,
-            "accept-language": "fr",
-        }
-        headers = {"User-Agent": "IBSAR-Assistant/1.0"}
-
-        response = requests.get(url, params=params, headers=headers, timeout=8)
-        data = response.json()
-        address = data.get("address", {})
-
-        # Extraction intelligente du lieu
-        location = (
-            address.get("amenity")
-            or address.get("building")
-            or address.get("university")
-            or address.get("school")
-            or address.get("neighbourhood")
-            or address.get("suburb")
-            or address.get("quarter")
-            or address.get("road")
-            or "position actuelle"
-        )
-
-        # Ajout ville
-        city = address.get("city") or address.get("town") or address.get("municipality") or ""
-        suburb = address.get("suburb") or address.get("city_district") or ""
-
-        # Construction nom complet
-        parts = [location]
-        if suburb and suburb not in location:
-            parts.append(suburb)
-        if city and city not in location and city != suburb:
-            parts.append(city)
+SUMMARY_PROMPT = """Tu résumes une conversation entre un utilisateur malvoyant et l'assistant vocal IBSAR.
+Écris un résumé factuel en 2 à 4 phrases: ce que l'utilisateur a cherché ou demandé, les lieux proposés (nom et distance)
+et ce qui reste en suspens. Intègre le résumé existant s'il y en a un. Réponds uniquement par le résumé."""
 
-        full_name = ", ".join(parts)
-        logger.info(f"📍 Lieu détecté: {full_name}")
-        return full_name
 
-    except Exception as e:
-        logger.error(f"❌ Erreur geocoding: {e}")
-        return "votre position"
+def summarize_turns(summary: str, turns: list[dict]) -> str:
+    """Résumé LLM: résumé existant + tours les plus anciens."""
+    transcript = "\n".join(f"{t['role']}: {t['content']}" for t in turns)
+    response = client.chat.completions.create(
+        model=openai_model,
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": f"Résumé existant: {summary or '(aucun)'}\n\nÉchanges à intégrer:\n{transcript}"},
+        ],
+        temperature=0.2,
+        max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+    )
+    return response.choices[0].message.content or ""
 
 
-def search_nearby_places(lat: float, lng: float, place_type: str) -> list[dict]:
-    """Recherche Overpass API - 100% GRATUIT."""
+def _compact(session_id: str) -> None:
     try:
-        overpass_url = "http://overpass-api.de/api/interpreter"
-
-        osm_tags = {
-            "supermarket": "shop=supermarket",
-            "grocery": "shop=convenience",
-            "pharmacy": "amenity=pharmacy",
-            "clothes": "shop=clothes",
-            "curtains": "shop=curtain",
-            "decoration": "shop=interior_decoration",
-            "fabric": "shop=fabric",
-        }
-
-        tag = osm_tags.get(place_type, "shop")
-
-        query = f"""
-        [out:json][timeout:15];
-        (
-          node[{tag}](around:5000,{lat},{lng});
-          way[{tag}](around:5000,{lat},{lng});
-        );
-        out center 30;
-        """
-
-        logger.info(f"🔍 Recherche: {place_type} ({tag})")
-
-        response = requests.post(overpass_url, data={"data": query}, timeout=20)
-        data = response.json()
-
-        places = []
-        for elem in data.get("elements", [])[:40]:
-            if "tags" not in elem:
-                continue
-
-            name = elem["tags"].get("name", "")
-            if not name or name == "Sans nom":
-                continue
-
-            lat_p = elem.get("lat") or elem.get("center", {}).get("lat")
-            lon_p = elem.get("lon") or elem.get("center", {}).get("lon")
-
-            if not lat_p or not lon_p:
-                continue
-
-            dist = haversine_distance(lat, lng, lat_p, lon_p)
-            dist_m = int(dist * 1000)
-
-            # Adresse simplifiée
-            tags = elem["tags"]
-            addr_parts = []
-            if "addr:street" in tags:
-                addr_parts.append(tags["addr:street"])
-            if "addr:city" in tags:
-                addr_parts.append(tags["addr:city"])
-
-            address = ", ".join(addr_parts) if addr_parts else "Adresse non disponible"
-
-            places.append(
-                {
-                    "name": name,
-                    "address": address,
-                    "distance": dist,
-                    "distance_m": dist_m,
-                    "lat": lat_p,
-                    "lng": lon_p,
-                    "phone": tags.get("phone", ""),
-                }
-            )
+        chat_session_service.compact(session_id, summarize_turns)
+    except Exception:
+        logger.exception("❌ Résumé de la session %s impossible", session_id)
+    finally:
+        connection.close()
 
-        places.sort(key=lambda x: x["distance"])
-        logger.info(f"✅ {len(places)} lieu(x) trouvé(s)")
-        return places[:6]
 
-    except Exception as e:
-        logger.error(f"❌ Erreur Overpass: {e}")
-        return []
+def remember_turn(conversation: chat_session_service.ChatContext, user_message: str, assistant_msg: str) -> None:
+    """Store the exchange; fold older turns into the summary in the background once over budget."""
+    if chat_session_service.record_turn(conversation, user_message, assistant_msg):
+        _compactions.submit(_compact, conversation.session_id)
 
 
-def detect_search(message: str, lat: float, lng: float) -> tuple[list[dict], str | None]:
-    """Détection intelligente + recherche."""
+def classify_search(message: str) -> tuple[str | None, list[str]]:
+    """Détection intelligente: (libellé, catégories par ordre de préférence)."""
     msg = message.lower()
 
     # Mots-clés
@@ -267,37 +182,240 @@ def detect_search(message: str, lat: float, lng: float) -> tuple[list[dict], str
     ]
     shop = ["rideau", "vêtement", "habit", "robe", "chemise", "tissu", "décoration", "meuble", "محل", "ملابس", "ستارة"]
 
-    places = []
-    search_type = None
-
     # Détection
     if any(w in msg for w in food):
         logger.info("🎯 → Supermarché")
-        places = search_nearby_places(lat, lng, "supermarket")
-        if not places:
-            places = search_nearby_places(lat, lng, "grocery")
-        search_type = "SUPERMARCHÉ"
+        return "SUPERMARCHÉ", ["supermarket", "grocery"]
 
-    elif any(w in msg for w in pharma):
+    if any(w in msg for w in pharma):
         logger.info("🎯 → Pharmacie")
-        places = search_nearby_places(lat, lng, "pharmacy")
-        search_type = "PHARMACIE"
+        return "PHARMACIE", ["pharmacy"]
 
-    elif any(w in msg for w in shop):
+    if any(w in msg for w in shop):
         logger.info("🎯 → Boutique")
         if "rideau" in msg or "ستارة" in msg:
-            places = search_nearby_places(lat, lng, "curtains")
-            if not places:
-                places = search_nearby_places(lat, lng, "decoration")
-            search_type = "BOUTIQUE (rideaux/déco)"
-        elif "vêtement" in msg or "habit" in msg:
-            places = search_nearby_places(lat, lng, "clothes")
-            search_type = "BOUTIQUE (vêtements)"
-        else:
-            places = search_nearby_places(lat, lng, "decoration")
-            search_type = "BOUTIQUE"
+            return "BOUTIQUE (rideaux/déco)", ["curtains", "decoration"]
+        if "vêtement" in msg or "habit" in msg:
+            return "BOUTIQUE (vêtements)", ["clothes"]
+        return "BOUTIQUE", ["decoration"]
+
+    return None, []
+
+
+def lookup_context(message: str, lat: float, lng: float) -> tuple[str, list[dict], str | None]:
+    """Geocoding + recherche en parallèle: (nom du lieu, lieux, libellé).
+
+    The location name and the place search run at once, so the wait is
+    the slower of the two rather than their sum. The search covers every
+    candidate category (fallbacks included, speculatively) in one union
+    query, and the first non-empty category in preference order wins.
+    Both are bounded by ``CHAT_LOOKUP_DEADLINE`` seconds; a late call is
+    left out of this answer but still finishes and fills the caches.
+    """
+    search_type, place_types = classify_search(message)
+    geocoding = _lookups.submit(reverse_geocode, lat, lng)
+    search = _lookups.submit(search_nearby, lat, lng, place_types) if place_types else None
+
+    _, late = wait([f for f in (geocoding, search) if f is not None], timeout=settings.CHAT_LOOKUP_DEADLINE)
+    if late:
+        logger.warning(f"⏱️ Délai de recherche dépassé ({settings.CHAT_LOOKUP_DEADLINE}s), réponse avec les résultats disponibles")
+
+    location_name = geocoding.result() if geocoding.done() else FALLBACK_NAME
+    places: list[dict] = []
+    if search is not None and search.done():
+        by_type = search.result()
+        places = next((by_type[place_type] for place_type in place_types if by_type[place_type]), [])
+    return location_name, places, search_type
+
+
+def build_prompt(user_message: str, user_location: dict[str, Any]) -> tuple[str, list[dict], str | None]:
+    """Prompt système + contexte (position, lieux proches): (prompt, lieux, nom du lieu)."""
+    context = ""
+    places: list[dict] = []
+    location_name = None
+
+    if user_location.get("lat") and user_location.get("lng"):
+        lat = user_location["lat"]
+        lng = user_location["lng"]
+
+        # Geocoding + recherche (en parallèle)
+        location_name, places, search_type = lookup_context(user_message, lat, lng)
+        context = f"\n\n📍 POSITION: {location_name}\n(Lat: {lat:.5f}, Lng: {lng:.5f})"
+
+        if places:
+            context += f"\n\n🎯 RÉSULTATS ({search_type}):\n"
+            for i, p in enumerate(places[:3], 1):  # Top 3 seulement
+                dist_text = f"{p['distance_m']}m" if p["distance_m"] < 1000 else f"{p['distance']}km"
+                context += f"{i}. {p['name']} — {dist_text}\n"
+                if p["phone"]:
+                    context += f"   Tel: {p['phone']}\n"
+
+    return SYSTEM_PROMPT + context, places, location_name
+
+
+def _strip_prefix(text: str) -> str:
+    # Enlever les préfixes comme "Tu:" ou "Assistant:"
+    if text.startswith('Tu:') or text.startswith('tu:'):
+        text = text[3:].strip()
+    if text.startswith('Assistant:') or text.startswith('assistant:'):
+        text = text[10:].strip()
+    return text
+
+
+def _flatten(text: str) -> str:
+    # Enlever les numéros au début des lignes (1., 2., etc.)
+    text = re.sub(r'^\d+\.\s*', '', text, flags=re.MULTILINE)
+    # Enlever les listes numérotées dans le texte (1. ..., 2. ..., etc.)
+    text = re.sub(r'\n\d+\.\s*', '. ', text)
+    # Remplacer les retours à la ligne multiples par des points
+    text = re.sub(r'\n+', '. ', text)
+    # Nettoyer les espaces multiples
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def clean_reply(text: str) -> str:
+    """Nettoyer la réponse pour la synthèse vocale (préfixes, guillemets, numéros de liste)."""
+    text = _strip_prefix(text.strip())
+    # Enlever les guillemets au début et à la fin
+    if text.startswith('"') and text.endswith('"'):
+        text = text[1:-1].strip()
+    if text.startswith("'") and text.endswith("'"):
+        text = text[1:-1].strip()
+    return _flatten(text)
+
+
+# End of a sentence: terminal punctuation (not after a digit, so "1." list numbers stay attached,
+# optionally followed by closing quotes) then whitespace, or a line break.
+_SENTENCE_END = re.compile(r'(?<!\d)[.!?…]+["\'»)]*\s+|\n+')
+
+
+class ReplySentences:
+    """Cleaned sentences of a streamed reply, each released as soon as it is complete.
+
+    :func:`clean_reply` applied piecewise: the prefix and an opening quote
+    come off the first sentence, the matching closing quote off the one
+    that ends with it, and every sentence is flattened for speech.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._started = False
+        self._quote = ""
+
+    def feed(self, delta: str) -> list[str]:
+        self._buffer += delta
+        raw, start = [], 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            raw.append(self._buffer[start:match.end()])
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return [sentence for sentence in map(self._clean, raw) if sentence]
+
+    def close(self) -> list[str]:
+        """The unterminated tail of the reply, if any."""
+        last = self._clean(self._buffer)
+        self._buffer = ""
+        return [last] if last else []
+
+    def _clean(self, raw: str) -> str:
+        text = raw.strip()
+        if not self._started:
+            text = _strip_prefix(text)
+            if text[:1] in ('"', "'"):
+                self._quote, text = text[0], text[1:]
+            self._started = bool(text)
+        if self._quote and text.endswith(self._quote):
+            text = text[:-1]
+        return _flatten(text)
+
+
+# Time to the first spoken sentence of streamed replies (ms, from request arrival); p50/p95 logged every 100 replies.
+_first_sentence_ms: deque[float] = deque(maxlen=1000)
+_streamed_replies = 0
+
+
+def record_first_sentence(elapsed_ms: float) -> None:
+    global _streamed_replies
+    _first_sentence_ms.append(elapsed_ms)
+    _streamed_replies += 1
+    if _streamed_replies % 100 == 0:
+        samples = sorted(_first_sentence_ms)
+        logger.info(
+            "⏱️ Première phrase: p50 %.0f ms, p95 %.0f ms (%d dernières réponses)",
+            statistics.median(samples),
+            samples[int(len(samples) * 0.95) - 1],
+            len(samples),
+        )
+
+
+def _openai_error_response(openai_error: Exception) -> JsonResponse:
+    error_str = str(openai_error).lower()
+    logger.error(f"❌ Erreur OpenAI avec {openai_model}: {openai_error}")
+
+    # Si c'est une erreur d'authentification
+    if "api key" in error_str or "authentication" in error_str or "401" in error_str:
+        assistant_msg = "Erreur d'authentification avec OpenAI. Vérifiez votre clé API."
+        return JsonResponse(
+            {"error": "Erreur d'authentification OpenAI", "response": assistant_msg},
+            status=503,
+        )
+    # Si c'est "model not found"
+    elif "model not found" in error_str or "404" in error_str:
+        assistant_msg = f"Modèle {openai_model} non trouvé. Vérifiez OPENAI_MODEL dans .env"
+        logger.error(f"❌ Modèle {openai_model} non disponible")
+        return JsonResponse(
+            {"error": f"Modèle {openai_model} non trouvé", "response": assistant_msg},
+            status=503,
+        )
+    else:
+        # Autre erreur
+        assistant_msg = "Désolé, je rencontre un problème technique. Pouvez-vous réessayer ?"
+        logger.exception("❌ Erreur inattendue OpenAI")
+        return JsonResponse(
+            {
+                "error": str(openai_error),
+                "response": assistant_msg,
+            },
+            status=500,
+        )
+
+
+def _invalid_message(user_message: Any) -> JsonResponse | None:
+    if not user_message:
+        return JsonResponse({"error": "Message vide reçu"}, status=400)
+    if not isinstance(user_message, str) or len(user_message) > settings.CHAT_MESSAGE_MAX_CHARS:
+        return JsonResponse({"error": f"Message invalide (texte de {settings.CHAT_MESSAGE_MAX_CHARS} caractères maximum)"}, status=400)
+    return None
+
+
+def _is_coordinate(value: Any) -> bool:
+    return value is None or (isinstance(value, (int, float)) and not isinstance(value, bool))
+
+
+def _invalid_body(data: Any) -> JsonResponse | None:
+    """400 for a body that is not an object, a ``location`` other than ``{lat, lng}`` numbers, a non-list ``history`` or a bad message."""
+    if not isinstance(data, dict):
+        return JsonResponse({"error": "JSON invalide.", "details": "Un objet JSON est attendu."}, status=400)
+    location = data.get("location") or {}
+    if not isinstance(location, dict) or not all(_is_coordinate(location.get(key)) for key in ("lat", "lng")):
+        return JsonResponse({"error": "Position invalide (objet {lat, lng} numérique attendu)"}, status=400)
+    if not isinstance(data.get("history") or [], list):
+        return JsonResponse({"error": "Historique invalide (liste de messages attendue)"}, status=400)
+    return _invalid_message(data.get("message", ""))
 
-    return places, search_type
+
+def _server_error_response(error: Exception) -> JsonResponse:
+    logger.exception("❌ ERREUR dans chat shopping")
+    error_details = {
+        "error": str(error),
+        "error_type": type(error).__name__,
+        "response": "Désolé, erreur technique. Répétez svp.",
+    }
+    # En mode DEBUG, on envoie plus de détails
+    if settings.DEBUG:
+        import traceback
+        error_details["traceback"] = traceback.format_exc()
+    return JsonResponse(error_details, status=500)
 
 
 @csrf_exempt
@@ -313,49 +431,22 @@ def chat(request: HttpRequest) -> JsonResponse:
 
     try:
         data = json.loads(request.body)
-        user_message = data.get("message", "")
-        conversation_history = data.get("history", [])
-        user_location = data.get("location", {})
+        invalid = _invalid_body(data)
+        if invalid is not None:
+            return invalid
+        user_message = data["message"]
+        user_location = data.get("location") or {}
 
         logger.info(f"\n{'='*50}")
         logger.info(f"📩 Message: {user_message}")
         logger.info(f"📍 GPS: ({user_location.get('lat')}, {user_location.get('lng')})")
-        
-        if not user_message:
-            return JsonResponse(
-                {"error": "Message vide reçu"},
-                status=400,
-            )
-
-        # Ajouter message user
-        conversation_history.append({"role": "user", "content": user_message})
-
-        # Contexte
-        context = ""
-        places = []
-        location_name = None
-
-        if user_location.get("lat") and user_location.get("lng"):
-            lat = user_location["lat"]
-            lng = user_location["lng"]
 
-            # Geocoding
-            location_name = reverse_geocode(lat, lng)
-            context = f"\n\n📍 POSITION: {location_name}\n(Lat: {lat:.5f}, Lng: {lng:.5f})"
+        # Session (historique côté serveur)
+        conversation = chat_session_service.open_session(data.get("session_id"), data.get("history"))
 
-            # Recherche
-            places, search_type = detect_search(user_message, lat, lng)
-
-            if places:
-                context += f"\n\n🎯 RÉSULTATS ({search_type}):\n"
-                for i, p in enumerate(places[:3], 1):  # Top 3 seulement
-                    dist_text = f"{p['distance_m']}m" if p["distance_m"] < 1000 else f"{p['distance']}km"
-                    context += f"{i}. {p['name']} — {dist_text}\n"
-                    if p["phone"]:
-                        context += f"   Tel: {p['phone']}\n"
-
-        # Prompt
-        full_prompt = SYSTEM_PROMPT + context
+        # Prompt + contexte
+        full_prompt, places, location_name = build_prompt(user_message, user_location)
+        messages = conversation.messages(full_prompt, user_message)
 
         logger.info("🤖 Appel GPT...")
 
@@ -364,81 +455,29 @@ def chat(request: HttpRequest) -> JsonResponse:
             logger.info(f"🤖 Appel avec le modèle: {openai_model}")
             response = client.chat.completions.create(
                 model=openai_model,
-                messages=[
-                    {"role": "system", "content": full_prompt},
-                    *conversation_history,
-                ],
+                messages=messages,
                 temperature=0.7,
                 max_tokens=300,
             )
+            if response.usage:
+                logger.info(f"🧠 Prompt: {response.usage.prompt_tokens} tokens")
 
-            assistant_msg = response.choices[0].message.content
-            
             # Nettoyer la réponse pour la synthèse vocale
-            # Enlever les guillemets, les préfixes "Tu:", etc.
-            assistant_msg = assistant_msg.strip()
-            # Enlever les préfixes comme "Tu:" ou "Assistant:"
-            if assistant_msg.startswith('Tu:') or assistant_msg.startswith('tu:'):
-                assistant_msg = assistant_msg[3:].strip()
-            if assistant_msg.startswith('Assistant:') or assistant_msg.startswith('assistant:'):
-                assistant_msg = assistant_msg[10:].strip()
-            # Enlever les guillemets au début et à la fin
-            if assistant_msg.startswith('"') and assistant_msg.endswith('"'):
-                assistant_msg = assistant_msg[1:-1].strip()
-            if assistant_msg.startswith("'") and assistant_msg.endswith("'"):
-                assistant_msg = assistant_msg[1:-1].strip()
-            # Enlever les numéros de liste pour la lecture vocale (1., 2., etc.)
-            import re
-            # Enlever les numéros au début des lignes (1., 2., etc.)
-            assistant_msg = re.sub(r'^\d+\.\s*', '', assistant_msg, flags=re.MULTILINE)
-            # Enlever les listes numérotées dans le texte (1. ..., 2. ..., etc.)
-            assistant_msg = re.sub(r'\n\d+\.\s*', '. ', assistant_msg)
-            # Remplacer les retours à la ligne multiples par des points
-            assistant_msg = re.sub(r'\n+', '. ', assistant_msg)
-            # Nettoyer les espaces multiples
-            assistant_msg = re.sub(r'\s+', ' ', assistant_msg).strip()
+            assistant_msg = clean_reply(response.choices[0].message.content)
             
             logger.info(f"✅ Réponse reçue (nettoyée): {assistant_msg}")
             logger.info(f"{'='*50}\n")
             
         except Exception as openai_error:
-            error_str = str(openai_error).lower()
-            logger.error(f"❌ Erreur OpenAI avec {openai_model}: {openai_error}")
-            
-            # Si c'est une erreur d'authentification
-            if "api key" in error_str or "authentication" in error_str or "401" in error_str:
-                assistant_msg = "Erreur d'authentification avec OpenAI. Vérifiez votre clé API."
-                return JsonResponse(
-                    {"error": "Erreur d'authentification OpenAI", "response": assistant_msg},
-                    status=503,
-                )
-            # Si c'est "model not found"
-            elif "model not found" in error_str or "404" in error_str:
-                assistant_msg = f"Modèle {openai_model} non trouvé. Vérifiez OPENAI_MODEL dans .env"
-                logger.error(f"❌ Modèle {openai_model} non disponible")
-                return JsonResponse(
-                    {"error": f"Modèle {openai_model} non trouvé", "response": assistant_msg},
-                    status=503,
-                )
-            else:
-                # Autre erreur
-                assistant_msg = "Désolé, je rencontre un problème technique. Pouvez-vous réessayer ?"
-                logger.exception("❌ Erreur inattendue OpenAI")
-                return JsonResponse(
-                    {
-                        "error": str(openai_error),
-                        "response": assistant_msg,
-                    },
-                    status=500,
-                )
+            return _openai_error_response(openai_error)
 
         # Historique
-        conversation_history.append({"role": "assistant", "content": assistant_msg})
+        remember_turn(conversation, user_message, assistant_msg)
 
         return JsonResponse(
             {
                 "response": assistant_msg,
-                "history": conversation_history,
+                "session_id": conversation.session_id,
                 "places": places[:3],  # Top 3
                 "location": user_location,
                 "location_name": location_name,
@@ -449,19 +488,156 @@ def chat(request: HttpRequest) -> JsonResponse:
         logger.error("❌ Erreur JSON: %s", e)
         return JsonResponse({"error": "JSON invalide.", "details": str(e)}, status=400)
     except Exception as e:
-        logger.exception("❌ ERREUR dans chat shopping")
-        error_details = {
-            "error": str(e),
-            "error_type": type(e).__name__,
-            "response": "Désolé, erreur technique. Répétez svp.",
-            "history": conversation_history if "conversation_history" in locals() else [],
-        }
-        # En mode DEBUG, on envoie plus de détails
-        from django.conf import settings
-        if settings.DEBUG:
-            import traceback
-            error_details["traceback"] = traceback.format_exc()
-        return JsonResponse(error_details, status=500)
+        return _server_error_response(e)
+
+
+def _sse(event: dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def _delta(chunk: Any) -> str:
+    return (chunk.choices[0].delta.content or "") if chunk.choices else ""
+
+
+class _StreamedReply:
+    """SSE events for one streamed reply: a ``sentence`` per complete sentence, then ``done`` (or ``error``)."""
+
+    def __init__(
+        self, started: float, conversation: chat_session_service.ChatContext, user_message: str, final: dict[str, Any]
+    ) -> None:
+        self.started = started
+        self.conversation = conversation
+        self.user_message = user_message
+        self.final = final
+        self.sentences = ReplySentences()
+        self.spoken: list[str] = []
+        self.first_sentence_ms: float | None = None
+
+    def feed(self, delta: str) -> list[str]:
+        return [self._sentence(sentence) for sentence in self.sentences.feed(delta)]
+
+    def _sentence(self, text: str) -> str:
+        if self.first_sentence_ms is None:
+            self.first_sentence_ms = (time.perf_counter() - self.started) * 1000
+            record_first_sentence(self.first_sentence_ms)
+        self.spoken.append(text)
+        return _sse({"type": "sentence", "text": text})
+
+    def finish(self) -> list[str]:
+        """Last sentence and ``done``; stores the exchange in the session (database access, so sync)."""
+        events = [self._sentence(sentence) for sentence in self.sentences.close()]
+        assistant_msg = " ".join(self.spoken)
+        total_ms = (time.perf_counter() - self.started) * 1000
+        logger.info(f"✅ Réponse streamée: {assistant_msg} (1re phrase {self.first_sentence_ms or 0:.0f} ms, total {total_ms:.0f} ms)")
+        remember_turn(self.conversation, self.user_message, assistant_msg)
+        events.append(_sse({
+            "type": "done",
+            "response": assistant_msg,
+            "session_id": self.conversation.session_id,
+            **self.final,
+            "first_sentence_ms": round(self.first_sentence_ms, 1) if self.first_sentence_ms is not None else None,
+            "total_ms": round(total_ms, 1),
+        }))
+        return events
+
+    def fail(self, exc: Exception) -> str:
+        logger.error(f"❌ Erreur OpenAI (stream) avec {openai_model}: {exc}")
+        return _sse({
+            "type": "error",
+            "error": str(exc),
+            "response": "Désolé, je rencontre un problème technique. Pouvez-vous réessayer ?",
+        })
+
+
+def _sync_events(stream: Any, reply: _StreamedReply) -> Iterator[str]:
+    try:
+        for chunk in stream:
+            yield from reply.feed(_delta(chunk))
+    except Exception as exc:
+        yield reply.fail(exc)
+        return
+    yield from reply.finish()
+
+
+async def _async_events(stream: Any, reply: _StreamedReply) -> AsyncIterator[str]:
+    try:
+        async for chunk in stream:
+            for event in reply.feed(_delta(chunk)):
+                yield event
+    except Exception as exc:
+        yield reply.fail(exc)
+        return
+    for event in await sync_to_async(reply.finish)():
+        yield event
+
+
+@csrf_exempt
+@require_POST
+async def chat_stream(request: HttpRequest) -> HttpResponseBase:
+    """Variante streaming de :func:`chat` (server-sent events, même corps de requête).
+
+    The model is called with ``stream=True``; each complete sentence is
+    cleaned for speech and sent as a ``sentence`` event right away, so
+    text-to-speech can start after the first one. A final ``done`` event
+    carries the fields of :func:`chat` plus ``first_sentence_ms`` and
+    ``total_ms``. Errors before streaming starts get the same JSON
+    responses as :func:`chat`; later ones end with an ``error`` event.
+    Under WSGI the sync client streams instead of ``AsyncOpenAI``.
+    """
+    started = time.perf_counter()
+    if not client:
+        logger.error("OPENAI_API_KEY non configurée - client OpenAI non initialisé")
+        return JsonResponse(
+            {"error": "Service OpenAI non configuré. OPENAI_API_KEY manquante. Vérifiez votre fichier .env"},
+            status=503,
+        )
+
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError as e:
+        logger.error("❌ Erreur JSON: %s", e)
+        return JsonResponse({"error": "JSON invalide.", "details": str(e)}, status=400)
+    invalid = _invalid_body(data)
+    if invalid is not None:
+        return invalid
+    user_message = data["message"]
+    user_location = data.get("location") or {}
+    logger.info(f"📩 Message (stream): {user_message}")
+
+    try:
+        conversation = await sync_to_async(chat_session_service.open_session)(data.get("session_id"), data.get("history"))
+        # The lookups block on HTTP calls; run them off the event loop (they fan out on _lookups anyway).
+        full_prompt, places, location_name = await sync_to_async(build_prompt, thread_sensitive=False)(user_message, user_location)
+    except Exception as e:
+        return _server_error_response(e)
+    request_args = {
+        "model": openai_model,
+        "messages": conversation.messages(full_prompt, user_message),
+        "temperature": 0.7,
+        "max_tokens": 300,
+        "stream": True,
+    }
+    asgi = isinstance(request, ASGIRequest)
+    try:
+        if asgi:
+            stream = await async_client.chat.completions.create(**request_args)
+        else:
+            stream = await sync_to_async(client.chat.completions.create, thread_sensitive=False)(**request_args)
+    except Exception as openai_error:
+        return _openai_error_response(openai_error)
+
+    reply = _StreamedReply(
+        started,
+        conversation,
+        user_message,
+        {"places": places[:3], "location": user_location, "location_name": location_name},
+    )
+    response = StreamingHttpResponse(
+        _async_events(stream, reply) if asgi else _sync_events(stream, reply), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
 def shopping_page(request: HttpRequest):